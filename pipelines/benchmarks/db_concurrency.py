@@ -0,0 +1,216 @@
+"""
+Benchmark de concurrencia: sesión síncrona vs AsyncSession en endpoints `async def`.
+
+Simula requests concurrentes de un endpoint como insights: cada una lee un
+candidato de Postgres y después espera una llamada externa (el LLM, Cohere)
+con `asyncio.sleep`. Se comparan tres modos de acceso a la base:
+
+- sync: Session síncrona dentro del event loop (insights antes del cambio).
+  Cada consulta bloquea el loop y con él a todas las requests en vuelo.
+- threadpool: Session síncrona en un hilo (la hidratación de búsqueda antes
+  del cambio). No bloquea el loop, pero cada consulta ocupa un hilo del pool.
+- async: AsyncSession sobre asyncpg, como la API ahora.
+
+Por modo se reporta throughput, latencia p50/p95/p99 por request y el
+retraso máximo del event loop (una tarea sonda que duerme 10 ms y mide cuánto
+tarda en despertar: con el loop bloqueado, tarda bastante más).
+
+`--db-latency` (solo Postgres) añade `pg_sleep` a la consulta para emular la
+latencia de red de una base remota, que es donde el bloqueo más se nota.
+
+Uso:
+    python -m pipelines.benchmarks.db_concurrency --requests 2000 --concurrency 100
+    python -m pipelines.benchmarks.db_concurrency --db-latency 0.005 --external-latency 0.2 --json bench.json
+"""
+from dataclasses import dataclass, asdict
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+MODES = ["sync", "threadpool", "async"]
+
+# Mismo mapeo que app.db.database.async_database_url en la API
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+LOOKUP_COLUMNS = "id, name, summary, skills"
+PROBE_INTERVAL = 0.01
+
+
+@dataclass
+class ConcurrencyResult:
+    mode: str
+    requests: int
+    concurrency: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_loop_lag_ms: float
+
+
+def async_url(db_url: str):
+    parsed = make_url(db_url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername))
+
+
+def lookup_statement(dialect_name: str, db_latency: float):
+    """Consulta de un candidato por ID; en Postgres opcionalmente con latencia artificial."""
+    if db_latency and dialect_name == "postgresql":
+        return text(
+            f"SELECT {LOOKUP_COLUMNS}, pg_sleep({float(db_latency)}) FROM candidates WHERE id = :id"
+        )
+    return text(f"SELECT {LOOKUP_COLUMNS} FROM candidates WHERE id = :id")
+
+
+def candidate_ids(db_url: str, limit: int = 1000) -> list[int]:
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM candidates ORDER BY id LIMIT :limit"), {"limit": limit}).scalars().all()
+    engine.dispose()
+    return list(ids)
+
+
+async def _probe_loop_lag(stop: asyncio.Event) -> float:
+    """Mayor retraso observado al despertar de un sleep corto (segundos)."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        worst = max(worst, time.perf_counter() - start - PROBE_INTERVAL)
+    return worst
+
+
+async def run_mode(
+    mode: str,
+    db_url: str,
+    ids: list[int],
+    requests: int = 2000,
+    concurrency: int = 100,
+    external_latency: float = 0.05,
+    db_latency: float = 0.0,
+    pool_size: int = 10
+) -> ConcurrencyResult:
+    """Lanza `requests` requests simuladas con a lo sumo `concurrency` en vuelo."""
+    if mode == "async":
+        engine = create_async_engine(async_url(db_url), pool_size=pool_size, max_overflow=0)
+        statement = lookup_statement(engine.dialect.name, db_latency)
+        sessions = async_sessionmaker(engine)
+
+        async def lookup(candidate_id):
+            async with sessions() as db:
+                return (await db.execute(statement, {"id": candidate_id})).first()
+    else:
+        engine = create_engine(db_url, pool_size=pool_size, max_overflow=0)
+        statement = lookup_statement(engine.dialect.name, db_latency)
+        sessions = sessionmaker(engine)
+
+        def blocking_lookup(candidate_id):
+            with sessions() as db:
+                return db.execute(statement, {"id": candidate_id}).first()
+
+        if mode == "sync":
+            async def lookup(candidate_id):
+                return blocking_lookup(candidate_id)
+        else:
+            async def lookup(candidate_id):
+                return await asyncio.to_thread(blocking_lookup, candidate_id)
+
+    limiter = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(i):
+        async with limiter:
+            start = time.perf_counter()
+            await lookup(ids[i % len(ids)])
+            await asyncio.sleep(external_latency)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    max_lag = await probe
+
+    if mode == "async":
+        await engine.dispose()
+    else:
+        engine.dispose()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return ConcurrencyResult(
+        mode=mode,
+        requests=requests,
+        concurrency=concurrency,
+        throughput_rps=requests / elapsed,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        max_loop_lag_ms=max_lag * 1000
+    )
+
+
+def format_report(results: list[ConcurrencyResult]) -> str:
+    """Tabla de texto: una fila por modo."""
+    lines = [f"{'mode':<12} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'loop lag ms':>12}"]
+    for r in results:
+        lines.append(
+            f"{r.mode:<12} {r.throughput_rps:>9.1f} {r.p50_ms:>9.2f} {r.p95_ms:>9.2f} "
+            f"{r.p99_ms:>9.2f} {r.max_loop_lag_ms:>12.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Throughput de sesión síncrona vs AsyncSession bajo concurrencia")
+    parser.add_argument("--db-url", default=os.getenv("DATABASE_URL"), help="Postgres con la tabla candidates poblada")
+    parser.add_argument("--modes", type=lambda v: [m for m in v.split(",") if m], default=MODES)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests simultáneas en vuelo")
+    parser.add_argument("--external-latency", type=float, default=0.05,
+                        help="Segundos de espera de la llamada externa simulada (LLM)")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Latencia artificial por consulta (pg_sleep)")
+    parser.add_argument("--pool-size", type=int, default=int(os.getenv("DB_POOL_SIZE", 10)))
+    parser.add_argument("--json", dest="json_path", help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    ids = candidate_ids(args.db_url)
+    if not ids:
+        parser.error("La tabla candidates está vacía")
+    logger.info("%d candidatos; %d requests con concurrencia %d", len(ids), args.requests, args.concurrency)
+
+    results = [
+        asyncio.run(run_mode(
+            mode, args.db_url, ids, args.requests, args.concurrency,
+            args.external_latency, args.db_latency, args.pool_size
+        ))
+        for mode in args.modes
+    ]
+    print(format_report(results))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
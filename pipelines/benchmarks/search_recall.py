@@ -0,0 +1,266 @@
+"""
+Benchmark de recall vs latencia de la búsqueda en Qdrant.
+
+Carga un corpus (sintético, exportado de la colección `candidates` o un .npy)
+en una colección temporal de un Qdrant local, calcula el ground truth exacto
+por fuerza bruta con NumPy (producto de matrices sobre vectores normalizados)
+y recorre una rejilla de parámetros de búsqueda (`hnsw_ef`, `exact`,
+rescore/oversampling de cuantización) midiendo recall@k y latencia
+p50/p95/p99 de `query_points`.
+
+Los parámetros se traducen con el mismo `search_params_from_tuning` que usa
+la API, así que una fila del informe corresponde a SEARCH_* en el entorno o a
+los campos homónimos de SearchRequest.
+
+Uso:
+    python -m pipelines.benchmarks.search_recall --corpus synthetic --size 20000 --dim 1024
+    python -m pipelines.benchmarks.search_recall --corpus export --source-url http://qdrant:6333 --quantization scalar
+"""
+from dataclasses import dataclass, asdict
+import argparse
+import itertools
+import json
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import VectorParams, Distance, HnswConfigDiff, OptimizersConfigDiff, CollectionStatus
+
+from pipelines.etl.load import quantization_config
+from pipelines.utils.search_service import search_params_from_tuning
+
+logger = logging.getLogger(__name__)
+
+BENCH_COLLECTION = "candidates_bench"
+
+
+@dataclass
+class BenchResult:
+    params: dict
+    recall: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    qps: float
+
+
+def synthetic_corpus(size: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Vectores agrupados en `clusters` centros, parecido a embeddings reales (no uniformes)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assignment = rng.integers(clusters, size=size)
+    return centers[assignment] + 0.35 * rng.normal(size=(size, dim)).astype(np.float32)
+
+
+def export_corpus(qdrant_url: str, collection_name: str = "candidates", batch_size: int = 512) -> np.ndarray:
+    """Vectores densos de una colección existente (p. ej. la de producción)."""
+    client = QdrantClient(url=qdrant_url)
+    vectors, offset = [], None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+        vectors.extend(p.vector[""] if isinstance(p.vector, dict) else p.vector for p in points)
+        if offset is None:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def make_queries(corpus: np.ndarray, count: int, noise: float = 0.1, seed: int = 1) -> np.ndarray:
+    """Queries cercanas a puntos del corpus pero que no coinciden con ninguno."""
+    rng = np.random.default_rng(seed)
+    base = corpus[rng.choice(len(corpus), size=count, replace=count > len(corpus))]
+    scale = noise * np.linalg.norm(base, axis=1, keepdims=True) / np.sqrt(corpus.shape[1])
+    return base + scale * rng.normal(size=base.shape).astype(np.float32)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def ground_truth(corpus: np.ndarray, queries: np.ndarray, k: int, block_size: int = 1024) -> np.ndarray:
+    """Top-k exacto por similitud coseno (índices del corpus), por bloques de queries."""
+    normalized = _normalize(corpus)
+    truth = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), block_size):
+        sims = _normalize(queries[start:start + block_size]) @ normalized.T
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(sims, top, axis=1), axis=1)
+        truth[start:start + block_size] = np.take_along_axis(top, order, axis=1)
+    return truth
+
+
+def recall_at_k(truth: np.ndarray, found: list[list[int]]) -> float:
+    """Fracción media del top-k exacto recuperada por la búsqueda."""
+    k = truth.shape[1]
+    return float(np.mean([len(set(row) & set(ids[:k])) / k for row, ids in zip(truth.tolist(), found)]))
+
+
+def load_collection(
+    client: QdrantClient,
+    corpus: np.ndarray,
+    quantization: str = "none",
+    m: int = 16,
+    ef_construct: int = 100,
+    timeout: float = 600
+) -> None:
+    """Recrea la colección de benchmark y espera a que el HNSW esté construido."""
+    if client.collection_exists(BENCH_COLLECTION):
+        client.delete_collection(BENCH_COLLECTION)
+    client.create_collection(
+        collection_name=BENCH_COLLECTION,
+        vectors_config=VectorParams(size=corpus.shape[1], distance=Distance.COSINE),
+        hnsw_config=HnswConfigDiff(m=m, ef_construct=ef_construct),
+        # Indexar desde el primer segmento: con el umbral por defecto un corpus
+        # pequeño se buscaría por fuerza bruta y el recall sería siempre 1.0
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1),
+        quantization_config=quantization_config(quantization)
+    )
+    client.upload_collection(
+        collection_name=BENCH_COLLECTION,
+        vectors=corpus,
+        ids=range(len(corpus)),
+        batch_size=256,
+        wait=True
+    )
+
+    deadline = time.monotonic() + timeout
+    while client.get_collection(BENCH_COLLECTION).status != CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            raise TimeoutError("La colección de benchmark no terminó de indexarse")
+        time.sleep(0.5)
+
+
+def parameter_grid(
+    ef_values: list[int],
+    oversampling_values: list[float],
+    quantized: bool
+) -> list[dict]:
+    """Configuraciones a medir: búsqueda exacta de referencia y el barrido de hnsw_ef (× oversampling)."""
+    grid = [{"exact": True}]
+    if not quantized:
+        return grid + [{"hnsw_ef": ef} for ef in ef_values]
+    for ef, oversampling, rescore in itertools.product(ef_values, oversampling_values, (False, True)):
+        grid.append({
+            "hnsw_ef": ef,
+            "quantization_oversampling": oversampling,
+            "quantization_rescore": rescore
+        })
+    return grid
+
+
+def run_config(
+    client: QdrantClient,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    tuning: dict,
+    warmup: int = 10
+) -> BenchResult:
+    """Ejecuta todas las queries (secuenciales) con una configuración y mide recall y latencia."""
+    k = truth.shape[1]
+    search_params = search_params_from_tuning(tuning)
+
+    def query(vector):
+        return client.query_points(
+            collection_name=BENCH_COLLECTION,
+            query=vector.tolist(),
+            limit=k,
+            search_params=search_params,
+            with_payload=False
+        ).points
+
+    for vector in queries[:warmup]:
+        query(vector)
+
+    found, latencies = [], []
+    for vector in queries:
+        start = time.perf_counter()
+        points = query(vector)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append([p.id for p in points])
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return BenchResult(
+        params=tuning,
+        recall=recall_at_k(truth, found),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        qps=len(queries) / (sum(latencies) / 1000)
+    )
+
+
+def format_report(results: list[BenchResult], k: int) -> str:
+    """Tabla de texto: una fila por configuración."""
+    lines = [f"{'params':<72} {'recall@' + str(k):>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'qps':>8}"]
+    for r in results:
+        params = ", ".join(f"{key}={value}" for key, value in r.params.items())
+        lines.append(
+            f"{params:<72} {r.recall:>9.4f} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} {r.p99_ms:>8.2f} {r.qps:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _csv(cast):
+    return lambda value: [cast(v) for v in value.split(",") if v]
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Recall@k vs latencia de la búsqueda en Qdrant")
+    parser.add_argument("--qdrant-url", default=os.getenv("BENCH_QDRANT_URL", "http://localhost:6333"),
+                        help="Qdrant donde se crea la colección de benchmark (no usar el de producción)")
+    parser.add_argument("--corpus", default="synthetic",
+                        help="'synthetic', 'export' (desde --source-url) o ruta a un .npy")
+    parser.add_argument("--source-url", default=os.getenv("QDRANT_URL"), help="Qdrant del que exportar el corpus")
+    parser.add_argument("--size", type=int, default=20000, help="Tamaño del corpus sintético")
+    parser.add_argument("--dim", type=int, default=int(os.getenv("EMBEDDING_DIMENSION", 1024)))
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef", type=_csv(int), default=[16, 32, 64, 128, 256, 512])
+    parser.add_argument("--oversampling", type=_csv(float), default=[1.0, 2.0, 4.0])
+    parser.add_argument("--quantization", choices=["none", "scalar", "binary"], default="none")
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--json", dest="json_path", help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    if args.corpus == "synthetic":
+        corpus = synthetic_corpus(args.size, args.dim)
+    elif args.corpus == "export":
+        corpus = export_corpus(args.source_url)
+    else:
+        corpus = np.load(args.corpus).astype(np.float32)
+    queries = make_queries(corpus, args.queries)
+    logger.info("Corpus: %d vectores de dimensión %d; %d queries", len(corpus), corpus.shape[1], len(queries))
+
+    truth = ground_truth(corpus, queries, args.k)
+
+    client = QdrantClient(url=args.qdrant_url)
+    load_collection(client, corpus, args.quantization, args.m, args.ef_construct)
+
+    results = [
+        run_config(client, queries, truth, tuning)
+        for tuning in parameter_grid(args.ef, args.oversampling, args.quantization != "none")
+    ]
+    print(format_report(results, args.k))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    client.delete_collection(BENCH_COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
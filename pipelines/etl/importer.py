@@ -0,0 +1,283 @@
+"""
+Importación masiva de candidatos desde CSV o NDJSON con COPY.
+
+Las migraciones desde el ATS traen cientos de miles de candidatos y el
+camino ORM (un INSERT por fila) es demasiado lento. El importador:
+
+1. Lee el archivo en streaming y valida las filas en bloques de `chunk_size`
+   (las inválidas se cuentan y se reportan con su número de línea).
+2. Carga cada bloque válido en una tabla temporal con `COPY ... FROM STDIN`.
+3. Fusiona la tabla temporal en `candidates` con un único
+   `INSERT ... SELECT ... ON CONFLICT (email) DO UPDATE`. Si un email se repite
+   gana la última fila; se omiten las filas cuyo teléfono ya pertenece a otro
+   candidato o se repite en el archivo (abortarían el statement).
+4. Borra de la caché de la API (`candidate:{id}`) los candidatos actualizados
+   y encola un único `etl_sync`: el worker Rust indexa los candidatos con
+   `updated_at > last_indexed_at`, es decir, exactamente los importados.
+
+El progreso se publica en Redis (`import:job:{job_id}`) tras cada bloque, de
+modo que el admin puede consultarlo mientras el import sigue en curso.
+
+Uso:
+    python -m pipelines.etl.importer candidatos.csv
+    python -m pipelines.etl.importer export.ndjson --format ndjson --chunk-size 10000
+"""
+from datetime import datetime, timezone
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import re
+
+from dotenv import load_dotenv
+import redis
+from sqlalchemy import create_engine
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FIELDS = [
+    "name", "email", "phone", "location", "headline", "summary",
+    "role", "experience", "skills", "education"
+]
+REQUIRED_FIELDS = ["name", "email", "phone"]
+# Longitudes de las columnas VARCHAR de candidates
+FIELD_LIMITS = {"name": 150, "email": 255, "phone": 15, "location": 100, "headline": 100, "role": 100}
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+IMPORT_STATUS_TTL = 7 * 86400
+MAX_REPORTED_ERRORS = 50
+
+STAGING_TABLE = "candidates_import"
+# Bandera que lee la API para refrescar la vista de conteos por skill (app.core.skill_facets)
+SKILL_FACETS_STALE_KEY = "skill_facets:stale"
+# Caché de candidatos de la API (app.core.candidate_cache)
+CANDIDATE_CACHE_KEY = "candidate:{}"
+
+MERGE_SQL = f"""
+WITH latest AS (
+    SELECT DISTINCT ON (email) * FROM {STAGING_TABLE} ORDER BY email, line DESC
+), accepted AS (
+    SELECT DISTINCT ON (phone) * FROM latest l
+    WHERE NOT EXISTS (
+        SELECT 1 FROM candidates c WHERE c.phone = l.phone AND c.email <> l.email
+    )
+    ORDER BY phone, line DESC
+), merged AS (
+    INSERT INTO candidates ({", ".join(IMPORT_FIELDS)}, is_active)
+    SELECT {", ".join(IMPORT_FIELDS)}, true FROM accepted
+    ON CONFLICT (email) DO UPDATE SET
+        {", ".join(f"{f} = EXCLUDED.{f}" for f in IMPORT_FIELDS if f != "email")},
+        updated_at = now()
+    RETURNING id, (xmax = 0) AS inserted
+)
+SELECT
+    count(*) FILTER (WHERE inserted),
+    count(*) FILTER (WHERE NOT inserted),
+    (SELECT count(*) FROM {STAGING_TABLE}),
+    array_agg(id) FILTER (WHERE NOT inserted)
+FROM merged
+"""
+
+
+def detect_format(filename: str) -> str:
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def iter_records(stream, fmt: str):
+    """Itera (número de línea, dict) sobre un archivo binario sin cargarlo entero."""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text_stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "ndjson":
+        for line_num, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield line_num, record if isinstance(record, dict) else None
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+
+def validate_record(record: dict | None) -> tuple[list | None, str | None]:
+    """Normaliza una fila a la lista de columnas de IMPORT_FIELDS.
+
+    Returns:
+        (valores, None) si es válida o (None, motivo) si no
+    """
+    if record is None:
+        return None, "Fila mal formada"
+
+    values = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        values[field] = "" if value is None else str(value).strip()
+
+    missing = [f for f in REQUIRED_FIELDS if not values[f]]
+    if missing:
+        return None, f"Campos requeridos vacíos: {', '.join(missing)}"
+    if not EMAIL_RE.match(values["email"]):
+        return None, "Email inválido"
+    too_long = [f for f, limit in FIELD_LIMITS.items() if len(values[f]) > limit]
+    if too_long:
+        return None, f"Campos demasiado largos: {', '.join(too_long)}"
+    return [values[f] for f in IMPORT_FIELDS], None
+
+
+def copy_buffer(rows: list[list]) -> io.StringIO:
+    """Bloque de filas (línea + columnas) en formato CSV para COPY FROM STDIN."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def enqueue_index_run(redis_client, requested_by: str) -> None:
+    """Encola una sola indexación incremental (etl_sync) para el worker Rust."""
+    redis_client.rpush(os.getenv("REDIS_QUEUE", "jobs:etl"), json.dumps({
+        "job_type": "etl_sync",
+        "requested_by": requested_by,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }))
+
+
+class CandidateImporter:
+    """Importa un archivo de candidatos a Postgres vía tabla temporal + COPY."""
+
+    def __init__(self, db_url: str, redis_client=None, chunk_size: int = None):
+        """
+        Args:
+            db_url: URL de Postgres (driver psycopg2, necesario para COPY)
+            redis_client: Cliente para progreso y encolado (opcional en la CLI)
+            chunk_size: Filas por bloque de validación y COPY (default: IMPORT_CHUNK_SIZE o 5000)
+        """
+        self.engine = create_engine(db_url)
+        self.redis = redis_client
+        self.chunk_size = chunk_size or int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+
+    def _report(self, job_id: str, progress: dict) -> None:
+        logger.info("Import %s: %s", job_id, {k: v for k, v in progress.items() if k != "errors"})
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(f"import:job:{job_id}", json.dumps(progress), ex=IMPORT_STATUS_TTL)
+        except Exception as e:
+            logger.warning(f"Error publicando el progreso del import: {e}")
+
+    def _invalidate_cached(self, candidate_ids: list[int]) -> None:
+        """Borra de la caché de la API los candidatos que el import actualizó (DEL por bloques)."""
+        for start in range(0, len(candidate_ids), self.chunk_size):
+            chunk = candidate_ids[start:start + self.chunk_size]
+            self.redis.delete(*(CANDIDATE_CACHE_KEY.format(cid) for cid in chunk))
+
+    def import_stream(self, stream, fmt: str, job_id: str, requested_by: str = "import", index: bool = True) -> dict:
+        """Valida, carga y fusiona el archivo; retorna el resumen final.
+
+        Args:
+            stream: Archivo binario (upload o archivo local)
+            fmt: 'csv' o 'ndjson'
+            job_id: Identificador del import (clave de progreso en Redis)
+            requested_by: Origen, se propaga al job de indexación
+            index: Encolar la indexación incremental al terminar
+        """
+        progress = {
+            "status": "loading", "format": fmt, "processed": 0, "valid": 0, "invalid": 0,
+            "errors": [], "started_at": datetime.now(timezone.utc).isoformat()
+        }
+        self._report(job_id, progress)
+
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"CREATE TEMP TABLE {STAGING_TABLE} (line integer, "
+                + ", ".join(f"{f} text" for f in IMPORT_FIELDS)
+                + ") ON COMMIT DROP"
+            )
+            # FORCE_NOT_NULL: un campo vacío es '' (las columnas de candidates son NOT NULL), no NULL
+            copy_sql = (
+                f"COPY {STAGING_TABLE} (line, {', '.join(IMPORT_FIELDS)}) FROM STDIN "
+                f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(IMPORT_FIELDS)}))"
+            )
+
+            chunk = []
+            for line_num, record in iter_records(stream, fmt):
+                values, error = validate_record(record)
+                progress["processed"] += 1
+                if error:
+                    progress["invalid"] += 1
+                    if len(progress["errors"]) < MAX_REPORTED_ERRORS:
+                        progress["errors"].append({"line": line_num, "error": error})
+                else:
+                    chunk.append([line_num, *values])
+
+                if len(chunk) >= self.chunk_size:
+                    cursor.copy_expert(copy_sql, copy_buffer(chunk))
+                    progress["valid"] += len(chunk)
+                    chunk = []
+                    self._report(job_id, progress)
+
+            if chunk:
+                cursor.copy_expert(copy_sql, copy_buffer(chunk))
+                progress["valid"] += len(chunk)
+
+            progress["status"] = "merging"
+            self._report(job_id, progress)
+
+            cursor.execute(MERGE_SQL)
+            created, updated, staged, updated_ids = cursor.fetchone()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            progress.update(status="error", error=str(e))
+            self._report(job_id, progress)
+            raise
+        finally:
+            conn.close()
+
+        progress.update(created=created, updated=updated, skipped=staged - created - updated)
+
+        if (created or updated) and self.redis is not None:
+            self.redis.set(SKILL_FACETS_STALE_KEY, 1)
+            self._invalidate_cached(updated_ids or [])
+            if index:
+                enqueue_index_run(self.redis, requested_by=f"{requested_by}:{job_id}")
+                progress["index_job"] = "etl_sync"
+
+        progress.update(status="success", finished_at=datetime.now(timezone.utc).isoformat())
+        self._report(job_id, progress)
+        return progress
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Importa candidatos desde CSV o NDJSON con COPY")
+    parser.add_argument("path", help="Archivo CSV (con cabecera) o NDJSON")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Por defecto se deduce de la extensión")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--no-index", action="store_true", help="No encolar la indexación al terminar")
+    args = parser.parse_args()
+
+    job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    importer = CandidateImporter(os.getenv("DATABASE_URL"), redis.from_url(os.getenv("REDIS_URL")), args.chunk_size)
+
+    with open(args.path, "rb") as f:
+        result = importer.import_stream(
+            f, args.format or detect_format(args.path), job_id, requested_by="cli", index=not args.no_index
+        )
+
+    print(json.dumps({k: v for k, v in result.items() if k != "errors"}, indent=2))
+    for error in result["errors"]:
+        print(f"  línea {error['line']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Job que precalcula el grafo de k vecinos más cercanos de todos los candidatos.
+
+Exporta los vectores de Qdrant, calcula las similitudes con multiplicación de
+matrices por bloques (KNN_BLOCK_SIZE filas a la vez, memoria O(bloque × n)) y
+publica los top-k (KNN_GRAPH_K) de cada candidato en Redis (ver
+`pipelines.utils.knn_store`).
+
+Tras cada carga, `run_pipeline` hace una actualización incremental: se
+recalculan las filas de los candidatos cambiados y se parchean los vecinos
+afectados. Los jobs del worker Rust (single_index, batch_index, delete_point,
+etl_sync, full_reindex) también incrementan `index:version` pero no tocan el
+grafo: desde ese momento `find_similar` usa la búsqueda en vivo hasta que el
+grafo se reconstruye. Para acotar esa ventana, la reconstrucción se programa
+por cron; con `--if-stale` no hace nada si el grafo ya está al día:
+
+    python -m pipelines.etl.knn_graph
+    python -m pipelines.etl.knn_graph --if-stale
+"""
+from qdrant_client import QdrantClient
+from dotenv import load_dotenv
+from pipelines.utils.index_version import get_index_version
+from pipelines.utils.knn_store import (
+    KNN_GRAPH_KEY, KNN_PAYLOAD_KEY, KNN_META_KEY,
+    encode_neighbors, decode_neighbors, encode_payload
+)
+from datetime import datetime
+from typing import Optional
+import argparse
+import logging
+import os
+
+import numpy as np
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class KnnGraphBuilder:
+    """Construye y mantiene el grafo kNN a partir de la colección de Qdrant."""
+
+    def __init__(self, qdrant_url, redis_client, k: Optional[int] = None, block_size: Optional[int] = None):
+        """Inicializa el constructor del grafo.
+
+        Args:
+            qdrant_url: Host del servidor Qdrant
+            redis_client: Cliente Redis síncrono donde se publica el grafo
+            k: Vecinos por candidato (default: KNN_GRAPH_K o 50)
+            block_size: Filas por bloque de la multiplicación (default: KNN_BLOCK_SIZE o 1024)
+        """
+        self.q_client = QdrantClient(url=qdrant_url)
+        self.redis = redis_client
+        self.collection_name = "candidates"
+        self.k = k or int(os.getenv("KNN_GRAPH_K", 50))
+        self.block_size = block_size or int(os.getenv("KNN_BLOCK_SIZE", 1024))
+        self.embedding_distance = os.getenv("EMBEDDING_DISTANCE", "Cosine")
+
+    def export_vectors(self):
+        """Exporta todos los puntos de la colección.
+
+        Returns:
+            tuple: (ids int64, matriz float32 n × d, payloads por id)
+        """
+        if self.embedding_distance not in ("Cosine", "Dot"):
+            raise ValueError(f"Distancia no soportada para el grafo kNN: {self.embedding_distance}")
+
+        ids, vectors, payloads = [], [], {}
+        offset = None
+        while True:
+            points, offset = self.q_client.scroll(
+                collection_name=self.collection_name,
+                limit=1000,
+                offset=offset,
+                with_payload=["name", "text_content", "update_at"],
+                with_vectors=True
+            )
+            for p in points:
+                ids.append(p.id)
+                # Con el vector disperso de palabras clave el denso llega bajo el nombre ""
+                vectors.append(p.vector[""] if isinstance(p.vector, dict) else p.vector)
+                payloads[p.id] = p.payload or {}
+            if offset is None:
+                break
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if self.embedding_distance == "Cosine" and len(ids):
+            # Con vectores normalizados el producto punto es la similitud coseno de Qdrant
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.maximum(norms, 1e-12)
+
+        return np.asarray(ids, dtype=np.int64), matrix, payloads
+
+    def _top_k(self, matrix, rows):
+        """Top-k vecinos de `rows` (índices en `matrix`) excluyendo a cada punto mismo."""
+        n = matrix.shape[0]
+        k = min(self.k, n - 1)
+        for start in range(0, len(rows), self.block_size):
+            block = rows[start:start + self.block_size]
+            sims = matrix[block] @ matrix.T
+            sims[np.arange(len(block)), block] = -np.inf
+
+            if k <= 0:
+                for row in block:
+                    yield row, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+                continue
+
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for i, row in enumerate(block):
+                yield row, top[i], top_scores[i]
+
+    def is_stale(self) -> bool:
+        """Si el grafo no refleja la versión actual del índice (o no existe)."""
+        graph_version = self.redis.hget(KNN_META_KEY, "version")
+        return graph_version is None or int(graph_version) != get_index_version(self.redis)
+
+    def _write_meta(self, pipe, version: int, size: int) -> None:
+        pipe.hset(KNN_META_KEY, mapping={
+            "version": version,
+            "k": self.k,
+            "size": size,
+            "updated_at": datetime.now().isoformat()
+        })
+
+    def build(self) -> int:
+        """Reconstruye el grafo completo.
+
+        Se escribe en claves temporales y se publica con RENAME atómico, así
+        los lectores nunca ven un grafo a medias.
+
+        Returns:
+            Número de candidatos en el grafo
+        """
+        version = get_index_version(self.redis)
+        ids, matrix, payloads = self.export_vectors()
+        tmp_graph, tmp_payload = f"{KNN_GRAPH_KEY}:tmp", f"{KNN_PAYLOAD_KEY}:tmp"
+
+        self.redis.delete(tmp_graph, tmp_payload)
+        pipe = self.redis.pipeline(transaction=False)
+        for row, neighbors, scores in self._top_k(matrix, np.arange(len(ids))):
+            pipe.hset(tmp_graph, str(ids[row]), encode_neighbors(ids[neighbors], scores))
+            pipe.hset(tmp_payload, str(ids[row]), encode_payload(payloads[ids[row]]))
+        pipe.execute()
+
+        pipe = self.redis.pipeline(transaction=True)
+        if len(ids):
+            pipe.rename(tmp_graph, KNN_GRAPH_KEY)
+            pipe.rename(tmp_payload, KNN_PAYLOAD_KEY)
+        else:
+            pipe.delete(KNN_GRAPH_KEY, KNN_PAYLOAD_KEY)
+        self._write_meta(pipe, version, len(ids))
+        pipe.execute()
+
+        logger.info(f"Grafo kNN reconstruido: {len(ids)} candidatos, k={self.k}, versión {version}")
+        return len(ids)
+
+    def update(self, changed_ids, base_version: int) -> int:
+        """Actualiza el grafo tras indexar o eliminar `changed_ids`.
+
+        Recalcula las filas de los candidatos cambiados y, para el resto,
+        incorpora a los cambiados que superen su peor vecino actual. Las filas
+        que contenían a un candidato cambiado se recalculan completas, porque
+        su score pudo bajar. Si el grafo no reflejaba `base_version` o el
+        índice cambió por otra vía, se hace una reconstrucción completa.
+
+        Args:
+            changed_ids: IDs indexados o eliminados desde `base_version`
+            base_version: Versión del índice antes de aplicar esos cambios
+
+        Returns:
+            Número de filas del grafo reescritas
+        """
+        graph_version = self.redis.hget(KNN_META_KEY, "version")
+        graph_k = self.redis.hget(KNN_META_KEY, "k")
+        version = get_index_version(self.redis)
+        if (
+            graph_version is None
+            or int(graph_version) != base_version
+            or int(graph_k or 0) != self.k
+            or version != base_version + 1
+        ):
+            return self.build()
+
+        ids, matrix, payloads = self.export_vectors()
+        position = {int(cid): i for i, cid in enumerate(ids)}
+        changed = {int(cid) for cid in changed_ids}
+        removed = {cid for cid in changed if cid not in position}
+        changed_rows = np.array(sorted(position[cid] for cid in changed - removed), dtype=np.int64)
+
+        graph = {
+            int(cid): decode_neighbors(raw)
+            for cid, raw in self.redis.hgetall(KNN_GRAPH_KEY).items()
+        }
+
+        dirty = set(changed_rows.tolist())
+        patched = {}
+        sims = matrix @ matrix[changed_rows].T if len(changed_rows) else np.empty((len(ids), 0))
+
+        for cid, i in position.items():
+            if i in dirty:
+                continue
+            row = graph.get(cid)
+            if row is None or changed.intersection(row[0]):
+                dirty.add(i)
+                continue
+            if not len(changed_rows):
+                continue
+
+            neighbor_ids, neighbor_scores = row
+            worst = neighbor_scores[-1] if len(neighbor_ids) >= self.k else -np.inf
+            better = sims[i] > worst
+            if better.any():
+                merged = list(zip(neighbor_ids, neighbor_scores)) + [
+                    (int(ids[changed_rows[j]]), float(sims[i, j])) for j in np.flatnonzero(better)
+                ]
+                merged.sort(key=lambda pair: pair[1], reverse=True)
+                patched[cid] = merged[:self.k]
+
+        pipe = self.redis.pipeline(transaction=True)
+        for row, neighbors, scores in self._top_k(matrix, np.array(sorted(dirty), dtype=np.int64)):
+            pipe.hset(KNN_GRAPH_KEY, str(ids[row]), encode_neighbors(ids[neighbors], scores))
+        for cid, pairs in patched.items():
+            pipe.hset(KNN_GRAPH_KEY, str(cid), encode_neighbors(*zip(*pairs)))
+        for i in changed_rows:
+            pipe.hset(KNN_PAYLOAD_KEY, str(ids[i]), encode_payload(payloads[ids[i]]))
+        if removed:
+            pipe.hdel(KNN_GRAPH_KEY, *[str(cid) for cid in removed])
+            pipe.hdel(KNN_PAYLOAD_KEY, *[str(cid) for cid in removed])
+        self._write_meta(pipe, version, len(ids))
+        pipe.execute()
+
+        logger.info(
+            f"Grafo kNN actualizado: {len(dirty)} filas recalculadas, "
+            f"{len(patched)} parcheadas, {len(removed)} eliminadas"
+        )
+        return len(dirty) + len(patched)
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Reconstruye el grafo kNN de candidatos similares")
+    parser.add_argument("--if-stale", action="store_true",
+                        help="Solo reconstruir si el índice cambió desde la última construcción (para cron)")
+    args = parser.parse_args()
+
+    builder = KnnGraphBuilder(os.getenv("QDRANT_URL"), redis.from_url(os.getenv("REDIS_URL")))
+    if args.if_stale and not builder.is_stale():
+        logger.info("Grafo kNN al día con la versión del índice; nada que hacer")
+        return
+    builder.build()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
+from qdrant_client.models import (
+    PointStruct, VectorParams, Distance, PayloadSchemaType, TextIndexParams, TextIndexType, TokenizerType,
+    SparseVectorParams, SparseVector, Modifier, ScalarQuantization, ScalarQuantizationConfig,
+    ScalarType, BinaryQuantization, BinaryQuantizationConfig
+)
+from pipelines.utils.skills import SKILLS_PAYLOAD_KEY
+from pipelines.utils.sparse import SPARSE_VECTOR_NAME
 from sqlalchemy import create_engine, text
 from pipelines.utils.retry import pipeline_retry
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 class Loader:
     def __init__(self, qdrant_url, db_url):
         self.q_client =QdrantClient(url=qdrant_url)
@@ -11,6 +20,10 @@ class Loader:
         self.collection_name = "candidates"
         self.embedding_dimension = os.getenv("EMBEDDING_DIMENSION")
         self.embedding_distance = os.getenv("EMBEDDING_DISTANCE", "Cosine")
+        self.embedding_quantization = os.getenv("EMBEDDING_QUANTIZATION", "none")
+        # Si la colección tiene el vector disperso; las creadas antes de la búsqueda
+        # híbrida no lo tienen y rechazan los puntos que lo incluyen
+        self.sparse_enabled = True
         
     @pipeline_retry
     def ensure_collection(self):
@@ -26,12 +39,52 @@ class Loader:
                 vectors_config = VectorParams(
                     size=self.embedding_dimension, 
                     distance=distance_map.get(self.embedding_distance, Distance.COSINE)
+                ),
+                # Vector disperso de palabras clave para la búsqueda híbrida; IDF en el servidor
+                sparse_vectors_config = {
+                    SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+                },
+                quantization_config = quantization_config(self.embedding_quantization)
+            )
+            self.sparse_enabled = True
+        else:
+            sparse_vectors = self.q_client.get_collection(self.collection_name).config.params.sparse_vectors
+            self.sparse_enabled = bool(sparse_vectors) and SPARSE_VECTOR_NAME in sparse_vectors
+            if not self.sparse_enabled:
+                # Qdrant no permite añadir vectores con nombre a una colección existente:
+                # se suben solo densos hasta que un rebuild la recree
+                logger.warning(
+                    "La colección %s no tiene el vector disperso '%s'; se indexa solo el denso "
+                    "(reconstruirla con /v1/admin/qdrant/rebuild para activar la búsqueda híbrida)",
+                    self.collection_name, SPARSE_VECTOR_NAME
                 )
+
+        # Índice de texto sobre el nombre: el planificador de búsqueda estima la
+        # selectividad de name_filter con él (la operación es idempotente). Con el
+        # índice, name_filter busca prefijos de palabra sin distinguir mayúsculas
+        # ("gar" encuentra "Ana García", "ez" no encuentra "Pérez"). El worker Rust
+        # crea el mismo índice; su cliente no admite ascii_folding, así que
+        # tampoco se activa aquí y los acentos cuentan.
+        self.q_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="name",
+            field_schema=TextIndexParams(
+                type=TextIndexType.TEXT,
+                tokenizer=TokenizerType.PREFIX,
+                lowercase=True
             )
+        )
+        # Índice keyword sobre las skills normalizadas: skills_filter compara
+        # skills completas (MatchAny) en lugar de subcadenas de text_content
+        self.q_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=SKILLS_PAYLOAD_KEY,
+            field_schema=PayloadSchemaType.KEYWORD
+        )
     
     @pipeline_retry
     def load_points(self, points_data):
-        points = [PointStruct(id=p['id'], vector=p['vector'], payload=p['payload']) for p in points_data]
+        points = [PointStruct(id=p['id'], vector=_point_vectors(p, self.sparse_enabled), payload=p['payload']) for p in points_data]
         self.q_client.upsert(collection_name=self.collection_name, points=points)
 
     def mark_as_indexed(self, candidate_ids):
@@ -40,4 +93,28 @@ class Loader:
         query = text("UPDATE candidates SET last_indexed_at = NOW() WHERE id IN :ids")
         with self.engine.connect() as conn:
             conn.execute(query, {"ids": tuple(candidate_ids)})
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+
+
+def _point_vectors(point_data, sparse_enabled=True):
+    """Vector denso (sin nombre) más el disperso de palabras clave si el Transformer lo generó
+    y la colección lo admite."""
+    sparse = point_data.get('sparse_vector')
+    if not sparse_enabled or not sparse or not sparse['indices']:
+        return point_data['vector']
+    return {"": point_data['vector'], SPARSE_VECTOR_NAME: SparseVector(**sparse)}
+
+
+def quantization_config(name: str):
+    """Cuantización del vector denso: "scalar" (int8, 4x menos memoria), "binary" (32x) o "none".
+
+    Los vectores cuantizados se mantienen en RAM; los originales quedan
+    disponibles para el rescore (ver `quantization_rescore` en la búsqueda).
+    """
+    if name == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if name == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
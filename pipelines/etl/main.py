@@ -2,16 +2,22 @@ from datetime import datetime
 from pipelines.etl.extract import Extractor
 from pipelines.etl.transform import Transformer
 from pipelines.etl.load import Loader
+from pipelines.etl.knn_graph import KnnGraphBuilder
+from pipelines.etl.saved_search_matcher import SavedSearchMatcher
+from pipelines.utils.index_version import bump_index_version, get_index_version
 from dotenv import load_dotenv
-import os, redis, json
+import os, redis, json, logging
 
 load_dotenv()
 
 DB_URL = os.getenv("DATABASE_URL")
 QDRANT_URL = os.getenv("QDRANT_URL")
 REDIS_URL = os.getenv("REDIS_URL")
+KNN_GRAPH_ENABLED = os.getenv("KNN_GRAPH_ENABLED", "true").lower() == "true"
+SAVED_SEARCH_MATCHING_ENABLED = os.getenv("SAVED_SEARCH_MATCHING_ENABLED", "true").lower() == "true"
 
 r = redis.from_url(REDIS_URL)
+logger = logging.getLogger(__name__)
 
 def log_execution(status: str, message: str, processed: int, error: str = None):
     """Loggea una ejecución de ETL en Redis para seguimiento."""
@@ -24,6 +30,32 @@ def log_execution(status: str, message: str, processed: int, error: str = None):
     }
     r.rpush('etl_executions', json.dumps(execution))
 
+def refresh_knn_graph(changed_ids, base_version: int):
+    """Actualiza el grafo kNN precalculado con los candidatos recién cargados.
+
+    Un fallo no interrumpe el ETL: el grafo queda obsoleto y `find_similar`
+    vuelve a la búsqueda en vivo hasta la siguiente actualización.
+    """
+    if not KNN_GRAPH_ENABLED:
+        return
+    try:
+        KnnGraphBuilder(QDRANT_URL, r).update(changed_ids, base_version)
+    except Exception as e:
+        logger.error(f"Error actualizando el grafo kNN: {e}")
+
+def match_saved_searches(points_data):
+    """Registra las coincidencias de las búsquedas guardadas con los candidatos recién cargados.
+
+    Un fallo no interrumpe el ETL: esas coincidencias se recuperan con
+    `python -m pipelines.etl.saved_search_matcher`.
+    """
+    if not SAVED_SEARCH_MATCHING_ENABLED:
+        return
+    try:
+        SavedSearchMatcher(DB_URL).match(points_data)
+    except Exception as e:
+        logger.error(f"Error registrando coincidencias de búsquedas guardadas: {e}")
+
 def run_pipeline():
     job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     status_key = f"etl:job:{job_id}"
@@ -53,10 +85,14 @@ def run_pipeline():
 
         r.set(status_key, json.dumps({"status": "loading", "count": len(processed_data)}))
 
+        base_version = get_index_version(r)
         loader.load_points(processed_data)
+        bump_index_version(r)
 
         candidate_ids = [p['id'] for p in processed_data]
         loader.mark_as_indexed(candidate_ids)
+        refresh_knn_graph(candidate_ids, base_version)
+        match_saved_searches(processed_data)
         
         processed = len(candidate_ids)
 
@@ -0,0 +1,189 @@
+"""
+Búsqueda inversa: búsquedas guardadas contra candidatos recién indexados.
+
+Los reclutadores repetían cada mañana las mismas búsquedas para encontrar
+candidatos nuevos (un embed y una consulta a Qdrant por búsqueda). Ahora cada
+búsqueda guardada tiene su embedding precalculado en `saved_searches` y, cuando
+el ETL indexa un lote, se puntúan todos los vectores nuevos contra todas las
+búsquedas con un solo producto de matrices:
+
+    scores = Q (n_búsquedas × d) · Vᵀ (d × n_candidatos)
+
+Los pares que superan el umbral de su búsqueda (y sus filtros de nombre y
+skills) se registran en `saved_search_matches`, que alimenta el feed
+`GET /v1/saved_searches/{id}/matches` sin tráfico de búsqueda.
+
+Los candidatos que indexa el worker Rust no pasan por el ETL de Python:
+`python -m pipelines.etl.saved_search_matcher` recupera de Qdrant los
+indexados desde la última ejecución (marca de agua en Redis) y los puntúa igual.
+"""
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import re
+
+from dotenv import load_dotenv
+import numpy as np
+import redis
+from qdrant_client import QdrantClient
+from sqlalchemy import create_engine, text
+
+from pipelines.utils.skills import SKILLS_PAYLOAD_KEY, normalize_skills
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_KEY = "saved_search:watermark"
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _matches_filters(saved_search, name: str, skills: list[str]) -> bool:
+    """Réplica en memoria de los filtros de la búsqueda (prefijo en nombre, OR de skills completas)."""
+    if saved_search["name_filter"]:
+        # Como el índice PREFIX de Qdrant: palabras en minúsculas, acentos incluidos
+        name_terms = _WORD_RE.findall(name.lower())
+        if not all(
+            any(term.startswith(q) for term in name_terms)
+            for q in _WORD_RE.findall(saved_search["name_filter"].lower())
+        ):
+            return False
+
+    wanted = saved_search["skills_filter"]
+    if isinstance(wanted, str):
+        wanted = json.loads(wanted)
+    wanted = normalize_skills(",".join(wanted or []))
+    if wanted:
+        return not set(wanted).isdisjoint(skills)
+    return True
+
+
+class SavedSearchMatcher:
+    """Registra las coincidencias de las búsquedas guardadas para un lote de candidatos."""
+
+    def __init__(self, db_url: str, batch_size: int = None):
+        """
+        Args:
+            db_url: URL de Postgres
+            batch_size: Búsquedas guardadas por bloque de la matriz Q (default: SAVED_SEARCH_BATCH o 1024)
+        """
+        self.engine = create_engine(db_url)
+        self.batch_size = batch_size or int(os.getenv("SAVED_SEARCH_BATCH", 1024))
+
+    def _saved_search_batches(self, conn):
+        """Búsquedas guardadas en bloques por keyset sobre id (memoria acotada)."""
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    "SELECT id, query_vector, score_threshold, skills_filter, name_filter "
+                    "FROM saved_searches WHERE id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": self.batch_size}
+            ).mappings().all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]["id"]
+
+    def match(self, points_data) -> int:
+        """Puntúa los candidatos contra todas las búsquedas guardadas y registra las coincidencias.
+
+        Args:
+            points_data: Puntos del Transformer (`id`, `vector`, `payload` con name y skills)
+
+        Returns:
+            Número de coincidencias encontradas (las ya registradas se ignoran)
+        """
+        if not points_data:
+            return 0
+
+        vectors = _normalize(np.asarray([p["vector"] for p in points_data], dtype=np.float32))
+        dim = vectors.shape[1]
+        matches = []
+
+        with self.engine.connect() as conn:
+            for rows in self._saved_search_batches(conn):
+                # Una búsqueda guardada con otro modelo de embeddings no es comparable
+                rows = [r for r in rows if len(r["query_vector"]) == dim * 4]
+                if not rows:
+                    continue
+                queries = _normalize(np.stack([np.frombuffer(r["query_vector"], dtype=np.float32) for r in rows]))
+                thresholds = np.array([r["score_threshold"] for r in rows], dtype=np.float32)
+
+                scores = queries @ vectors.T
+                for qi, ci in zip(*np.nonzero(scores >= thresholds[:, None])):
+                    payload = points_data[ci]["payload"]
+                    if _matches_filters(rows[qi], payload.get("name") or "", payload.get(SKILLS_PAYLOAD_KEY) or []):
+                        matches.append({
+                            "saved_search_id": rows[qi]["id"],
+                            "candidate_id": points_data[ci]["id"],
+                            "score": float(scores[qi, ci])
+                        })
+
+            if matches:
+                # Un candidato re-indexado que ya coincidía no vuelve a aparecer como nuevo
+                conn.execute(
+                    text(
+                        "INSERT INTO saved_search_matches (saved_search_id, candidate_id, score) "
+                        "VALUES (:saved_search_id, :candidate_id, :score) "
+                        "ON CONFLICT (saved_search_id, candidate_id) DO NOTHING"
+                    ),
+                    matches
+                )
+                conn.commit()
+
+        logger.info(f"Búsquedas guardadas: {len(matches)} coincidencias en {len(points_data)} candidatos")
+        return len(matches)
+
+    def match_indexed_since(self, qdrant_url: str, since: datetime, batch_size: int = 256) -> int:
+        """Puntúa los candidatos indexados después de `since` leyendo sus vectores de Qdrant.
+
+        Cubre los candidatos que indexa el worker Rust (alta y edición en la API).
+        """
+        with self.engine.connect() as conn:
+            ids = conn.execute(
+                text("SELECT id FROM candidates WHERE last_indexed_at > :since ORDER BY id"),
+                {"since": since}
+            ).scalars().all()
+
+        client = QdrantClient(url=qdrant_url)
+        total = 0
+        for start in range(0, len(ids), batch_size):
+            points = client.retrieve(
+                collection_name="candidates",
+                ids=ids[start:start + batch_size],
+                with_payload=True,
+                with_vectors=True
+            )
+            total += self.match([
+                {
+                    "id": p.id,
+                    "vector": p.vector[""] if isinstance(p.vector, dict) else p.vector,
+                    "payload": p.payload or {}
+                }
+                for p in points
+            ])
+        return total
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    redis_client = redis.from_url(os.getenv("REDIS_URL"))
+    started = datetime.now(timezone.utc)
+    raw = redis_client.get(WATERMARK_KEY)
+    since = datetime.fromisoformat(raw.decode()) if raw else datetime.fromtimestamp(0, timezone.utc)
+
+    SavedSearchMatcher(os.getenv("DATABASE_URL")).match_indexed_since(os.getenv("QDRANT_URL"), since)
+    redis_client.set(WATERMARK_KEY, started.isoformat())
+
+
+if __name__ == "__main__":
+    main()
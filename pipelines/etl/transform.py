@@ -1,4 +1,6 @@
 from pipelines.utils.embeddings_service import EmbeddingsService
+from pipelines.utils.skills import SKILLS_PAYLOAD_KEY, normalize_skills
+from pipelines.utils.sparse import document_sparse_vector
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,9 +49,11 @@ class Transformer:
             return {
                 "id": candidate_row.id,
                 "vector": vector,
+                "sparse_vector": document_sparse_vector(context_text),
                 "payload": {
                     "name": name,
                     "text_content": context_text,
+                    SKILLS_PAYLOAD_KEY: normalize_skills(skills),
                     "update_at": str(getattr(candidate_row, 'updated_at', ''))
                 }
             }
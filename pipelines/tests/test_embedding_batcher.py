@@ -0,0 +1,92 @@
+"""
+Tests unitarios para CoalescingEmbedder.
+
+¿Por qué testear el micro-batching?
+- Un future sin resolver deja colgada la request de búsqueda que lo espera
+- El orden de los vectores del lote debe corresponder a cada texto original
+- Las queries idénticas en vuelo deben compartir una única entrada del lote
+- Un error del proveedor debe propagarse a todas las requests del lote
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+
+def _provider(side_effect=None):
+    """Simula AsyncEmbeddingsService.generate_embeddings (un vector por texto)."""
+    service = MagicMock()
+    service.model = "embed-multilingual-v3.0"
+    service.generate_embeddings = AsyncMock(
+        side_effect=side_effect or (lambda texts, input_type: [[float(len(t))] for t in texts])
+    )
+    return service
+
+
+class TestCoalescingEmbedder:
+    """Tests para CoalescingEmbedder."""
+
+    def test_concurrent_queries_share_one_call(self):
+        """Queries concurrentes dentro de la ventana deben ir en una sola llamada."""
+        from pipelines.utils.embedding_batcher import CoalescingEmbedder
+        provider = _provider()
+        embedder = CoalescingEmbedder(provider, window_ms=5, max_batch=32)
+
+        async def run():
+            return await asyncio.gather(
+                embedder.generate_embedding("go"),
+                embedder.generate_embedding("rust"),
+                embedder.generate_embedding("python"),
+            )
+
+        assert asyncio.run(run()) == [[2.0], [4.0], [6.0]]
+        provider.generate_embeddings.assert_called_once()
+        assert embedder.stats()["avg_batch_size"] == 3
+
+    def test_identical_inflight_queries_are_deduplicated(self):
+        """Queries equivalentes en vuelo deben embeberse una sola vez."""
+        from pipelines.utils.embedding_batcher import CoalescingEmbedder
+        provider = _provider()
+        embedder = CoalescingEmbedder(provider, window_ms=5, max_batch=32)
+
+        async def run():
+            return await asyncio.gather(
+                embedder.generate_embedding("React Senior"),
+                embedder.generate_embedding("react senior"),
+            )
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert provider.generate_embeddings.call_args[0][0] == ["React Senior"]
+        assert embedder.stats()["deduplicated"] == 1
+
+    def test_full_batch_flushes_without_waiting(self):
+        """Al llenar max_batch el lote se envía sin esperar la ventana."""
+        from pipelines.utils.embedding_batcher import CoalescingEmbedder
+        provider = _provider()
+        embedder = CoalescingEmbedder(provider, window_ms=10_000, max_batch=2)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(embedder.generate_embedding("a"), embedder.generate_embedding("bb")),
+                timeout=1,
+            )
+
+        assert asyncio.run(run()) == [[1.0], [2.0]]
+
+    def test_provider_error_propagates_to_all_waiters(self):
+        """Un error del proveedor debe llegar a cada request del lote."""
+        from pipelines.utils.embedding_batcher import CoalescingEmbedder
+        provider = _provider(side_effect=RuntimeError("cohere down"))
+        embedder = CoalescingEmbedder(provider, window_ms=1, max_batch=32)
+
+        async def run():
+            return await asyncio.gather(
+                embedder.generate_embedding("a"),
+                embedder.generate_embedding("b"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert embedder._inflight == {}
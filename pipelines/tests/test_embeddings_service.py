@@ -9,7 +9,8 @@ Tests unitarios para EmbeddingsService.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
 import os
 
 
@@ -80,3 +81,53 @@ class TestEmbeddingsService:
 
         with pytest.raises(ValueError, match="Dimensión del vector"):
             service.generate_embedding("test text")
+
+
+class TestAsyncEmbeddingsService:
+    """Tests para AsyncEmbeddingsService (path de búsqueda asíncrono)."""
+
+    @patch.dict(os.environ, {
+        "COHERE_API_KEY": "test-key",
+        "EMBEDDING_MODEL": "embed-multilingual-v3.0",
+        "EMBEDDING_DIMENSION": "1024"
+    })
+    @patch("pipelines.utils.embeddings_service.cohere.AsyncClient")
+    def test_generate_embedding_awaits_async_client(self, mock_cohere_cls):
+        """Debe usar el cliente asíncrono de Cohere con el input_type recibido."""
+        mock_response = MagicMock()
+        mock_response.embeddings.float = [[0.1] * 1024]
+
+        mock_client = MagicMock()
+        mock_client.embed = AsyncMock(return_value=mock_response)
+        mock_cohere_cls.return_value = mock_client
+
+        from pipelines.utils.embeddings_service import AsyncEmbeddingsService
+        service = AsyncEmbeddingsService(pool_size=4)
+        vector = asyncio.run(service.generate_embedding("query", input_type="search_query"))
+
+        assert len(vector) == 1024
+        assert mock_client.embed.call_args[1]["input_type"] == "search_query"
+        # El cliente de Cohere debe compartir el pool keep-alive del servicio
+        assert mock_cohere_cls.call_args[1]["httpx_client"] is service.http_client
+
+    @patch.dict(os.environ, {
+        "COHERE_API_KEY": "test-key",
+        "EMBEDDING_MODEL": "embed-multilingual-v3.0",
+        "EMBEDDING_DIMENSION": "1024"
+    })
+    @patch("pipelines.utils.embeddings_service.cohere.AsyncClient")
+    def test_generate_embeddings_batch(self, mock_cohere_cls):
+        """Debe enviar todos los textos en una sola llamada y validar cada vector."""
+        mock_response = MagicMock()
+        mock_response.embeddings.float = [[0.1] * 1024, [0.2] * 1024]
+
+        mock_client = MagicMock()
+        mock_client.embed = AsyncMock(return_value=mock_response)
+        mock_cohere_cls.return_value = mock_client
+
+        from pipelines.utils.embeddings_service import AsyncEmbeddingsService
+        service = AsyncEmbeddingsService(pool_size=4)
+        vectors = asyncio.run(service.generate_embeddings(["a", "b"], input_type="search_query"))
+
+        assert len(vectors) == 2
+        assert mock_client.embed.call_args[1]["texts"] == ["a", "b"]
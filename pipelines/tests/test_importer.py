@@ -0,0 +1,121 @@
+"""
+Tests unitarios para el importador masivo de candidatos.
+
+¿Por qué testear el importador?
+- Una fila inválida no debe abortar un import de cientos de miles de filas
+- Los bloques de COPY deben contener exactamente las filas válidas, con su número de línea
+- Al terminar debe encolarse una sola indexación incremental, no una por fila
+- COPY y la fusión son SQL de Postgres: aquí se verifica lo que se le envía
+  a la conexión (cursor mockeado), no el resultado en una base real
+"""
+
+import csv
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pipelines.etl.importer import (
+    IMPORT_FIELDS, SKILL_FACETS_STALE_KEY, CandidateImporter, copy_buffer, detect_format, iter_records,
+    validate_record
+)
+
+
+def _csv_file(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["name", "email", "phone", "skills"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return io.BytesIO(buffer.getvalue().encode())
+
+
+def _row(i, **overrides):
+    return {"name": f"Candidato {i}", "email": f"c{i}@example.com", "phone": f"+54911000{i:04d}", "skills": "Python", **overrides}
+
+
+class TestParsingAndValidation:
+    """Tests para la lectura y validación de filas."""
+
+    def test_iter_records_csv_and_ndjson(self):
+        """CSV con cabecera y NDJSON deben producir dicts con su número de línea."""
+        assert [line for line, _ in iter_records(_csv_file([_row(1), _row(2)]), "csv")] == [2, 3]
+
+        ndjson = io.BytesIO(b'{"name": "Ana"}\n\nno es json\n[1, 2]\n')
+        assert list(iter_records(ndjson, "ndjson")) == [(1, {"name": "Ana"}), (3, None), (4, None)]
+        assert detect_format("export.NDJSON") == "ndjson" and detect_format("ats.csv") == "csv"
+
+    def test_validate_record(self):
+        """Debe normalizar a la lista de columnas y rechazar filas que la DB no aceptaría."""
+        values, error = validate_record({**_row(1), "name": "  Ana  ", "extra": "ignorado"})
+        assert error is None
+        assert values[IMPORT_FIELDS.index("name")] == "Ana"
+        assert values[IMPORT_FIELDS.index("summary")] == ""
+
+        assert "email" in validate_record({**_row(1), "email": ""})[1]
+        assert validate_record({**_row(1), "email": "no-es-email"})[1] == "Email inválido"
+        assert "phone" in validate_record({**_row(1), "phone": "+" + "1" * 20})[1]
+        assert validate_record(None)[1] == "Fila mal formada"
+
+    def test_copy_buffer_roundtrip(self):
+        """Comas, comillas y saltos de línea deben sobrevivir al formato CSV de COPY."""
+        rows = [[2, "López, Ana", 'dice "hola"', "línea 1\nlínea 2"]]
+        assert list(csv.reader(copy_buffer(rows))) == [["2", "López, Ana", 'dice "hola"', "línea 1\nlínea 2"]]
+
+
+class TestCandidateImporter:
+    """Tests para CandidateImporter.import_stream."""
+
+    def _importer(self, merge_result=(3, 1, 5, [7])):
+        redis_client = MagicMock()
+        importer = CandidateImporter("sqlite://", redis_client, chunk_size=2)
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(list(csv.reader(buffer)))
+        cursor.fetchone.return_value = merge_result
+        return importer, redis_client, conn, cursor, copied
+
+    def test_chunks_merge_and_single_index_run(self):
+        """Las filas válidas se copian en bloques, se fusionan una vez y se encola un solo etl_sync."""
+        importer, redis_client, conn, cursor, copied = self._importer()
+        rows = [_row(1), _row(2), _row(3, email="mal"), _row(4), _row(5), _row(6)]
+
+        with patch.object(importer.engine, "raw_connection", return_value=conn):
+            result = importer.import_stream(_csv_file(rows), "csv", "job1")
+
+        assert [len(chunk) for chunk in copied] == [2, 2, 1]
+        assert [chunk[0] for chunk in copied[0]] == ["2", "3"]
+        assert "FORCE_NOT_NULL" in cursor.copy_expert.call_args[0][0]
+        merge_sql = cursor.execute.call_args_list[-1][0][0]
+        assert "ON CONFLICT (email) DO UPDATE" in merge_sql
+        conn.commit.assert_called_once()
+
+        assert result["status"] == "success"
+        assert (result["processed"], result["valid"], result["invalid"]) == (6, 5, 1)
+        assert (result["created"], result["updated"], result["skipped"]) == (3, 1, 1)
+        assert result["errors"] == [{"line": 4, "error": "Email inválido"}]
+
+        redis_client.rpush.assert_called_once()
+        assert json.loads(redis_client.rpush.call_args[0][1])["job_type"] == "etl_sync"
+        redis_client.set.assert_any_call(SKILL_FACETS_STALE_KEY, 1)
+        # El candidato actualizado no debe seguir sirviéndose desde la caché de la API
+        assert "RETURNING id" in merge_sql
+        redis_client.delete.assert_called_once_with("candidate:7")
+        last_progress = json.loads(redis_client.set.call_args[0][1])
+        assert redis_client.set.call_args[0][0] == "import:job:job1"
+        assert last_progress["status"] == "success"
+
+    def test_failure_rolls_back_and_reports_error(self):
+        """Si la fusión falla no se escribe nada, no se indexa y el progreso queda en error."""
+        importer, redis_client, conn, cursor, _ = self._importer()
+        cursor.execute.side_effect = [None, Exception("deadlock detected")]
+
+        with patch.object(importer.engine, "raw_connection", return_value=conn):
+            with pytest.raises(Exception, match="deadlock"):
+                importer.import_stream(_csv_file([_row(1)]), "csv", "job2")
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        redis_client.rpush.assert_not_called()
+        assert json.loads(redis_client.set.call_args[0][1])["status"] == "error"
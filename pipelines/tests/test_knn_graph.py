@@ -0,0 +1,171 @@
+"""
+Tests unitarios para el grafo kNN precalculado.
+
+¿Por qué testear el grafo kNN?
+- `find_similar` lo sirve tal cual: un vecino mal calculado llega directo al usuario
+- La actualización incremental debe producir el mismo grafo que una reconstrucción completa
+- Un grafo obsoleto nunca debe servirse: se reconstruye o se cae a la búsqueda en vivo
+- Qdrant se mockea y Redis se simula con diccionarios en memoria
+"""
+
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+
+class _FakeRedis:
+    """Subconjunto síncrono de redis-py sobre diccionarios (strings y hashes)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        values = self.data.setdefault(key, {})
+        for f, v in (mapping or {field: value}).items():
+            values[str(f).encode()] = v if isinstance(v, bytes) else str(v).encode()
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(str(field).encode())
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for f in fields:
+            self.data.get(key, {}).pop(str(f).encode(), None)
+
+
+def _points(vectors):
+    """Simula los Record de Qdrant que retorna scroll con vectores."""
+    points = []
+    for point_id, vector in vectors.items():
+        point = MagicMock()
+        point.id = point_id
+        point.vector = list(vector)
+        point.payload = {"name": f"Candidato {point_id}", "text_content": "Python", "update_at": "2026-02-10"}
+        points.append(point)
+    return points
+
+
+def _builder(mock_qdrant_cls, vectors, redis_client, k=3):
+    mock_client = MagicMock()
+    mock_client.scroll.side_effect = lambda **kwargs: (_points(vectors), None)
+    mock_qdrant_cls.return_value = mock_client
+
+    from pipelines.etl.knn_graph import KnnGraphBuilder
+    return KnnGraphBuilder("http://localhost:6333", redis_client, k=k, block_size=2)
+
+
+def _graph(redis_client):
+    from pipelines.utils.knn_store import KNN_GRAPH_KEY, decode_neighbors
+    return {
+        int(cid): decode_neighbors(raw)[0]
+        for cid, raw in redis_client.hgetall(KNN_GRAPH_KEY).items()
+    }
+
+
+def _brute_force(vectors, k):
+    ids = list(vectors)
+    matrix = np.array([vectors[i] for i in ids], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    sims = matrix @ matrix.T
+    np.fill_diagonal(sims, -np.inf)
+    return {ids[i]: [ids[j] for j in np.argsort(-sims[i])[:k]] for i in range(len(ids))}
+
+
+class TestKnnGraphBuilder:
+    """Tests para KnnGraphBuilder."""
+
+    @patch("pipelines.etl.knn_graph.QdrantClient")
+    def test_build_matches_brute_force(self, mock_qdrant_cls):
+        """Los bloques deben dar el mismo top-k que la matriz completa, sin el propio candidato."""
+        rng = np.random.default_rng(0)
+        vectors = {i: rng.normal(size=8) for i in range(1, 8)}
+        redis_client = _FakeRedis()
+
+        builder = _builder(mock_qdrant_cls, vectors, redis_client)
+        assert builder.build() == 7
+
+        assert _graph(redis_client) == _brute_force(vectors, 3)
+        assert redis_client.hget("knn:meta", "version") == b"0"
+
+    @patch("pipelines.etl.knn_graph.QdrantClient")
+    def test_incremental_update_matches_rebuild(self, mock_qdrant_cls):
+        """Actualizar, agregar y eliminar candidatos debe dar el mismo grafo que reconstruir."""
+        rng = np.random.default_rng(1)
+        vectors = {i: rng.normal(size=8) for i in range(1, 10)}
+        redis_client = _FakeRedis()
+        builder = _builder(mock_qdrant_cls, vectors, redis_client)
+        builder.build()
+
+        vectors[2] = vectors[5] + 0.01
+        vectors[10] = vectors[7] * 2
+        del vectors[4]
+        redis_client.incr("index:version")
+
+        builder.update([2, 4, 10], base_version=0)
+
+        assert _graph(redis_client) == _brute_force(vectors, 3)
+        assert redis_client.hget("knn:payload", 4) is None
+        assert redis_client.hget("knn:meta", "version") == b"1"
+
+    @patch("pipelines.etl.knn_graph.QdrantClient")
+    def test_stale_graph_triggers_rebuild(self, mock_qdrant_cls):
+        """Si el índice cambió por otra vía, no debe parchearse un grafo obsoleto."""
+        rng = np.random.default_rng(2)
+        vectors = {i: rng.normal(size=8) for i in range(1, 6)}
+        redis_client = _FakeRedis()
+        builder = _builder(mock_qdrant_cls, vectors, redis_client)
+        builder.build()
+
+        redis_client.incr("index:version")
+        redis_client.incr("index:version")
+
+        with patch.object(builder, "build", return_value=5) as mock_build:
+            builder.update([1], base_version=1)
+            mock_build.assert_called_once()
+
+    @patch("pipelines.etl.knn_graph.QdrantClient")
+    def test_is_stale_after_worker_bump(self, mock_qdrant_cls):
+        """Un cambio del worker (solo incrementa index:version) deja el grafo obsoleto para `--if-stale`."""
+        rng = np.random.default_rng(3)
+        vectors = {i: rng.normal(size=8) for i in range(1, 4)}
+        redis_client = _FakeRedis()
+        builder = _builder(mock_qdrant_cls, vectors, redis_client)
+        assert builder.is_stale()
+
+        builder.build()
+        assert not builder.is_stale()
+
+        redis_client.incr("index:version")
+        assert builder.is_stale()
+
+
+class TestKnnStore:
+    """Tests para la codificación del grafo en Redis."""
+
+    def test_encode_decode_roundtrip(self):
+        """Los ids int64 y scores float32 deben sobrevivir al empaquetado."""
+        from pipelines.utils.knn_store import encode_neighbors, decode_neighbors
+        ids, scores = decode_neighbors(encode_neighbors([3, 2**40], [0.75, 0.5]))
+
+        assert ids == [3, 2**40]
+        assert scores == [0.75, 0.5]
@@ -30,6 +30,12 @@ class TestLoader:
         loader.ensure_collection()
 
         mock_client.create_collection.assert_called_once()
+        indexes = {c.kwargs["field_name"]: c.kwargs["field_schema"] for c in mock_client.create_payload_index.call_args_list}
+        assert indexes["skills"] == "keyword"
+        # Mismo índice que crea el worker Rust: prefijos de palabra en minúsculas, sin ascii_folding
+        assert indexes["name"].tokenizer == "prefix"
+        assert indexes["name"].lowercase is True
+        assert not indexes["name"].ascii_folding
 
     @patch.dict(os.environ, {"EMBEDDING_DIMENSION": "1024", "EMBEDDING_DISTANCE": "Cosine"})
     @patch("pipelines.etl.load.create_engine")
@@ -69,6 +75,49 @@ class TestLoader:
         call_kwargs = mock_client.upsert.call_args
         assert call_kwargs[1]["collection_name"] == "candidates"
 
+    @patch.dict(os.environ, {"EMBEDDING_DIMENSION": "1024", "EMBEDDING_DISTANCE": "Cosine"})
+    @patch("pipelines.etl.load.create_engine")
+    @patch("pipelines.etl.load.QdrantClient")
+    def test_load_points_includes_sparse_vector(self, mock_qdrant_cls, mock_engine):
+        """El vector disperso debe subirse como "keywords" junto al denso sin nombre."""
+        mock_client = MagicMock()
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.etl.load import Loader
+        loader = Loader("http://localhost:6333", "sqlite:///test.db")
+        loader.load_points([
+            {"id": 1, "vector": [0.1] * 4, "sparse_vector": {"indices": [7], "values": [1.0]}, "payload": {}},
+            {"id": 2, "vector": [0.2] * 4, "sparse_vector": {"indices": [], "values": []}, "payload": {}},
+        ])
+
+        points = mock_client.upsert.call_args[1]["points"]
+        assert points[0].vector[""] == [0.1] * 4
+        assert points[0].vector["keywords"].indices == [7]
+        assert points[1].vector == [0.2] * 4
+
+    @patch.dict(os.environ, {"EMBEDDING_DIMENSION": "1024", "EMBEDDING_DISTANCE": "Cosine"})
+    @patch("pipelines.etl.load.create_engine")
+    @patch("pipelines.etl.load.QdrantClient")
+    def test_load_points_dense_only_without_sparse_config(self, mock_qdrant_cls, mock_engine):
+        """En una colección sin vector disperso (anterior a la búsqueda híbrida) solo se sube el denso."""
+        mock_existing = MagicMock()
+        mock_existing.name = "candidates"
+        mock_client = MagicMock()
+        mock_client.get_collections.return_value.collections = [mock_existing]
+        mock_client.get_collection.return_value.config.params.sparse_vectors = None
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.etl.load import Loader
+        loader = Loader("http://localhost:6333", "sqlite:///test.db")
+        loader.ensure_collection()
+        loader.load_points([
+            {"id": 1, "vector": [0.1] * 4, "sparse_vector": {"indices": [7], "values": [1.0]}, "payload": {}},
+        ])
+
+        assert loader.sparse_enabled is False
+        points = mock_client.upsert.call_args[1]["points"]
+        assert points[0].vector == [0.1] * 4
+
     @patch.dict(os.environ, {"EMBEDDING_DIMENSION": "1024", "EMBEDDING_DISTANCE": "Cosine"})
     @patch("pipelines.etl.load.create_engine")
     @patch("pipelines.etl.load.QdrantClient")
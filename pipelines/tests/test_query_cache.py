@@ -0,0 +1,126 @@
+"""
+Tests unitarios para QueryEmbeddingCache.
+
+¿Por qué testear la caché de embeddings de queries?
+- Una clave mal canonicalizada reduce el hit ratio (o mezcla queries distintas)
+- El nivel Redis guarda bytes float32: un error de serialización corrompe vectores
+- Si Redis falla, la búsqueda debe seguir funcionando contra el proveedor
+- Redis y Cohere se mockean por completo
+"""
+
+import asyncio
+from array import array
+from unittest.mock import patch, MagicMock, AsyncMock
+
+
+def _embeddings_service(vector=None):
+    """Simula AsyncEmbeddingsService."""
+    service = MagicMock()
+    service.model = "embed-multilingual-v3.0"
+    service.generate_embedding = AsyncMock(return_value=vector or [0.5, 0.25])
+    return service
+
+
+class TestCanonicalizeQuery:
+    """Tests para la normalización de queries."""
+
+    def test_case_whitespace_and_accents(self):
+        """Debe ignorar mayúsculas, espacios repetidos y acentos."""
+        from pipelines.utils.query_cache import canonicalize_query
+        assert canonicalize_query("  Ingeniero   de DATOS ") == "ingeniero de datos"
+        assert canonicalize_query("Diseñador Gráfico") == "disenador grafico"
+
+
+class TestQueryEmbeddingCache:
+    """Tests para la caché LRU + Redis."""
+
+    def test_lru_hit_skips_provider(self):
+        """Queries equivalentes deben reutilizar el embedding del LRU."""
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        service = _embeddings_service()
+        cache = QueryEmbeddingCache(service, max_size=10)
+
+        async def run():
+            await cache.get_embedding("Python Backend")
+            return await cache.get_embedding("python   backend")
+
+        assert asyncio.run(run()) == [0.5, 0.25]
+        service.generate_embedding.assert_called_once()
+        stats = cache.stats()
+        assert stats["lru_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_evicts_least_recent(self):
+        """El LRU no debe superar max_size."""
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        cache = QueryEmbeddingCache(_embeddings_service(), max_size=2)
+
+        async def run():
+            for query in ["uno", "dos", "tres"]:
+                await cache.get_embedding(query)
+
+        asyncio.run(run())
+        assert cache.stats()["lru_size"] == 2
+
+    def test_zero_size_disables_lru(self):
+        """max_size=0 no debe caer en el default: cada query va al proveedor."""
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        service = _embeddings_service()
+        cache = QueryEmbeddingCache(service, max_size=0, ttl=0)
+
+        async def run():
+            await cache.get_embedding("data engineer")
+            await cache.get_embedding("data engineer")
+
+        asyncio.run(run())
+        assert cache.ttl == 0
+        assert cache.stats()["lru_size"] == 0
+        assert service.generate_embedding.call_count == 2
+
+    @patch("pipelines.utils.query_cache.aioredis.from_url")
+    def test_redis_hit_decodes_float32(self, mock_from_url):
+        """Un hit en Redis debe decodificar los bytes float32 sin llamar al proveedor."""
+        mock_redis = MagicMock()
+        mock_redis.get = AsyncMock(return_value=array("f", [0.5, 0.25]).tobytes())
+        mock_from_url.return_value = mock_redis
+
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        service = _embeddings_service()
+        cache = QueryEmbeddingCache(service, redis_url="redis://localhost:6379/0")
+
+        assert asyncio.run(cache.get_embedding("react senior")) == [0.5, 0.25]
+        service.generate_embedding.assert_not_called()
+        assert cache.stats()["redis_hits"] == 1
+
+    @patch("pipelines.utils.query_cache.aioredis.from_url")
+    def test_redis_failure_falls_back_to_provider(self, mock_from_url):
+        """Si Redis falla, debe generar el embedding igualmente."""
+        mock_redis = MagicMock()
+        mock_redis.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        mock_redis.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        mock_from_url.return_value = mock_redis
+
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        service = _embeddings_service()
+        cache = QueryEmbeddingCache(service, redis_url="redis://localhost:6379/0")
+
+        assert asyncio.run(cache.get_embedding("devops aws")) == [0.5, 0.25]
+        service.generate_embedding.assert_called_once()
+
+    def test_get_embeddings_batches_misses(self):
+        """En lote, solo los misses (deduplicados) deben ir al proveedor en una sola llamada."""
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        service = _embeddings_service()
+        service.generate_embeddings = AsyncMock(return_value=[[1.0], [2.0]])
+        cache = QueryEmbeddingCache(service, max_size=10)
+
+        async def run():
+            await cache.get_embedding("python backend")
+            return await cache.get_embeddings(["Python Backend", "react", "REACT", "devops"])
+
+        vectors = asyncio.run(run())
+
+        assert vectors == [[0.5, 0.25], [1.0], [1.0], [2.0]]
+        service.generate_embeddings.assert_called_once()
+        assert service.generate_embeddings.call_args[0][0] == ["react", "devops"]
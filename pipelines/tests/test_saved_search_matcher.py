@@ -0,0 +1,104 @@
+"""
+Tests unitarios para el matching inverso de búsquedas guardadas.
+
+¿Por qué testear el matcher?
+- El producto de matrices debe dar el mismo score coseno que una búsqueda por query
+- Los filtros de nombre y skills deben respetarse igual que en la búsqueda en vivo
+- Re-indexar un candidato no debe duplicar coincidencias ya registradas
+- Postgres se sustituye por SQLite en memoria (misma sintaxis ON CONFLICT)
+"""
+
+from array import array
+
+import numpy as np
+from sqlalchemy import text
+
+from pipelines.etl.saved_search_matcher import SavedSearchMatcher
+
+
+def _matcher(saved_searches):
+    matcher = SavedSearchMatcher("sqlite://", batch_size=2)
+    with matcher.engine.connect() as conn:
+        conn.execute(text(
+            "CREATE TABLE saved_searches (id INTEGER PRIMARY KEY, query_vector BLOB, "
+            "score_threshold FLOAT, skills_filter TEXT, name_filter TEXT)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE saved_search_matches (saved_search_id INTEGER, candidate_id INTEGER, score FLOAT, "
+            "UNIQUE (saved_search_id, candidate_id))"
+        ))
+        conn.execute(
+            text("INSERT INTO saved_searches VALUES (:id, :query_vector, :score_threshold, :skills_filter, :name_filter)"),
+            [
+                {"skills_filter": None, "name_filter": None, **s, "query_vector": array("f", s["query_vector"]).tobytes()}
+                for s in saved_searches
+            ]
+        )
+        conn.commit()
+    return matcher
+
+
+def _matches(matcher):
+    with matcher.engine.connect() as conn:
+        rows = conn.execute(text("SELECT saved_search_id, candidate_id, score FROM saved_search_matches")).all()
+    return {(r[0], r[1]): r[2] for r in rows}
+
+
+def _point(candidate_id, vector, name="Ana García", skills=("fastapi", "python")):
+    return {"id": candidate_id, "vector": vector, "payload": {"name": name, "skills": list(skills)}}
+
+
+class TestSavedSearchMatcher:
+    """Tests para SavedSearchMatcher."""
+
+    def test_matches_above_threshold_with_cosine_score(self):
+        """Cada búsqueda registra los candidatos cuyo coseno supera su propio umbral."""
+        matcher = _matcher([
+            {"id": 1, "query_vector": [1, 0, 0], "score_threshold": 0.9},
+            {"id": 2, "query_vector": [0, 1, 0], "score_threshold": 0.5},
+            {"id": 3, "query_vector": [1, 1, 0], "score_threshold": 0.95},
+        ])
+
+        found = matcher.match([_point(10, [2, 0, 0]), _point(11, [1, 1, 0.1])])
+
+        matches = _matches(matcher)
+        assert found == len(matches) == 3
+        assert set(matches) == {(1, 10), (2, 11), (3, 11)}
+        expected = np.dot([1, 1, 0], [1, 1, 0.1]) / (np.sqrt(2) * np.linalg.norm([1, 1, 0.1]))
+        assert abs(matches[(3, 11)] - expected) < 1e-5
+
+    def test_filters_and_dimension_mismatch(self):
+        """Deben aplicarse name_filter (prefijo) y skills_filter (OR de skills completas) e ignorarse vectores de otra dimensión."""
+        matcher = _matcher([
+            {"id": 1, "query_vector": [1, 0, 0], "score_threshold": 0.5, "name_filter": "gar"},
+            {"id": 2, "query_vector": [1, 0, 0], "score_threshold": 0.5, "skills_filter": '["Go", "Rust"]'},
+            {"id": 3, "query_vector": [1, 0], "score_threshold": 0.0},
+        ])
+
+        matcher.match([
+            _point(10, [1, 0, 0], name="Ana García", skills=["mongodb", "python"]),
+            _point(11, [1, 0, 0], name="Luis Pérez", skills=["go", "kubernetes"]),
+        ])
+
+        assert set(_matches(matcher)) == {(1, 10), (2, 11)}
+
+    def test_name_filter_matches_word_prefixes(self):
+        """name_filter replica el índice PREFIX de Qdrant: comienzo de palabra, sin distinguir mayúsculas."""
+        matcher = _matcher([
+            {"id": 1, "query_vector": [1, 0, 0], "score_threshold": 0.5, "name_filter": "LUIS pér"},
+            {"id": 2, "query_vector": [1, 0, 0], "score_threshold": 0.5, "name_filter": "ez"},
+            {"id": 3, "query_vector": [1, 0, 0], "score_threshold": 0.5, "name_filter": "perez"},
+        ])
+
+        matcher.match([_point(10, [1, 0, 0], name="Luis Pérez")])
+
+        assert set(_matches(matcher)) == {(1, 10)}
+
+    def test_reindex_does_not_duplicate(self):
+        """Un candidato re-indexado que ya coincidía no genera una segunda coincidencia."""
+        matcher = _matcher([{"id": 1, "query_vector": [1, 0, 0], "score_threshold": 0.5}])
+
+        matcher.match([_point(10, [1, 0, 0])])
+        matcher.match([_point(10, [1, 0.1, 0])])
+
+        assert list(_matches(matcher)) == [(1, 10)]
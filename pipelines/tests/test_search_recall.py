@@ -0,0 +1,54 @@
+"""
+Tests unitarios para el benchmark de recall vs latencia.
+
+¿Por qué testear el benchmark?
+- Un ground truth mal calculado invalida cualquier conclusión sobre hnsw_ef o cuantización
+- La rejilla debe traducirse a los mismos SearchParams que usa la API
+- El flujo completo se ejecuta contra Qdrant en modo local (:memory:), sin servidor
+"""
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from pipelines.benchmarks.search_recall import (
+    synthetic_corpus, make_queries, ground_truth, recall_at_k, parameter_grid,
+    load_collection, run_config
+)
+
+
+class TestSearchRecallBenchmark:
+    """Tests para las piezas del benchmark."""
+
+    def test_ground_truth_matches_full_sort(self):
+        """El top-k por bloques debe coincidir con ordenar la matriz completa de similitudes."""
+        corpus = synthetic_corpus(300, 16, clusters=8)
+        queries = make_queries(corpus, 25)
+
+        truth = ground_truth(corpus, queries, k=5, block_size=7)
+
+        normalized = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+        sims = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ normalized.T
+        assert truth.tolist() == np.argsort(-sims, axis=1)[:, :5].tolist()
+
+    def test_recall_at_k(self):
+        """Debe contar la fracción del top-k exacto recuperada, sin importar el orden."""
+        truth = np.array([[1, 2, 3, 4], [5, 6, 7, 8]])
+        assert recall_at_k(truth, [[4, 3, 2, 1], [5, 6, 0, 0]]) == 0.75
+
+    def test_parameter_grid(self):
+        """Sin cuantización solo se barre hnsw_ef; con ella, además oversampling y rescore."""
+        assert parameter_grid([32, 64], [2.0], quantized=False) == [{"exact": True}, {"hnsw_ef": 32}, {"hnsw_ef": 64}]
+        assert len(parameter_grid([32, 64], [1.0, 2.0], quantized=True)) == 1 + 2 * 2 * 2
+
+    def test_local_run_is_exact(self):
+        """En modo local (sin HNSW) la búsqueda es exhaustiva: recall 1.0."""
+        corpus = synthetic_corpus(200, 8, clusters=4)
+        queries = make_queries(corpus, 20)
+        truth = ground_truth(corpus, queries, k=5)
+
+        client = QdrantClient(":memory:")
+        load_collection(client, corpus)
+        result = run_config(client, queries, truth, {"hnsw_ef": 32}, warmup=2)
+
+        assert result.recall == 1.0
+        assert result.p50_ms <= result.p95_ms <= result.p99_ms
@@ -0,0 +1,465 @@
+"""
+Tests unitarios para SearchService y AsyncSearchService.
+
+¿Por qué testear el servicio de búsqueda?
+- Es el punto de entrada de los endpoints /semantic_search de FastAPI
+- La variante asíncrona debe producir exactamente los mismos resultados que la síncrona
+- Verificamos la construcción de filtros (must para nombre y skills completas)
+- Qdrant y Cohere se mockean por completo
+"""
+
+import asyncio
+import os
+from unittest.mock import patch, MagicMock, AsyncMock
+
+
+def _point(point_id, score=0.9):
+    """Simula un ScoredPoint retornado por Qdrant."""
+    point = MagicMock()
+    point.id = point_id
+    point.score = score
+    point.payload = {"name": f"Candidato {point_id}", "text_content": "Python", "update_at": "2026-02-10"}
+    return point
+
+
+def _collection_info(sparse: bool):
+    """Simula la configuración de la colección con o sin el vector disperso "keywords"."""
+    info = MagicMock()
+    info.config.params.sparse_vectors = {"keywords": MagicMock()} if sparse else None
+    return info
+
+
+def _not_found():
+    """Simula la respuesta 404 de Qdrant para un punto inexistente."""
+    from qdrant_client.http.exceptions import UnexpectedResponse
+    return UnexpectedResponse(404, "Not Found", b"No point with id found", {})
+
+
+class TestBuildFilter:
+    """Tests para el constructor de filtros compartido."""
+
+    def test_no_filters_returns_none(self):
+        """Sin filtros no debe enviarse ningún Filter a Qdrant."""
+        from pipelines.utils.search_service import _build_filter
+        assert _build_filter(None, None) is None
+
+    def test_skills_match_any_and_name_must(self):
+        """Skills normalizadas en un MatchAny (OR) y el nombre, ambos en must (AND)."""
+        from pipelines.utils.search_service import _build_filter
+        query_filter = _build_filter([" Python", "DOCKER", "python"], "Ana")
+
+        assert query_filter.should is None
+        skills, name = query_filter.must
+        assert skills.key == "skills"
+        assert skills.match.any == ["docker", "python"]
+        assert name.key == "name"
+
+    def test_skill_is_not_a_substring_match(self):
+        """"Go" no debe coincidir con "MongoDB" ni con "Google" (antes era MatchText sobre text_content)."""
+        from qdrant_client import QdrantClient
+        from qdrant_client.models import PointStruct, VectorParams, Distance
+        from pipelines.utils.search_service import _build_filter
+
+        client = QdrantClient(location=":memory:")
+        client.create_collection("candidates", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        client.upsert("candidates", points=[
+            PointStruct(id=1, vector=[1, 0], payload={
+                "text_content": "Ana | Backend | Skills: MongoDB, Google Cloud", "skills": ["google cloud", "mongodb"]
+            }),
+            PointStruct(id=2, vector=[1, 0], payload={
+                "text_content": "Luis | Backend | Skills: Go, Docker", "skills": ["docker", "go"]
+            }),
+        ])
+
+        points, _ = client.scroll("candidates", scroll_filter=_build_filter(["Go"]))
+
+        assert [p.id for p in points] == [2]
+
+
+class TestSearchParams:
+    """Tests para la traducción de tuning a SearchParams."""
+
+    def test_empty_tuning_uses_collection_defaults(self):
+        """Sin parámetros no debe enviarse SearchParams."""
+        from pipelines.utils.search_service import search_params_from_tuning
+        assert search_params_from_tuning({}) is None
+
+    def test_quantization_and_hnsw(self):
+        """hnsw_ef y la cuantización deben ir en el mismo SearchParams."""
+        from pipelines.utils.search_service import search_params_from_tuning
+        params = search_params_from_tuning({"hnsw_ef": 256, "quantization_oversampling": 3.0})
+
+        assert params.hnsw_ef == 256
+        assert params.exact is False
+        assert params.quantization.oversampling == 3.0
+
+
+class TestProjection:
+    """Tests para la proyección de campos y los snippets."""
+
+    def test_payload_selector(self):
+        """fields debe traducirse a la lista include de with_payload."""
+        from pipelines.utils.search_service import _payload_selector
+        assert _payload_selector(None) is True
+        assert _payload_selector(["snippet", "updated_at"]) == ["text_content", "update_at"]
+        assert _payload_selector([]) is False
+
+    def test_to_result_projects_fields(self):
+        """Solo deben retornarse id, score y los campos pedidos."""
+        from pipelines.utils.search_service import _to_result
+        point = _point(1)
+        point.payload["text_content"] = "Ana | " + "x " * 100 + "| Skills: Python, Docker | Experience: 5"
+
+        result = _to_result(point, ["name", "snippet"], ["docker"])
+
+        assert set(result) == {"id", "score", "name", "snippet"}
+        assert "Docker" in result["snippet"]
+        assert result["snippet"].startswith("…")
+
+    def test_snippet_short_text_untouched(self):
+        """Un texto más corto que el ancho no debe recortarse."""
+        from pipelines.utils.snippets import make_snippet
+        assert make_snippet("Ana | Python", ["python"]) == "Ana | Python"
+
+
+class TestAsyncSearchService:
+    """Tests para AsyncSearchService."""
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_search_formats_results(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe embeber la query como search_query y formatear los puntos."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(1), _point(2, 0.8)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 1024])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.search("python backend", limit=2))
+
+        assert [r["id"] for r in results] == [1, 2]
+        assert results[0]["name"] == "Candidato 1"
+        assert mock_embeddings.generate_embeddings.call_args[1]["input_type"] == "search_query"
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_selective_name_filter_uses_exact_search_by_ids(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Un filtro de nombre selectivo debe restringir a los IDs que lo cumplen con exact=True."""
+        mock_client = MagicMock()
+        mock_client.scroll = AsyncMock(return_value=([_point(4), _point(7)], None))
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(7)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        service.hybrid = False
+        results = asyncio.run(service.search("python backend", name_filter="Ana"))
+
+        assert [r["id"] for r in results] == [7]
+        assert mock_client.scroll.call_args[1]["limit"] == service.filter_first_max + 1
+        kwargs = mock_client.query_points.call_args[1]
+        assert kwargs["query_filter"].must[0].has_id == [4, 7]
+        assert kwargs["search_params"].exact is True
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_planner_keeps_hnsw_for_broad_filters(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Sin coincidencias no debe consultarse Qdrant; un filtro amplio mantiene el HNSW."""
+        mock_client = MagicMock()
+        mock_client.scroll = AsyncMock(side_effect=[([], None), ([_point(i) for i in range(3)], None)])
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(1)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        service.filter_first_max = 2
+        service.hybrid = False
+
+        assert asyncio.run(service.search("python backend", name_filter="Nadie")) == []
+        mock_client.query_points.assert_not_called()
+
+        asyncio.run(service.search("python backend", name_filter="a"))
+        kwargs = mock_client.query_points.call_args[1]
+        assert kwargs["query_filter"].must[0].key == "name"
+        assert kwargs["search_params"] is None
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_tuning_overrides_env_and_survives_planner(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Los parámetros de la request sobrescriben los del entorno y el planificador conserva hnsw_ef."""
+        mock_client = MagicMock()
+        mock_client.scroll = AsyncMock(return_value=([_point(4)], None))
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(4)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        with patch.dict(os.environ, {"SEARCH_HNSW_EF": "64", "SEARCH_QUANTIZATION_RESCORE": "true"}):
+            service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        service.hybrid = False
+
+        asyncio.run(service.search("python backend", tuning={"hnsw_ef": 256}))
+        params = mock_client.query_points.call_args[1]["search_params"]
+        assert params.hnsw_ef == 256
+        assert params.quantization.rescore is True
+        assert params.exact is False
+
+        asyncio.run(service.search("python backend", name_filter="Ana"))
+        params = mock_client.query_points.call_args[1]["search_params"]
+        assert params.hnsw_ef == 64
+        assert params.exact is True
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_hybrid_search_fuses_dense_and_sparse(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe combinar las ramas densa y "keywords" con RRF; las skills filtran y además ponderan."""
+        from qdrant_client.models import FusionQuery
+        mock_client = MagicMock()
+        mock_client.get_collection = AsyncMock(return_value=_collection_info(sparse=True))
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(3, 0.5)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.search("backend Kubernetes", limit=5, skills_filter=["FastAPI"]))
+
+        assert [r["id"] for r in results] == [3]
+        assert service.score_type("backend Kubernetes", ["FastAPI"]) == "rrf"
+        kwargs = mock_client.query_points.call_args[1]
+        assert isinstance(kwargs["query"], FusionQuery)
+        assert kwargs["query_filter"].must[0].match.any == ["fastapi"]
+        dense, sparse = kwargs["prefetch"]
+        assert dense.query == [0.1] * 4
+        assert dense.score_threshold == 0.5
+        assert dense.limit == 20
+        assert dense.filter.must[0].match.any == ["fastapi"]
+        assert sparse.using == "keywords"
+        assert sparse.filter.must[0].match.any == ["fastapi"]
+        assert max(sparse.query.values) == 2.0
+        # La rama dispersa solo reordena candidatos que superan el umbral coseno
+        assert sparse.prefetch.query == [0.1] * 4
+        assert sparse.prefetch.score_threshold == 0.5
+        assert sparse.prefetch.limit == 80
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_hybrid_falls_back_to_dense_without_sparse_vector(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Una colección sin el vector "keywords" debe servirse con búsqueda densa y filtro de skills."""
+        mock_client = MagicMock()
+        mock_client.get_collection = AsyncMock(return_value=_collection_info(sparse=False))
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(1)]))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.search("backend", skills_filter=["Python"]))
+
+        asyncio.run(service.search("backend", skills_filter=["Python"]))
+
+        assert [r["id"] for r in results] == [1]
+        assert service.hybrid is False
+        assert service.score_type("backend") == "cosine"
+        # La configuración de la colección se lee una sola vez
+        mock_client.get_collection.assert_awaited_once()
+        kwargs = mock_client.query_points.call_args[1]
+        assert kwargs["query"] == [0.1] * 4
+        assert kwargs["prefetch"] is None
+        assert kwargs["query_filter"].must[0].match.any == ["python"]
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_search_batch_single_embed_and_query(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe embeber todas las queries en una llamada y consultar con query_batch_points."""
+        mock_client = MagicMock()
+        mock_client.query_batch_points = AsyncMock(return_value=[
+            MagicMock(points=[_point(1)]),
+            MagicMock(points=[]),
+        ])
+        # Filtro de nombre amplio: el planificador mantiene el HNSW con filtro
+        mock_client.scroll = AsyncMock(return_value=([_point(i) for i in range(3)], None))
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4, [0.2] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        service.filter_first_max = 2
+        outcomes = asyncio.run(service.search_batch([
+            {"query_text": "python backend", "limit": 3},
+            {"query_text": "react senior", "name_filter": "Ana"},
+        ]))
+
+        assert [r["id"] for r in outcomes[0]["results"]] == [1]
+        assert outcomes[1] == {"results": []}
+        mock_embeddings.generate_embeddings.assert_called_once()
+        requests = mock_client.query_batch_points.call_args[1]["requests"]
+        assert requests[0].limit == 3
+        assert requests[1].filter.must[0].key == "name"
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_search_batch_isolates_failing_query(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Si el batch falla, debe reintentar por query y reportar solo la que falla."""
+        mock_client = MagicMock()
+        mock_client.query_batch_points = AsyncMock(side_effect=Exception("Bad request"))
+        mock_client.query_points = AsyncMock(side_effect=[
+            MagicMock(points=[_point(2)]),
+            Exception("Bad filter"),
+        ])
+        mock_qdrant_cls.return_value = mock_client
+        mock_embeddings = MagicMock()
+        mock_embeddings.generate_embeddings = AsyncMock(return_value=[[0.1] * 4, [0.2] * 4])
+        mock_embeddings_cls.return_value = mock_embeddings
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        outcomes = asyncio.run(service.search_batch([
+            {"query_text": "python backend"},
+            {"query_text": "react senior"},
+        ]))
+
+        assert [r["id"] for r in outcomes[0]["results"]] == [2]
+        assert "Bad filter" in outcomes[1]["error"]
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_find_similar_queries_by_id(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe consultar por ID en el servidor excluyendo al candidato, sin retrieve previo."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(2)]))
+        mock_client.retrieve = AsyncMock()
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.find_similar(1, limit=5))
+
+        assert [r["id"] for r in results] == [2]
+        kwargs = mock_client.query_points.call_args[1]
+        assert kwargs["query"] == 1
+        assert kwargs["limit"] == 5
+        assert kwargs["query_filter"].must_not[0].has_id == [1]
+        mock_client.retrieve.assert_not_called()
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_find_similar_missing_candidate(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe retornar None si Qdrant responde 404 para el ID."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(side_effect=_not_found())
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+
+        assert asyncio.run(service.find_similar(9999)) is None
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_find_similar_reads_fresh_knn_graph(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Con el grafo kNN fresco no debe consultarse Qdrant; si está obsoleto, sí."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(3)]))
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        service.knn_graph = MagicMock()
+        service.knn_graph.get_neighbors = AsyncMock(side_effect=[[{"id": 2, "score": 0.9}], None])
+
+        assert asyncio.run(service.find_similar(1, limit=5)) == [{"id": 2, "score": 0.9}]
+        mock_client.query_points.assert_not_called()
+
+        assert [r["id"] for r in asyncio.run(service.find_similar(1, limit=5))] == [3]
+        mock_client.query_points.assert_called_once()
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_recommend_excludes_examples(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe enviar una RecommendQuery por IDs y excluir los ejemplos sin perder los filtros."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(return_value=MagicMock(points=[_point(5)]))
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.recommend([1, 2], [3], strategy="best_score", skills_filter=["Go"]))
+
+        assert [r["id"] for r in results] == [5]
+        kwargs = mock_client.query_points.call_args[1]
+        assert kwargs["query"].recommend.positive == [1, 2]
+        assert kwargs["query"].recommend.strategy.value == "best_score"
+        assert kwargs["query_filter"].must_not[0].has_id == [1, 2, 3]
+        assert kwargs["query_filter"].must[0].match.any == ["go"]
+        mock_embeddings_cls.return_value.generate_embeddings.assert_not_called()
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_recommend_missing_example(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Un ejemplo no indexado (404 de Qdrant) debe retornar None."""
+        mock_client = MagicMock()
+        mock_client.query_points = AsyncMock(side_effect=_not_found())
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        assert asyncio.run(service.recommend([99])) is None
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_find_similar_batch_single_call(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Debe resolver todos los IDs con una sola llamada query_batch_points."""
+        mock_client = MagicMock()
+        mock_client.query_batch_points = AsyncMock(return_value=[
+            MagicMock(points=[_point(3)]),
+            MagicMock(points=[_point(4), _point(5)]),
+        ])
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.find_similar_batch([1, 2, 1], limit=2))
+
+        assert [r["id"] for r in results[1]] == [3]
+        assert [r["id"] for r in results[2]] == [4, 5]
+        mock_client.query_batch_points.assert_called_once()
+        assert len(mock_client.query_batch_points.call_args[1]["requests"]) == 2
+
+    @patch("pipelines.utils.search_service.AsyncEmbeddingsService")
+    @patch("pipelines.utils.search_service.AsyncQdrantClient")
+    def test_find_similar_batch_with_missing_ids(self, mock_qdrant_cls, mock_embeddings_cls):
+        """Si un ID no existe, debe reintentar solo con los indexados y marcar el resto como None."""
+        existing = MagicMock()
+        existing.id = 2
+        mock_client = MagicMock()
+        mock_client.query_batch_points = AsyncMock(side_effect=[
+            _not_found(),
+            [MagicMock(points=[_point(4)])],
+        ])
+        mock_client.retrieve = AsyncMock(return_value=[existing])
+        mock_qdrant_cls.return_value = mock_client
+
+        from pipelines.utils.search_service import AsyncSearchService
+        service = AsyncSearchService("http://localhost:6333", pool_size=4)
+        results = asyncio.run(service.find_similar_batch([9999, 2]))
+
+        assert results[9999] is None
+        assert [r["id"] for r in results[2]] == [4]
@@ -0,0 +1,36 @@
+"""
+Tests unitarios para los vectores dispersos de la búsqueda híbrida.
+
+¿Por qué testear los vectores dispersos?
+- Documento y query deben tokenizar igual o los términos exactos no coinciden
+- Los índices deben ser estables entre procesos (el ETL indexa, la API consulta)
+- La saturación BM25 evita que repetir un término domine el score
+"""
+
+from pipelines.utils.sparse import tokenize, document_sparse_vector, query_sparse_vector
+
+
+class TestSparseVectors:
+    """Tests para tokenize y los vectores de documento y query."""
+
+    def test_tokenize_normalizes_and_keeps_tech_terms(self):
+        """Debe quitar acentos, mayúsculas y stopwords sin romper "C++" o "Node.js"."""
+        assert tokenize("Diseño de APIs con C++, C# y Node.js.") == ["diseno", "apis", "c++", "c#", "node.js"]
+
+    def test_document_weights_saturate(self):
+        """Un término repetido pesa más, pero menos que proporcionalmente."""
+        vector = document_sparse_vector("python python python docker")
+        weights = dict(zip(vector["indices"], vector["values"]))
+        python = query_sparse_vector("python")["indices"][0]
+        docker = query_sparse_vector("docker")["indices"][0]
+
+        assert vector["indices"] == sorted(vector["indices"])
+        assert weights[docker] < weights[python] < 3 * weights[docker]
+
+    def test_query_boosts_skills(self):
+        """Las skills pedidas deben pesar `boost`; el resto de términos, 1."""
+        vector = query_sparse_vector("backend senior", boost_terms=["FastAPI"])
+        boosted = query_sparse_vector("fastapi")["indices"][0]
+
+        assert dict(zip(vector["indices"], vector["values"]))[boosted] == 2.0
+        assert sorted(vector["values"]) == [1.0, 1.0, 2.0]
@@ -0,0 +1,88 @@
+"""
+Tests unitarios para el desglose de latencia por fase.
+
+¿Por qué testear las mediciones?
+- Las fases de tareas hijas (asyncio.gather) deben sumarse a la request que las lanzó
+- Fuera de una request `timed` no debe medir ni fallar (ETL, scripts)
+- Los cuantiles de los histogramas alimentan las alertas de latencia
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from pipelines.utils.timing import LatencyHistogram, LatencyHistograms, start_timings, timed
+
+
+class TestRequestTimings:
+    """Tests para start_timings y timed."""
+
+    def test_phases_accumulate_across_tasks(self):
+        """Las fases medidas en tareas de gather deben acumularse en la medición de la request."""
+        async def phase(name):
+            with timed(name):
+                await asyncio.sleep(0.01)
+
+        async def request():
+            timings = start_timings()
+            await asyncio.gather(phase("qdrant"), phase("qdrant"), phase("embed"))
+            return timings
+
+        timings = asyncio.run(request())
+
+        assert timings.phases["qdrant"] >= 20
+        assert set(timings.as_dict()) == {"qdrant", "embed", "total"}
+        assert timings.server_timing().startswith("qdrant;dur=")
+
+    def test_timed_without_request_is_noop(self):
+        """Sin start_timings el bloque se ejecuta sin registrar nada."""
+        async def outside():
+            with timed("embed"):
+                return 1
+
+        assert asyncio.run(outside()) == 1
+
+    def test_query_cache_reports_phases(self):
+        """Un miss de la caché debe registrar canonicalize, cache_lookup y embed."""
+        from pipelines.utils.query_cache import QueryEmbeddingCache
+        embedder = MagicMock()
+        embedder.generate_embedding = AsyncMock(return_value=[0.1] * 4)
+        cache = QueryEmbeddingCache(embedder)
+
+        async def request():
+            timings = start_timings()
+            await cache.get_embedding("Python backend")
+            return timings
+
+        assert {"canonicalize", "cache_lookup", "embed"} <= set(asyncio.run(request()).phases)
+
+
+class TestLatencyHistogram:
+    """Tests para los histogramas de latencia."""
+
+    def test_quantiles_use_bucket_upper_bounds(self):
+        """p50/p99 deben caer en el bucket que contiene el cuantil."""
+        histogram = LatencyHistogram()
+        for ms in [0.3] * 90 + [30] * 9 + [3000]:
+            histogram.observe(ms)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["p50_ms"] == 0.5
+        assert snapshot["p95_ms"] == 50
+        assert snapshot["p99_ms"] == 50
+        assert snapshot["buckets"]["le_5000"] == 1
+
+    def test_histograms_per_endpoint_and_phase(self):
+        """Cada medición alimenta un histograma por fase, incluido el total."""
+        histograms = LatencyHistograms()
+
+        async def request():
+            timings = start_timings()
+            timings.record("embed", 12.0)
+            return timings
+
+        histograms.observe("search", asyncio.run(request()))
+
+        stats = histograms.stats()
+        assert stats["search"]["embed"]["count"] == 1
+        assert "total" in stats["search"]
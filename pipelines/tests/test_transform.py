@@ -32,6 +32,7 @@ class TestTransformer:
         assert "payload" in result
         assert result["id"] == 1
         assert len(result["vector"]) == 1024
+        assert len(result["sparse_vector"]["indices"]) == len(result["sparse_vector"]["values"]) > 0
 
     @patch("pipelines.etl.transform.EmbeddingsService")
     def test_prepare_vector_builds_context_text(self, mock_embed_cls, mock_candidate_row, sample_embedding):
@@ -61,6 +62,7 @@ class TestTransformer:
 
         assert result["payload"]["name"] == "Ana García"
         assert "text_content" in result["payload"]
+        assert result["payload"]["skills"] == ["docker", "fastapi", "postgresql", "python"]
 
     @patch("pipelines.etl.transform.EmbeddingsService")
     def test_uses_search_document_input_type(self, mock_embed_cls, mock_candidate_row, sample_embedding):
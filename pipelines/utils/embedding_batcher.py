@@ -0,0 +1,157 @@
+"""
+Micro-batching de embeddings de queries concurrentes.
+
+En picos de tráfico llegan muchas búsquedas con milisegundos de diferencia y
+cada una hacía su propia llamada a Cohere. `CoalescingEmbedder` acumula los
+textos durante una ventana corta (EMBED_BATCH_WINDOW_MS, default 5 ms) o hasta
+llenar un lote (EMBED_BATCH_MAX, default 32), envía una sola llamada batch y
+reparte los vectores a cada request en espera. Las queries idénticas que ya
+están en vuelo se deduplican y esperan el mismo resultado.
+
+Expone la misma interfaz `generate_embedding(text, input_type)` que
+AsyncEmbeddingsService, así que puede colocarse debajo de QueryEmbeddingCache.
+"""
+from typing import List, Optional
+import asyncio
+import logging
+import os
+
+from pipelines.utils.query_cache import canonicalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescingEmbedder:
+    """Agrupa llamadas concurrentes de embedding en lotes por input_type."""
+
+    def __init__(
+        self,
+        embeddings_service,
+        window_ms: Optional[float] = None,
+        max_batch: Optional[int] = None,
+    ):
+        """Inicializa el agrupador.
+
+        Args:
+            embeddings_service: Servicio con `async generate_embeddings(texts, input_type)`
+            window_ms: Ventana de acumulación en milisegundos
+            max_batch: Tamaño máximo de lote; al alcanzarlo se envía sin esperar la ventana
+        """
+        self.embeddings_service = embeddings_service
+        self.window = (window_ms if window_ms is not None else float(os.getenv("EMBED_BATCH_WINDOW_MS", 5))) / 1000
+        self.max_batch = max_batch or int(os.getenv("EMBED_BATCH_MAX", 32))
+
+        # input_type -> {clave canónica: texto} del lote que se está acumulando
+        self._pending: dict[str, dict[str, str]] = {}
+        # (input_type, clave canónica) -> future compartido por las requests en vuelo
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        # Referencias fuertes a las tareas de envío para que no las recolecte el GC
+        self._tasks: set[asyncio.Task] = set()
+
+        # Métricas
+        self.requests = 0
+        self.deduplicated = 0
+        self.provider_calls = 0
+        self.batched_texts = 0
+
+    @property
+    def model(self):
+        return getattr(self.embeddings_service, "model", None)
+
+    async def generate_embedding(self, text: str, input_type: str = "search_query") -> List[float]:
+        """Retorna el embedding de `text`, compartiendo llamada con requests concurrentes.
+
+        Args:
+            text: Texto a convertir en embedding
+            input_type: Tipo de entrada para el proveedor
+
+        Returns:
+            Vector de embedding como lista de floats
+        """
+        self.requests += 1
+        key = canonicalize_query(text)
+
+        future = self._inflight.get((input_type, key))
+        if future is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[(input_type, key)] = future
+
+        batch = self._pending.setdefault(input_type, {})
+        batch[key] = text
+
+        if len(batch) >= self.max_batch:
+            self._flush(input_type)
+        elif input_type not in self._timers:
+            self._timers[input_type] = loop.call_later(self.window, self._flush, input_type)
+
+        return await asyncio.shield(future)
+
+    async def generate_embeddings(self, texts: List[str], input_type: str = "search_query") -> List[List[float]]:
+        """Embebe un lote ya formado (p. ej. /semantic_search/batch) en una sola llamada, sin ventana.
+
+        Args:
+            texts: Textos a convertir en embeddings
+            input_type: Tipo de entrada para el proveedor
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`
+        """
+        self.requests += len(texts)
+        self.provider_calls += 1
+        self.batched_texts += len(texts)
+
+        vectors = await self.embeddings_service.generate_embeddings(texts, input_type=input_type)
+        if len(vectors) != len(texts):
+            raise ValueError(f"El proveedor retornó {len(vectors)} vectores para {len(texts)} textos.")
+        return vectors
+
+    def _flush(self, input_type: str) -> None:
+        """Cierra el lote acumulado y lanza la llamada batch en segundo plano."""
+        timer = self._timers.pop(input_type, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(input_type, None)
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(input_type, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, input_type: str, batch: dict[str, str]) -> None:
+        keys = list(batch)
+        self.provider_calls += 1
+        self.batched_texts += len(keys)
+
+        try:
+            vectors = await self.embeddings_service.generate_embeddings(
+                [batch[k] for k in keys],
+                input_type=input_type
+            )
+            if len(vectors) != len(keys):
+                raise ValueError(f"El proveedor retornó {len(vectors)} vectores para {len(keys)} textos.")
+            for key, vector in zip(keys, vectors):
+                future = self._inflight.pop((input_type, key))
+                if not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            logger.error("Error generando lote de embeddings: %s", str(e), extra={"batch_size": len(keys)})
+            for key in keys:
+                future = self._inflight.pop((input_type, key), None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    def stats(self) -> dict:
+        """Métricas del agrupador: llamadas al proveedor, deduplicados y tamaño medio de lote."""
+        return {
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+            "provider_calls": self.provider_calls,
+            "avg_batch_size": self.batched_texts / self.provider_calls if self.provider_calls else 0.0,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+        }
@@ -1,4 +1,5 @@
 import cohere
+import httpx
 from typing import List
 from dotenv import load_dotenv
 from pipelines.utils.retry import pipeline_retry
@@ -37,10 +38,89 @@ class EmbeddingsService:
             embedding_types=['float']
         )
 
-        vector = response.embeddings.float[0]
+        return _validated_vectors(response, self.dimension)[0]
 
-        # Validar que la dimensión del vector generado coincide con la esperada
-        if len(vector) != int(self.dimension):
-            raise ValueError(f"Dimensión del vector generada ({len(vector)}) no coincide con la esperada ({self.dimension}).")
 
-        return vector
+class AsyncEmbeddingsService:
+    """Variante asíncrona de EmbeddingsService para el path de búsqueda de FastAPI.
+
+    Usa `cohere.AsyncClient` sobre un `httpx.AsyncClient` propio con conexiones
+    keep-alive reutilizables, de modo que las llamadas concurrentes no abren un
+    socket TLS nuevo por request ni ocupan un hilo del threadpool.
+    """
+
+    def __init__(self, pool_size: int | None = None, timeout: float = 30.0):
+        """Inicializa el cliente asíncrono con un pool de conexiones acotado.
+
+        Args:
+            pool_size: Máximo de conexiones simultáneas a Cohere (default: EMBEDDING_POOL_SIZE o 32)
+            timeout: Timeout en segundos por request
+        """
+        self.api_key = os.getenv("COHERE_API_KEY")
+        self.model = os.getenv("EMBEDDING_MODEL")
+        self.dimension = os.getenv("EMBEDDING_DIMENSION")
+        pool_size = pool_size or int(os.getenv("EMBEDDING_POOL_SIZE", 32))
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+        self.client = cohere.AsyncClient(self.api_key, httpx_client=self.http_client)
+
+    @pipeline_retry
+    async def generate_embedding(self, text: str, input_type: str = "search_document") -> List[float]:
+        """Genera el vector de embedding para un texto dado sin bloquear el event loop.
+
+        Args:
+            text: Texto a convertir en embedding
+            input_type: Tipo de entrada para Cohere (search_document | search_query)
+
+        Returns:
+            Lista de floats representando el vector de embedding
+        """
+        response = await self.client.embed(
+            texts=[text],
+            model=self.model,
+            input_type=input_type,
+            embedding_types=['float']
+        )
+
+        return _validated_vectors(response, self.dimension)[0]
+
+    @pipeline_retry
+    async def generate_embeddings(self, texts: List[str], input_type: str = "search_document") -> List[List[float]]:
+        """Genera los embeddings de varios textos en una sola llamada a Cohere.
+
+        Args:
+            texts: Textos a convertir en embeddings
+            input_type: Tipo de entrada para Cohere (search_document | search_query)
+
+        Returns:
+            Lista de vectores en el mismo orden que `texts`
+        """
+        response = await self.client.embed(
+            texts=texts,
+            model=self.model,
+            input_type=input_type,
+            embedding_types=['float']
+        )
+
+        return _validated_vectors(response, self.dimension)
+
+    async def close(self) -> None:
+        """Cierra las conexiones keep-alive del pool."""
+        await self.http_client.aclose()
+
+
+def _validated_vectors(response, dimension) -> List[List[float]]:
+    """Extrae los vectores de una respuesta de Cohere validando su dimensión."""
+    vectors = response.embeddings.float
+
+    # Validar que la dimensión de cada vector generado coincide con la esperada
+    for vector in vectors:
+        if len(vector) != int(dimension):
+            raise ValueError(f"Dimensión del vector generada ({len(vector)}) no coincide con la esperada ({dimension}).")
+
+    return vectors
@@ -0,0 +1,26 @@
+"""
+Versión global del índice vectorial.
+
+Contador en Redis que se incrementa cada vez que cambia el contenido de la
+colección de Qdrant (single_index, delete_point, cargas del ETL, limpiezas).
+Las cachés de resultados de búsqueda lo incluyen en su clave, de modo que un
+cambio en el índice las invalida sin tener que borrar entradas una por una.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION_KEY = "index:version"
+
+
+def bump_index_version(redis_client) -> None:
+    """Incrementa la versión del índice. Un fallo de Redis no interrumpe la indexación."""
+    try:
+        redis_client.incr(INDEX_VERSION_KEY)
+    except Exception as e:
+        logger.error("Error incrementando la versión del índice: %s", str(e))
+
+
+def get_index_version(redis_client) -> int:
+    """Versión actual del índice (0 si nunca se ha incrementado)."""
+    return int(redis_client.get(INDEX_VERSION_KEY) or 0)
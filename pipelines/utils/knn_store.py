@@ -0,0 +1,120 @@
+"""
+Almacenamiento en Redis del grafo de k vecinos más cercanos (kNN).
+
+El corpus de candidatos cambia poco, así que en lugar de consultar Qdrant en
+cada request de "similares" el job `pipelines.etl.knn_graph` precalcula los
+top-k vecinos de todos los candidatos y los guarda aquí:
+
+- `knn:graph`   hash candidate_id -> vecinos empaquetados (int64 ids + float32 scores)
+- `knn:payload` hash candidate_id -> JSON con name, text_content y updated_at
+- `knn:meta`    hash con la versión del índice que refleja el grafo, k y tamaño
+
+El grafo es "fresco" mientras `knn:meta.version` coincida con `index:version`.
+Cualquier cambio del índice que no pase por el job lo deja obsoleto y
+`find_similar` vuelve a la búsqueda en vivo. El ETL de Python lo actualiza en
+cada carga; los jobs del worker Rust no, así que tras ellos el grafo queda
+obsoleto hasta la siguiente ejecución del ETL o de
+`python -m pipelines.etl.knn_graph --if-stale` (programado por cron).
+"""
+from array import array
+from typing import Optional
+import json
+import logging
+
+import redis.asyncio as aioredis
+
+from pipelines.utils.index_version import INDEX_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+KNN_GRAPH_KEY = "knn:graph"
+KNN_PAYLOAD_KEY = "knn:payload"
+KNN_META_KEY = "knn:meta"
+
+
+def encode_neighbors(ids, scores) -> bytes:
+    """Empaqueta una fila del grafo como ids int64 seguidos de scores float32."""
+    return array("q", [int(i) for i in ids]).tobytes() + array("f", [float(s) for s in scores]).tobytes()
+
+
+def decode_neighbors(raw: bytes) -> tuple[list[int], list[float]]:
+    """Inverso de `encode_neighbors`."""
+    size = len(raw) // 12
+    ids = array("q")
+    ids.frombytes(raw[:size * 8])
+    scores = array("f")
+    scores.frombytes(raw[size * 8:])
+    return ids.tolist(), scores.tolist()
+
+
+def encode_payload(payload: dict) -> str:
+    """Serializa el payload de Qdrant con las claves que expone la API."""
+    return json.dumps({
+        "name": payload.get("name"),
+        "text_content": payload.get("text_content"),
+        "updated_at": payload.get("update_at")
+    })
+
+
+class KnnGraphStore:
+    """Lectura asíncrona del grafo kNN precalculado."""
+
+    def __init__(self, redis_url: str):
+        """Inicializa el lector.
+
+        Args:
+            redis_url: URL de Redis donde el job publica el grafo
+        """
+        self.redis = aioredis.from_url(redis_url, socket_timeout=0.5)
+
+    async def get_neighbors(
+        self,
+        candidate_id: int,
+        limit: int,
+        score_threshold: float = 0.0
+    ) -> Optional[list[dict]]:
+        """Retorna los similares precalculados de un candidato.
+
+        Args:
+            candidate_id: ID del candidato de referencia
+            limit: Número máximo de resultados
+            score_threshold: Umbral mínimo de similitud
+
+        Returns:
+            Lista de resultados con el formato de búsqueda, o None si el grafo
+            está obsoleto, no cubre `limit` o no contiene al candidato
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(INDEX_VERSION_KEY)
+                pipe.hmget(KNN_META_KEY, ["version", "k"])
+                pipe.hget(KNN_GRAPH_KEY, str(candidate_id))
+                index_version, (graph_version, k), raw = await pipe.execute()
+
+            if graph_version is None or int(index_version or 0) != int(graph_version):
+                return None
+            if raw is None or limit > int(k):
+                return None
+
+            ids, scores = decode_neighbors(raw)
+            neighbors = [(i, s) for i, s in zip(ids, scores) if s >= score_threshold][:limit]
+            if not neighbors:
+                return []
+
+            payloads = await self.redis.hmget(KNN_PAYLOAD_KEY, [str(i) for i, _ in neighbors])
+            if any(p is None for p in payloads):
+                return None
+
+            return [
+                {"id": i, "score": s, **json.loads(p)}
+                for (i, s), p in zip(neighbors, payloads)
+            ]
+
+        except Exception as e:
+            # Redis caído o datos corruptos: se cae a la búsqueda en vivo
+            logger.warning("Error leyendo grafo kNN: %s", str(e))
+            return None
+
+    async def close(self) -> None:
+        """Cierra la conexión con Redis."""
+        await self.redis.aclose()
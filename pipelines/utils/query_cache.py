@@ -0,0 +1,229 @@
+"""
+Caché de dos niveles para embeddings de queries de búsqueda.
+
+Los reclutadores repiten las mismas búsquedas ("python backend", "react senior")
+durante todo el día y cada una pagaba una llamada a Cohere. Este módulo pone
+delante de `generate_embedding(..., input_type="search_query")`:
+
+1. Un LRU acotado en memoria del proceso (hit en microsegundos).
+2. Un nivel compartido en Redis con los vectores como bytes float32 y TTL,
+   para que todas las réplicas de la API aprovechen los embeddings ya pagados.
+
+Las queries se canonicalizan (minúsculas, espacios colapsados, sin acentos)
+antes de generar la clave, así "Python  Backend" y "python backend" comparten entrada.
+"""
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+import hashlib
+import logging
+import os
+import time
+import unicodedata
+
+import redis.asyncio as aioredis
+
+from pipelines.utils.timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+def canonicalize_query(text: str) -> str:
+    """Normaliza una query para usarla como clave de caché.
+
+    Args:
+        text: Texto original de la query
+
+    Returns:
+        Texto en minúsculas, sin acentos y con espacios colapsados
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.casefold().split())
+
+
+class QueryEmbeddingCache:
+    """Caché LRU + Redis delante de un servicio de embeddings asíncrono."""
+
+    def __init__(
+        self,
+        embeddings_service,
+        redis_url: Optional[str] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ):
+        """Inicializa la caché.
+
+        Args:
+            embeddings_service: Servicio con `async generate_embedding(text, input_type)`
+            redis_url: URL de Redis para el nivel compartido (None = solo LRU)
+            max_size: Entradas máximas del LRU; 0 lo desactiva (default: QUERY_CACHE_SIZE o 1024)
+            ttl: TTL en segundos del nivel Redis; 0 = sin expiración (default: QUERY_CACHE_TTL o 86400)
+        """
+        self.embeddings_service = embeddings_service
+        self.max_size = int(os.getenv("QUERY_CACHE_SIZE", 1024)) if max_size is None else max_size
+        self.ttl = int(os.getenv("QUERY_CACHE_TTL", 86400)) if ttl is None else ttl
+        self.redis = aioredis.from_url(redis_url, socket_timeout=0.5) if redis_url else None
+        self._lru: OrderedDict[str, List[float]] = OrderedDict()
+
+        # Métricas
+        self.lru_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+        self._miss_latency_avg = 0.0
+
+    def _key(self, text: str, input_type: str) -> str:
+        model = getattr(self.embeddings_service, "model", None) or "default"
+        digest = hashlib.sha1(canonicalize_query(text).encode("utf-8")).hexdigest()
+        return f"qemb:{model}:{input_type}:{digest}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def _record_hit(self, started: float) -> None:
+        # Latencia ahorrada = latencia media de un miss - lo que costó el hit
+        self.latency_saved += max(self._miss_latency_avg - (time.perf_counter() - started), 0.0)
+
+    async def get_embedding(self, text: str, input_type: str = "search_query") -> List[float]:
+        """Retorna el embedding de la query, consultando LRU → Redis → proveedor.
+
+        Args:
+            text: Texto de la query
+            input_type: Tipo de entrada para el proveedor de embeddings
+
+        Returns:
+            Vector de embedding como lista de floats
+        """
+        started = time.perf_counter()
+        with timed("canonicalize"):
+            key = self._key(text, input_type)
+
+        with timed("cache_lookup"):
+            vector = await self._lookup(key, started)
+        if vector is not None:
+            return vector
+
+        with timed("embed"):
+            vector = await self.embeddings_service.generate_embedding(text, input_type=input_type)
+        self.misses += 1
+        elapsed = time.perf_counter() - started
+        self._miss_latency_avg += (elapsed - self._miss_latency_avg) / self.misses
+        self._remember(key, vector)
+
+        if self.redis is not None:
+            try:
+                with timed("cache_store"):
+                    await self.redis.set(key, array("f", vector).tobytes(), ex=self.ttl or None)
+            except Exception as e:
+                logger.warning("Error guardando caché de embeddings en Redis: %s", str(e))
+
+        return vector
+
+    async def _lookup(self, key: str, started: float) -> Optional[List[float]]:
+        """Busca la clave en el LRU y luego en Redis. Retorna None si no está."""
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+            self.lru_hits += 1
+            self._record_hit(started)
+            return vector
+
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(key)
+                if raw is not None:
+                    vector = array("f", raw).tolist()
+                    self._remember(key, vector)
+                    self.redis_hits += 1
+                    self._record_hit(started)
+                    return vector
+            except Exception as e:
+                # Redis caído no debe bloquear la búsqueda
+                logger.warning("Error leyendo caché de embeddings en Redis: %s", str(e))
+        return None
+
+    async def get_embeddings(self, texts: List[str], input_type: str = "search_query") -> List[List[float]]:
+        """Variante en lote de `get_embedding`: un MGET a Redis y una sola llamada al proveedor.
+
+        Args:
+            texts: Textos de las queries
+            input_type: Tipo de entrada para el proveedor de embeddings
+
+        Returns:
+            Vectores en el mismo orden que `texts`
+        """
+        started = time.perf_counter()
+        with timed("canonicalize"):
+            keys = [self._key(text, input_type) for text in texts]
+        vectors: dict[str, List[float]] = {}
+
+        with timed("cache_lookup"):
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    vectors[key] = self._lru[key]
+                    self.lru_hits += 1
+                    self._record_hit(started)
+
+            missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+            if missing and self.redis is not None:
+                try:
+                    for key, raw in zip(missing, await self.redis.mget(missing)):
+                        if raw is not None:
+                            vectors[key] = array("f", raw).tolist()
+                            self._remember(key, vectors[key])
+                            self.redis_hits += 1
+                            self._record_hit(started)
+                except Exception as e:
+                    logger.warning("Error leyendo caché de embeddings en Redis: %s", str(e))
+
+        texts_by_key: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            texts_by_key.setdefault(key, text)
+        missing = [key for key in missing if key not in vectors]
+        if missing:
+            with timed("embed"):
+                fetched = await self.embeddings_service.generate_embeddings(
+                    [texts_by_key[key] for key in missing],
+                    input_type=input_type
+                )
+            elapsed = time.perf_counter() - started
+            for key, vector in zip(missing, fetched):
+                self.misses += 1
+                self._miss_latency_avg += (elapsed - self._miss_latency_avg) / self.misses
+                vectors[key] = vector
+                self._remember(key, vector)
+
+            if self.redis is not None:
+                try:
+                    with timed("cache_store"):
+                        async with self.redis.pipeline(transaction=False) as pipe:
+                            for key in missing:
+                                pipe.set(key, array("f", vectors[key]).tobytes(), ex=self.ttl or None)
+                            await pipe.execute()
+                except Exception as e:
+                    logger.warning("Error guardando caché de embeddings en Redis: %s", str(e))
+
+        return [vectors[key] for key in keys]
+
+    def stats(self) -> dict:
+        """Métricas de la caché: hits por nivel, hit ratio y latencia ahorrada."""
+        total = self.lru_hits + self.redis_hits + self.misses
+        return {
+            "lru_size": len(self._lru),
+            "lru_hits": self.lru_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.lru_hits + self.redis_hits) / total if total else 0.0,
+            "avg_miss_latency_ms": self._miss_latency_avg * 1000,
+            "latency_saved_ms": self.latency_saved * 1000,
+        }
+
+    async def close(self) -> None:
+        """Cierra la conexión con Redis."""
+        if self.redis is not None:
+            await self.redis.aclose()
@@ -1,98 +1,83 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchText, MatchAny
-from pipelines.utils.embeddings_service import EmbeddingsService
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Filter, FieldCondition, MatchValue, MatchText, MatchAny, HasIdCondition, QueryRequest, SearchParams,
+    Prefetch, FusionQuery, Fusion, SparseVector, QuantizationSearchParams,
+    RecommendQuery, RecommendInput, RecommendStrategy
+)
+from pipelines.utils.embeddings_service import EmbeddingsService, AsyncEmbeddingsService
+from pipelines.utils.query_cache import QueryEmbeddingCache
+from pipelines.utils.embedding_batcher import CoalescingEmbedder
+from pipelines.utils.knn_store import KnnGraphStore
+from pipelines.utils.skills import SKILLS_PAYLOAD_KEY, normalize_skills
+from pipelines.utils.snippets import make_snippet
+from pipelines.utils.sparse import SPARSE_VECTOR_NAME, query_sparse_vector
+from pipelines.utils.timing import timed
 from typing import Optional
+import asyncio
+import httpx
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Candidatos que aporta cada rama (densa y dispersa) a la fusión RRF, por resultado pedido
+HYBRID_PREFETCH_FACTOR = 4
 
 
 class SearchService:
     """Servicio para búsqueda semántica en Qdrant con filtros avanzados."""
-    
+
     def __init__(self, qdrant_url: str ):
         """Inicializa el servicio de búsqueda.
-        
+
         Args:
             qdrant_url: Host del servidor Qdrant
         """
         self.client = QdrantClient(url=qdrant_url)
         self.embeddings_service = EmbeddingsService()
+        self.default_tuning = tuning_from_env()
         self.collection_name = "candidates"
-    
+
     def search(
         self,
         query_text: str,
         limit: int = 10,
         score_threshold: float = 0.5,
         skills_filter: Optional[list[str]] = None,
-        name_filter: Optional[str] = None
+        name_filter: Optional[str] = None,
+        tuning: Optional[dict] = None
     ):
         """Realiza búsqueda semántica con filtros opcionales.
-        
+
         Args:
             query_text: Texto de la consulta (ej: "desarrollador python con 5 años de experiencia")
             limit: Número máximo de resultados
             score_threshold: Umbral mínimo de similitud (0-1)
-            skills_filter: Lista de skills que debe contener (búsqueda parcial)
+            skills_filter: Skills de las que debe tener al menos una (skill completa, sin distinguir mayúsculas)
             name_filter: Filtro por nombre del candidato (búsqueda parcial)
-            
+            tuning: Parámetros de búsqueda (ver SEARCH_TUNING_FIELDS) que sobrescriben los del entorno
+
         Returns:
             Lista de candidatos ordenados por relevancia con sus scores
         """
 
         query_vector = self.embeddings_service.generate_embedding(
-            query_text, 
+            query_text,
             input_type="search_query"
         )
-        
-        must_conditions = []
-        should_conditions = []
-        
-        if skills_filter:
-            # Skills con OR: debe tener AL MENOS UNA de las skills
-            for skill in skills_filter:
-                should_conditions.append(
-                    FieldCondition(
-                        key="text_content",
-                        match=MatchText(text=skill)
-                    )
-                )
-        
-        if name_filter:
-            # Name con AND: debe cumplir el nombre
-            must_conditions.append(
-                FieldCondition(
-                    key="name",
-                    match=MatchText(text=name_filter)
-                )
-            )
-        
-        # Construir filtro: must (AND) para nombre, should (OR) para skills
-        query_filter = None
-        if must_conditions or should_conditions:
-            query_filter = Filter(
-                must=must_conditions if must_conditions else None,
-                should=should_conditions if should_conditions else None
-            )
-        
+
         search_result = self.client.query_points(
             collection_name=self.collection_name,
             query=query_vector,
             limit=limit,
             score_threshold=score_threshold,
-            query_filter=query_filter
+            query_filter=_build_filter(skills_filter, name_filter),
+            search_params=search_params_from_tuning({**self.default_tuning, **(tuning or {})})
         ).points
-        
-        results = []
-        for point in search_result:
-            results.append({
-                "id": point.id,
-                "score": point.score,
-                "name": point.payload.get("name"),
-                "text_content": point.payload.get("text_content"),
-                "updated_at": point.payload.get("update_at")
-            })
-        
-        return results
-    
+
+        return [_to_result(point) for point in search_result]
+
     def find_similar(
         self,
         candidate_id: int,
@@ -100,51 +85,686 @@ class SearchService:
         score_threshold: float = 0.0
     ):
         """Encuentra candidatos similares a uno existente.
-        
+
         Args:
             candidate_id: ID del candidato de referencia
             limit: Número máximo de resultados
             score_threshold: Umbral mínimo de similitud
-            
+
         Returns:
             Lista de candidatos similares o None si el candidato no existe
         """
         try:
-            # Obtener el punto del candidato de referencia
-            point = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[candidate_id],
-                with_vectors=True
-            )
-            
-            if not point or len(point) == 0:
-                return None
-            
-            # Obtener el vector del candidato
-            candidate_vector = point[0].vector
-            
-            # Buscar candidatos similares
+            # Query por ID en el servidor: sin transferir el vector y excluyendo al propio candidato
             search_result = self.client.query_points(
                 collection_name=self.collection_name,
-                query=candidate_vector,
-                limit=limit + 1,  # +1 porque incluirá el mismo candidato
+                query=candidate_id,
+                query_filter=_exclude_ids([candidate_id]),
+                limit=limit,
                 score_threshold=score_threshold
             ).points
-            
-            # Filtrar el candidato original y formatear resultados
-            results = []
-            for point in search_result:
-                # Excluir el candidato de referencia
-                if point.id != candidate_id:
-                    results.append({
-                        "id": point.id,
-                        "score": point.score,
-                        "name": point.payload.get("name"),
-                        "text_content": point.payload.get("text_content"),
-                        "updated_at": point.payload.get("update_at")
-                    })
-            
-            return results[:limit]
-        
+
+            return [_to_result(p) for p in search_result]
+
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                return None
+            raise Exception(f"Error buscando similares: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error buscando similares: {str(e)}")
+
+
+class AsyncSearchService:
+    """Variante asíncrona de SearchService para endpoints `async def` de FastAPI.
+
+    Las llamadas a Cohere y Qdrant se hacen con clientes asíncronos sobre pools
+    keep-alive, así la concurrencia ya no queda limitada por el threadpool.
+    """
+
+    def __init__(
+        self,
+        qdrant_url: str,
+        pool_size: Optional[int] = None,
+        redis_url: Optional[str] = None
+    ):
+        """Inicializa el servicio de búsqueda asíncrono.
+
+        Args:
+            qdrant_url: Host del servidor Qdrant
+            pool_size: Máximo de conexiones por cliente (default: SEARCH_POOL_SIZE o 32)
+            redis_url: URL de Redis para el nivel compartido de la caché de queries
+        """
+        pool_size = pool_size or int(os.getenv("SEARCH_POOL_SIZE", 32))
+        self.client = AsyncQdrantClient(
+            url=qdrant_url,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+        self.embeddings_service = AsyncEmbeddingsService(pool_size=pool_size)
+        # Caché (LRU + Redis) → micro-batching de misses concurrentes → Cohere
+        self.query_embedder = CoalescingEmbedder(self.embeddings_service)
+        self.query_cache = QueryEmbeddingCache(self.query_embedder, redis_url=redis_url)
+        # Grafo kNN precalculado por el ETL; None = siempre búsqueda en vivo
+        self.knn_graph = KnnGraphStore(redis_url) if redis_url else None
+        # Máximo de coincidencias del filtro para planificar una búsqueda exacta por IDs
+        self.filter_first_max = int(os.getenv("FILTER_FIRST_MAX_IDS", 256))
+        # Precisión vs latencia por defecto (hnsw_ef, exact, cuantización)
+        self.default_tuning = tuning_from_env()
+        # Búsqueda híbrida: vector denso + vector disperso "keywords" fusionados con RRF
+        self.hybrid = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+        # Si ya se comprobó que la colección tiene el vector disperso (ver check_collection)
+        self._collection_checked = False
+        self.collection_name = "candidates"
+
+    async def check_collection(self) -> None:
+        """Desactiva la búsqueda híbrida si la colección no tiene el vector disperso.
+
+        Las colecciones creadas antes de la búsqueda híbrida no tienen
+        "keywords" hasta recrearlas. Se consulta la configuración una vez (al
+        arrancar la API o en la primera búsqueda); si Qdrant no responde se
+        reintenta en la siguiente.
+        """
+        if not self.hybrid or self._collection_checked:
+            return
+        try:
+            info = await self.client.get_collection(self.collection_name)
+        except Exception as e:
+            logger.warning("No se pudo leer la configuración de la colección %s: %s", self.collection_name, str(e))
+            return
+
+        self._collection_checked = True
+        sparse_vectors = info.config.params.sparse_vectors or {}
+        if SPARSE_VECTOR_NAME not in sparse_vectors:
+            logger.warning(
+                "La colección %s no tiene el vector disperso '%s'; búsqueda solo densa",
+                self.collection_name, SPARSE_VECTOR_NAME
+            )
+            self.hybrid = False
+
+    def score_type(self, query_text: str, skills_filter: Optional[list[str]] = None) -> str:
+        """Qué mide `score` en los resultados de `search` para esta query.
+
+        Returns:
+            "rrf" si se resolvió con búsqueda híbrida (score de Reciprocal Rank
+            Fusion), "cosine" si fue solo densa (similitud coseno)
+        """
+        if self.hybrid and query_sparse_vector(query_text, boost_terms=skills_filter)["indices"]:
+            return "rrf"
+        return "cosine"
+
+    async def embed_query(self, query_text: str) -> list[float]:
+        """Embedding de una query de búsqueda (pasando por la caché)."""
+        return await self.query_cache.get_embedding(query_text, input_type="search_query")
+
+    async def search(
+        self,
+        query_text: str,
+        limit: int = 10,
+        score_threshold: float = 0.5,
+        skills_filter: Optional[list[str]] = None,
+        name_filter: Optional[str] = None,
+        offset: int = 0,
+        query_vector: Optional[list[float]] = None,
+        fields: Optional[list[str]] = None,
+        tuning: Optional[dict] = None
+    ):
+        """Realiza búsqueda semántica con filtros opcionales.
+
+        Args:
+            query_text: Texto de la consulta
+            limit: Número máximo de resultados
+            score_threshold: Umbral mínimo de similitud (0-1)
+            skills_filter: Skills de las que debe tener al menos una (skill completa, sin distinguir mayúsculas).
+                En modo híbrido además pesan más en el vector disperso.
+            name_filter: Filtro por nombre del candidato (búsqueda parcial)
+            offset: Resultados a saltar (paginación)
+            query_vector: Embedding ya calculado de la query (evita re-embeber al paginar)
+            fields: Campos a retornar además de id y score (None = todos los del payload)
+            tuning: Parámetros de búsqueda (ver SEARCH_TUNING_FIELDS) que sobrescriben los del entorno
+
+        Returns:
+            Lista de candidatos ordenados por relevancia con sus scores
+        """
+        await self.check_collection()
+        sparse = self._sparse_query(query_text, skills_filter)
+        plan = await self._plan_filter(
+            _build_filter(skills_filter, name_filter),
+            selective=bool(name_filter),
+            search_params=self._search_params(tuning)
+        )
+        if plan is None:
+            return []
+        query_filter, search_params = plan
+
+        if query_vector is None:
+            query_vector = await self.embed_query(query_text)
+
+        request = _query_request(
+            query_vector, sparse, query_filter, search_params,
+            limit=limit, offset=offset, score_threshold=score_threshold,
+            with_payload=_payload_selector(fields)
+        )
+        response = await self._query(request)
+
+        terms = skills_filter or query_text.split()
+        return [_to_result(point, fields, terms) for point in response.points]
+
+    def _sparse_query(self, query_text: str, skills_filter: Optional[list[str]]) -> Optional[SparseVector]:
+        """Vector disperso de la query, o None si la búsqueda es solo densa."""
+        if not self.hybrid:
+            return None
+        with timed("canonicalize"):
+            sparse = query_sparse_vector(query_text, boost_terms=skills_filter)
+        return SparseVector(**sparse) if sparse["indices"] else None
+
+    def _search_params(self, tuning: Optional[dict]) -> Optional[SearchParams]:
+        return search_params_from_tuning({**self.default_tuning, **(tuning or {})})
+
+    async def _query(self, request: QueryRequest):
+        with timed("qdrant"):
+            return await self.client.query_points(
+                collection_name=self.collection_name,
+                query=request.query,
+                prefetch=request.prefetch,
+                query_filter=request.filter,
+                search_params=request.params,
+                limit=request.limit,
+                offset=request.offset,
+                score_threshold=request.score_threshold,
+                with_payload=request.with_payload
+            )
+
+    async def _plan_filter(
+        self,
+        query_filter: Optional[Filter],
+        selective: bool,
+        search_params: Optional[SearchParams] = None
+    ):
+        """Planificador de consultas filtradas.
+
+        El HNSW con un filtro que cumplen pocos puntos recorre el grafo sin
+        encontrar vecinos válidos y devuelve menos resultados de los que hay.
+        Para filtros potencialmente selectivos (nombre) se recuperan hasta
+        FILTER_FIRST_MAX_IDS + 1 IDs que lo cumplen (sin payload ni vectores):
+        si no se supera el umbral, la búsqueda se restringe a esos IDs con
+        `exact=True`; si se supera, el filtro es amplio y se mantiene el HNSW.
+
+        Args:
+            query_filter: Filtro construido por `_build_filter`
+            selective: Si el filtro puede ser selectivo (hay name_filter)
+            search_params: Parámetros de búsqueda pedidos (hnsw_ef, cuantización...)
+
+        Returns:
+            tuple: (filtro, SearchParams o None), o None si ningún punto
+            cumple el filtro.
+        """
+        if query_filter is None or not selective:
+            return query_filter, search_params
+
+        with timed("qdrant"):
+            points, _ = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=query_filter,
+                limit=self.filter_first_max + 1,
+                with_payload=False,
+                with_vectors=False
+            )
+        if len(points) > self.filter_first_max:
+            return query_filter, search_params
+
+        if not points:
+            return None
+        exact = (search_params or SearchParams()).model_copy(update={"exact": True})
+        return Filter(must=[HasIdCondition(has_id=[p.id for p in points])]), exact
+
+    async def search_batch(self, queries: list[dict]) -> list[dict]:
+        """Ejecuta varias búsquedas semánticas con un embed batch y un query_batch_points.
+
+        Si la llamada batch falla, se reintenta query por query para aislar la
+        que provoca el error, de modo que una query inválida no tumba el lote.
+
+        Args:
+            queries: Dicts con los argumentos de `search` (query_text, limit,
+                score_threshold, skills_filter, name_filter, fields, tuning)
+
+        Returns:
+            Un dict por query en el mismo orden: {"results": [...]} o {"error": "..."}
+        """
+        texts = [q["query_text"] for q in queries]
+        try:
+            vectors = await self.query_cache.get_embeddings(texts, input_type="search_query")
+        except Exception:
+            vectors = await asyncio.gather(
+                *(self.query_cache.get_embedding(text, input_type="search_query") for text in texts),
+                return_exceptions=True
+            )
+
+        outcomes: list[Optional[dict]] = [None] * len(queries)
+        pending = []
+        for i, vector in enumerate(vectors):
+            if isinstance(vector, Exception):
+                outcomes[i] = {"error": f"Error generando embedding: {str(vector)}"}
+            else:
+                pending.append(i)
+
+        await self.check_collection()
+        sparse = {i: self._sparse_query(q["query_text"], q.get("skills_filter")) for i, q in enumerate(queries)}
+
+        if pending:
+            plans = await asyncio.gather(
+                *(
+                    self._plan_filter(
+                        _build_filter(queries[i].get("skills_filter"), queries[i].get("name_filter")),
+                        selective=bool(queries[i].get("name_filter")),
+                        search_params=self._search_params(queries[i].get("tuning"))
+                    )
+                    for i in pending
+                ),
+                return_exceptions=True
+            )
+            planned = []
+            for i, plan in zip(pending, plans):
+                if isinstance(plan, Exception):
+                    outcomes[i] = {"error": f"Error en la búsqueda: {str(plan)}"}
+                elif plan is None:
+                    outcomes[i] = {"results": []}
+                else:
+                    planned.append((i, plan))
+            pending = [i for i, _ in planned]
+
+        if pending:
+            requests = [
+                _query_request(
+                    vectors[i], sparse[i], query_filter, search_params,
+                    limit=queries[i].get("limit", 10),
+                    score_threshold=queries[i].get("score_threshold", 0.5),
+                    with_payload=_payload_selector(queries[i].get("fields"))
+                )
+                for i, (query_filter, search_params) in planned
+            ]
+            try:
+                with timed("qdrant"):
+                    responses = await self.client.query_batch_points(
+                        collection_name=self.collection_name,
+                        requests=requests
+                    )
+            except Exception:
+                responses = await asyncio.gather(
+                    *(self._query(r) for r in requests),
+                    return_exceptions=True
+                )
+
+            for i, response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    outcomes[i] = {"error": f"Error en la búsqueda: {str(response)}"}
+                else:
+                    fields = queries[i].get("fields")
+                    terms = queries[i].get("skills_filter") or queries[i]["query_text"].split()
+                    outcomes[i] = {"results": [_to_result(p, fields, terms) for p in response.points]}
+
+        return outcomes
+
+    async def find_similar(
+        self,
+        candidate_id: int,
+        limit: int = 10,
+        score_threshold: float = 0.0
+    ):
+        """Encuentra candidatos similares a uno existente.
+
+        Args:
+            candidate_id: ID del candidato de referencia
+            limit: Número máximo de resultados
+            score_threshold: Umbral mínimo de similitud
+
+        Returns:
+            Lista de candidatos similares o None si el candidato no existe
+        """
+        if self.knn_graph is not None:
+            # Lectura O(1) del grafo precalculado si refleja la versión actual del índice
+            neighbors = await self.knn_graph.get_neighbors(candidate_id, limit, score_threshold)
+            if neighbors is not None:
+                return neighbors
+
+        try:
+            # Query por ID en el servidor: una sola ida y vuelta y sin transferir el vector
+            response = await self.client.query_points(
+                collection_name=self.collection_name,
+                query=candidate_id,
+                query_filter=_exclude_ids([candidate_id]),
+                limit=limit,
+                score_threshold=score_threshold
+            )
+
+            return [_to_result(p) for p in response.points]
+
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                return None
+            raise Exception(f"Error buscando similares: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error buscando similares: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error buscando similares: {str(e)}")
+
+    async def find_similar_batch(
+        self,
+        candidate_ids: list[int],
+        limit: int = 10,
+        score_threshold: float = 0.0
+    ) -> dict[int, Optional[list[dict]]]:
+        """Encuentra candidatos similares para varios candidatos en una sola llamada batch.
+
+        Args:
+            candidate_ids: IDs de los candidatos de referencia
+            limit: Número máximo de resultados por candidato
+            score_threshold: Umbral mínimo de similitud
+
+        Returns:
+            Diccionario candidate_id -> lista de similares (None si el candidato no está indexado)
+        """
+        unique_ids = list(dict.fromkeys(candidate_ids))
+
+        try:
+            try:
+                responses = await self._query_similar_batch(unique_ids, limit, score_threshold)
+                found_ids = unique_ids
+            except UnexpectedResponse as e:
+                if e.status_code != 404:
+                    raise
+                # Algún ID no está indexado: Qdrant rechaza el lote completo.
+                # Se consultan solo los existentes (sin vectores ni payload) y se reintenta.
+                existing = await self.client.retrieve(
+                    collection_name=self.collection_name,
+                    ids=unique_ids,
+                    with_payload=False,
+                    with_vectors=False
+                )
+                existing_ids = {p.id for p in existing}
+                found_ids = [cid for cid in unique_ids if cid in existing_ids]
+                responses = await self._query_similar_batch(found_ids, limit, score_threshold) if found_ids else []
+
+            results: dict[int, Optional[list[dict]]] = {cid: None for cid in unique_ids}
+            for cid, response in zip(found_ids, responses):
+                results[cid] = [_to_result(p) for p in response.points]
+
+            return results
+
+        except Exception as e:
+            raise Exception(f"Error buscando similares en lote: {str(e)}")
+
+    async def recommend(
+        self,
+        positive_ids: list[int],
+        negative_ids: Optional[list[int]] = None,
+        strategy: str = "average_vector",
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        skills_filter: Optional[list[str]] = None,
+        name_filter: Optional[str] = None,
+        fields: Optional[list[str]] = None
+    ):
+        """Candidatos parecidos a varios ejemplos (y distintos de otros) en una sola consulta.
+
+        Qdrant resuelve la recomendación en el servidor con los vectores ya
+        indexados de los ejemplos:
+        - average_vector: busca cerca de media(positivos) + (media(positivos) - media(negativos))
+        - best_score: puntúa cada candidato por su mejor similitud con un positivo,
+          penalizando a los más cercanos a algún negativo
+        - sum_scores: suma de similitudes con positivos menos la suma con negativos
+
+        Args:
+            positive_ids: Candidatos de ejemplo
+            negative_ids: Candidatos que los resultados no deben parecerse
+            strategy: average_vector, best_score o sum_scores
+            limit: Número máximo de resultados
+            score_threshold: Score mínimo (con best_score/sum_scores no es un coseno)
+            skills_filter: Skills de las que debe tener al menos una (skill completa, sin distinguir mayúsculas)
+            name_filter: Filtro por nombre del candidato (búsqueda parcial)
+            fields: Campos a retornar además de id y score (None = todos los del payload)
+
+        Returns:
+            Lista de candidatos ordenados por score, sin los ejemplos, o None si
+            algún ejemplo no está indexado
+        """
+        negative_ids = negative_ids or []
+        query_filter = _build_filter(skills_filter, name_filter) or Filter()
+        # Los ejemplos nunca se recomiendan a sí mismos
+        query_filter.must_not = [HasIdCondition(has_id=[*positive_ids, *negative_ids])]
+
+        try:
+            with timed("qdrant"):
+                response = await self.client.query_points(
+                    collection_name=self.collection_name,
+                    query=RecommendQuery(recommend=RecommendInput(
+                        positive=positive_ids,
+                        negative=negative_ids or None,
+                        strategy=RecommendStrategy(strategy)
+                    )),
+                    query_filter=query_filter,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    search_params=self._search_params(None),
+                    with_payload=_payload_selector(fields)
+                )
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                return None
+            raise Exception(f"Error en la recomendación: {str(e)}")
+
+        return [_to_result(p, fields, skills_filter) for p in response.points]
+
+    async def _query_similar_batch(self, candidate_ids: list[int], limit: int, score_threshold: float):
+        return await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                QueryRequest(
+                    query=cid,
+                    filter=_exclude_ids([cid]),
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    with_payload=True
+                )
+                for cid in candidate_ids
+            ]
+        )
+
+    async def close(self) -> None:
+        """Libera los pools de conexiones de Qdrant y Cohere."""
+        await self.client.close()
+        await self.embeddings_service.close()
+        await self.query_cache.close()
+        if self.knn_graph is not None:
+            await self.knn_graph.close()
+
+
+# Parámetros de precisión/latencia aceptados en `tuning` y su variable de entorno
+SEARCH_TUNING_FIELDS = {
+    "hnsw_ef": "SEARCH_HNSW_EF",
+    "exact": "SEARCH_EXACT",
+    "quantization_rescore": "SEARCH_QUANTIZATION_RESCORE",
+    "quantization_oversampling": "SEARCH_QUANTIZATION_OVERSAMPLING",
+}
+
+
+def tuning_from_env() -> dict:
+    """Parámetros de búsqueda por defecto definidos en el entorno (solo los presentes)."""
+    parsers = {
+        "hnsw_ef": int,
+        "exact": lambda v: v.lower() == "true",
+        "quantization_rescore": lambda v: v.lower() == "true",
+        "quantization_oversampling": float,
+    }
+    return {
+        field: parsers[field](os.environ[env])
+        for field, env in SEARCH_TUNING_FIELDS.items()
+        if os.getenv(env)
+    }
+
+
+def search_params_from_tuning(tuning: dict) -> Optional[SearchParams]:
+    """Traduce `tuning` a SearchParams de Qdrant (None = valores por defecto de la colección).
+
+    - hnsw_ef: tamaño del beam del HNSW; más alto = más recall y más latencia
+    - exact: búsqueda exhaustiva sin HNSW (recall 1.0)
+    - quantization_rescore / quantization_oversampling: con cuantización en la
+      colección, recuperar `oversampling`·limit candidatos con los vectores
+      cuantizados y reordenarlos con los originales
+    """
+    quantization = None
+    if "quantization_rescore" in tuning or "quantization_oversampling" in tuning:
+        quantization = QuantizationSearchParams(
+            rescore=tuning.get("quantization_rescore"),
+            oversampling=tuning.get("quantization_oversampling")
+        )
+    if not (quantization or "hnsw_ef" in tuning or "exact" in tuning):
+        return None
+    return SearchParams(
+        hnsw_ef=tuning.get("hnsw_ef"),
+        exact=tuning.get("exact", False),
+        quantization=quantization
+    )
+
+
+def _build_filter(
+    skills_filter: Optional[list[str]] = None,
+    name_filter: Optional[str] = None
+) -> Optional[Filter]:
+    """Construye el filtro de Qdrant: must (AND) para nombre y skills.
+
+    Las skills se comparan completas contra el payload `skills` normalizado
+    (MatchAny: basta con una), así "Go" no coincide con "MongoDB". El nombre
+    usa el índice de texto PREFIX de `name`: cada palabra del filtro debe ser
+    el comienzo de una palabra del nombre, sin distinguir mayúsculas ("ana
+    gar" encuentra "Ana García"; "ez" no encuentra "Pérez").
+    """
+    must_conditions = []
+
+    skills = normalize_skills(",".join(skills_filter or []))
+    if skills:
+        # Skills con OR: debe tener AL MENOS UNA de las skills
+        must_conditions.append(
+            FieldCondition(
+                key=SKILLS_PAYLOAD_KEY,
+                match=MatchAny(any=skills)
+            )
+        )
+
+    if name_filter:
+        # Name con AND: debe cumplir el nombre
+        must_conditions.append(
+            FieldCondition(
+                key="name",
+                match=MatchText(text=name_filter)
+            )
+        )
+
+    if not must_conditions:
+        return None
+
+    return Filter(must=must_conditions)
+
+
+def _query_request(
+    query_vector: list[float],
+    sparse: Optional[SparseVector],
+    query_filter: Optional[Filter],
+    search_params: Optional[SearchParams],
+    limit: int,
+    score_threshold: Optional[float],
+    with_payload,
+    offset: int = 0
+) -> QueryRequest:
+    """Construye la consulta densa o, si hay vector disperso, la híbrida.
+
+    En la híbrida cada rama recupera sus mejores candidatos y Qdrant los
+    fusiona con Reciprocal Rank Fusion: el score final es el de RRF, no el
+    coseno. El filtro se repite en cada rama para que ninguna aporte puntos
+    que no lo cumplen.
+
+    `score_threshold` es una similitud coseno y se respeta en todos los
+    resultados fusionados: con umbral, la rama dispersa no busca en toda la
+    colección sino que reordena por palabras clave los candidatos densos que
+    lo superan (una ventana HYBRID_PREFETCH_FACTOR veces mayor).
+    """
+    if sparse is None:
+        return QueryRequest(
+            query=query_vector,
+            filter=query_filter,
+            params=search_params,
+            limit=limit,
+            offset=offset or None,
+            score_threshold=score_threshold,
+            with_payload=with_payload
+        )
+
+    window = (offset + limit) * HYBRID_PREFETCH_FACTOR
+    above_threshold = Prefetch(
+        query=query_vector, filter=query_filter, params=search_params,
+        score_threshold=score_threshold, limit=window * HYBRID_PREFETCH_FACTOR
+    ) if score_threshold else None
+    return QueryRequest(
+        prefetch=[
+            Prefetch(
+                query=query_vector, filter=query_filter, params=search_params,
+                score_threshold=score_threshold, limit=window
+            ),
+            Prefetch(
+                query=sparse, using=SPARSE_VECTOR_NAME, filter=query_filter,
+                prefetch=above_threshold, limit=window
+            ),
+        ],
+        query=FusionQuery(fusion=Fusion.RRF),
+        filter=query_filter,
+        limit=limit,
+        offset=offset or None,
+        with_payload=with_payload
+    )
+
+
+def _exclude_ids(ids: list[int]) -> Filter:
+    """Filtro que excluye los puntos indicados (p. ej. el candidato de referencia)."""
+    return Filter(must_not=[HasIdCondition(has_id=ids)])
+
+
+# Campo expuesto por la API -> clave del payload en Qdrant
+PAYLOAD_FIELDS = {
+    "name": "name",
+    "text_content": "text_content",
+    "updated_at": "update_at",
+    "snippet": "text_content",
+}
+
+
+def _payload_selector(fields: Optional[list[str]]):
+    """Traduce `fields` a la lista include de `with_payload` (True = payload completo)."""
+    if fields is None:
+        return True
+    return sorted({PAYLOAD_FIELDS[f] for f in fields}) or False
+
+
+def _to_result(point, fields: Optional[list[str]] = None, terms: Optional[list[str]] = None) -> dict:
+    """Formatea un punto de Qdrant como resultado de búsqueda.
+
+    Args:
+        point: Punto retornado por Qdrant
+        fields: Campos a incluir además de id y score (None = name, text_content y updated_at)
+        terms: Skills o términos de la query alrededor de los que se recorta `snippet`
+    """
+    payload = point.payload or {}
+    if fields is None:
+        return {
+            "id": point.id,
+            "score": point.score,
+            "name": payload.get("name"),
+            "text_content": payload.get("text_content"),
+            "updated_at": payload.get("update_at")
+        }
+
+    result = {"id": point.id, "score": point.score}
+    for field in fields:
+        if field == "snippet":
+            result["snippet"] = make_snippet(payload.get("text_content") or "", terms or [])
+        else:
+            result[field] = payload.get(PAYLOAD_FIELDS[field])
+    return result
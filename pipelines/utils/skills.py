@@ -0,0 +1,23 @@
+"""
+Skills normalizadas en el payload de Qdrant.
+
+`skills_filter` se resolvía con `MatchText` sobre `text_content`: una
+comparación de subcadenas que hacía coincidir "Go" con "Google" o "MongoDB".
+Ahora cada punto lleva en `skills` la lista canónica de sus skills (minúsculas,
+espacios colapsados, sin duplicados, ordenada) con un índice keyword, y el
+filtro compara skills completas con `MatchAny` sobre la misma forma.
+
+Es la misma normalización que `normalize_skills()` en SQL (columna
+`skill_tags` de la API). El worker Rust la replica en
+services/worker-rust/src/jobs/skills.rs: un cambio aquí va en ambos lados.
+"""
+from typing import Optional
+
+SKILLS_PAYLOAD_KEY = "skills"
+
+
+def normalize_skills(raw: Optional[str]) -> list[str]:
+    """Forma canónica de una lista de skills separada por comas."""
+    if not raw:
+        return []
+    return sorted({" ".join(part.split()).lower() for part in raw.split(",")} - {""})
@@ -0,0 +1,46 @@
+"""
+Fragmentos de texto para resultados de búsqueda.
+
+`text_content` concatena nombre, resumen, skills y experiencia; la tabla de
+resultados solo muestra unas líneas. `make_snippet` recorta el texto alrededor
+de la primera skill (o término de la query) que aparece, para que el
+reclutador vea por qué el candidato coincide sin transferir el texto completo.
+"""
+import re
+
+SNIPPET_WIDTH = 160
+
+
+def make_snippet(text: str, terms: list[str], width: int = SNIPPET_WIDTH) -> str:
+    """Recorta `text` a ~`width` caracteres centrados en el primer término encontrado.
+
+    Args:
+        text: Texto completo del candidato
+        terms: Skills o términos de la query a resaltar (sin distinguir mayúsculas)
+        width: Longitud aproximada del fragmento
+
+    Returns:
+        Fragmento con "…" en los extremos recortados; el inicio del texto si no hay coincidencias
+    """
+    if len(text) <= width:
+        return text
+
+    matches = [
+        m for m in (re.search(re.escape(term), text, re.IGNORECASE) for term in terms if term.strip())
+        if m is not None
+    ]
+    center = min(m.start() for m in matches) if matches else 0
+
+    start = max(center - width // 3, 0)
+    end = min(start + width, len(text))
+    start = max(end - width, 0)
+
+    # Ajustar a límites de palabra para no cortar términos a la mitad
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < center else start
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+
+    return ("…" if start > 0 else "") + text[start:end].strip() + ("…" if end < len(text) else "")
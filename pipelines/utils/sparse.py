@@ -0,0 +1,82 @@
+"""
+Vectores dispersos de palabras clave (estilo BM25) para la búsqueda híbrida.
+
+El vector denso captura el significado del perfil pero diluye términos
+exactos como "Kubernetes" o "FastAPI". Junto a él se indexa un vector
+disperso con un peso por término:
+
+- Documento: saturación de frecuencia de BM25, tf·(k1+1) / (tf + k1·(1-b+b·len/avg_len)).
+- Query: peso 1 por término (las skills pedidas pesan más).
+
+La IDF la aplica Qdrant en el servidor (`Modifier.IDF` sobre el vector
+"keywords"), así que no hace falta mantener estadísticas del corpus aquí.
+Cada término se mapea a un índice estable con CRC32, sin vocabulario.
+
+El worker Rust indexa con una réplica de `document_sparse_vector`
+(services/worker-rust/src/jobs/sparse.rs): un cambio aquí va en ambos lados.
+"""
+from collections import Counter
+import re
+import unicodedata
+import zlib
+
+SPARSE_VECTOR_NAME = "keywords"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Longitud media aproximada (en términos) de text_content
+BM25_AVG_LEN = 60
+
+STOPWORDS = {
+    "a", "al", "and", "años", "anos", "con", "de", "del", "el", "en", "experience",
+    "for", "in", "la", "las", "los", "of", "on", "para", "por", "skills", "the",
+    "to", "un", "una", "with", "y",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Términos en minúsculas y sin acentos; conserva "c++", "c#", "node.js"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    tokens = (t.rstrip(".") for t in _TOKEN_RE.findall(plain))
+    return [t for t in tokens if len(t) > 1 and t not in STOPWORDS]
+
+
+def _term_index(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8"))
+
+
+def _to_sparse(weights: dict[str, float]) -> dict:
+    # Dos términos con el mismo CRC32 (improbable) suman su peso
+    merged: dict[int, float] = {}
+    for term, weight in weights.items():
+        index = _term_index(term)
+        merged[index] = merged.get(index, 0.0) + weight
+    indices = sorted(merged)
+    return {"indices": indices, "values": [merged[i] for i in indices]}
+
+
+def document_sparse_vector(text: str) -> dict:
+    """Vector disperso de un documento con saturación de frecuencia BM25.
+
+    Returns:
+        dict con `indices` y `values` (vacío si el texto no tiene términos)
+    """
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * len(tokens) / BM25_AVG_LEN)
+    return _to_sparse({
+        term: tf * (BM25_K1 + 1) / (tf + norm)
+        for term, tf in counts.items()
+    })
+
+
+def query_sparse_vector(text: str, boost_terms: list[str] | None = None, boost: float = 2.0) -> dict:
+    """Vector disperso de una query: peso 1 por término y `boost` para las skills pedidas."""
+    weights = {term: 1.0 for term in tokenize(text)}
+    for skill in boost_terms or []:
+        for term in tokenize(skill):
+            weights[term] = boost
+    return _to_sparse(weights)
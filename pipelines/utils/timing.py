@@ -0,0 +1,143 @@
+"""
+Desglose de latencia por fase de una búsqueda.
+
+Cuando una búsqueda es lenta no se sabía si la culpa era de Cohere, de Qdrant
+o de la serialización. Cada fase del camino de búsqueda se envuelve en
+`timed("<fase>")`; el endpoint abre una medición con `start_timings()` y al
+terminar:
+
+- la expone en la cabecera `Server-Timing` (visible en las DevTools del navegador),
+- la incluye en la respuesta si se pidió `debug=true`,
+- la acumula en histogramas de latencia por fase (`LATENCY_HISTOGRAMS`).
+
+La cabecera y `timings` se escriben antes de serializar la respuesta, así que
+`serialize` solo aparece en los histogramas (la respuesta los alimenta al
+terminar de serializarse, ver `endpoint`).
+
+La medición activa viaja en un ContextVar: `asyncio.gather` y
+`run_in_threadpool` copian el contexto, así las fases de tareas hijas e hilos
+se suman a la misma request. Fuera de una request `timed` no mide nada.
+
+Fases: canonicalize, cache_lookup, embed, cache_store, qdrant, hydrate, serialize.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import threading
+import time
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("search_timings", default=None)
+
+
+class RequestTimings:
+    """Milisegundos acumulados por fase de una request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        # Histograma al que se suma la request tras serializar la respuesta (None = ninguno)
+        self.endpoint: Optional[str] = None
+
+    def record(self, phase: str, ms: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def total(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self) -> dict[str, float]:
+        """Fases en ms (redondeadas a µs) más `total` hasta este momento."""
+        return {**{p: round(ms, 3) for p, ms in self.phases.items()}, "total": round(self.total(), 3)}
+
+    def server_timing(self) -> str:
+        """Valor de la cabecera Server-Timing: `embed;dur=12.3, qdrant;dur=4.1, total;dur=18.0`."""
+        return ", ".join(f"{phase};dur={ms}" for phase, ms in self.as_dict().items())
+
+
+def start_timings() -> RequestTimings:
+    """Abre la medición de la request actual."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Medición de la request en curso (None fuera de una request medida)."""
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Suma la duración del bloque a la fase indicada de la request en curso."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(phase, (time.perf_counter() - started) * 1000)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos en ms (escala ~logarítmica)."""
+
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(self.BUCKETS, ms)] += 1
+        self.count += 1
+        self.sum += ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Límite superior del bucket que contiene el cuantil q (None sin observaciones)."""
+        if not self.count:
+            return None
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {
+                f"le_{bound}": n for bound, n in zip((*self.BUCKETS, "inf"), self.counts)
+            },
+        }
+
+
+class LatencyHistograms:
+    """Un histograma por endpoint y fase, alimentados con cada RequestTimings."""
+
+    def __init__(self):
+        self._histograms: dict[str, dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, timings: RequestTimings) -> None:
+        with self._lock:
+            phases = self._histograms.setdefault(endpoint, {})
+            for phase, ms in timings.as_dict().items():
+                phases.setdefault(phase, LatencyHistogram()).observe(ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {phase: h.snapshot() for phase, h in phases.items()}
+                for endpoint, phases in self._histograms.items()
+            }
+
+
+LATENCY_HISTOGRAMS = LatencyHistograms()
@@ -0,0 +1,56 @@
+"""create saved searches and matches
+
+Revision ID: 7c1f2b9d4e60
+Revises: 5533abe98096
+Create Date: 2026-10-19 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f2b9d4e60'
+down_revision: Union[str, Sequence[str], None] = '5533abe98096'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('saved_searches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('owner', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=150), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('query_vector', sa.LargeBinary(), nullable=False),
+    sa.Column('score_threshold', sa.Float(), nullable=False),
+    sa.Column('skills_filter', sa.JSON(), nullable=True),
+    sa.Column('name_filter', sa.String(length=150), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_saved_searches_owner'), 'saved_searches', ['owner'], unique=False)
+    op.create_table('saved_search_matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('saved_search_id', sa.Integer(), nullable=False),
+    sa.Column('candidate_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('seen', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('matched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('saved_search_id', 'candidate_id')
+    )
+    op.create_index(op.f('ix_saved_search_matches_saved_search_id'), 'saved_search_matches', ['saved_search_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_saved_search_matches_saved_search_id'), table_name='saved_search_matches')
+    op.drop_table('saved_search_matches')
+    op.drop_index(op.f('ix_saved_searches_owner'), table_name='saved_searches')
+    op.drop_table('saved_searches')
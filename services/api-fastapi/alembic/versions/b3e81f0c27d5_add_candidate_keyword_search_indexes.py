@@ -0,0 +1,54 @@
+"""add candidate keyword search indexes
+
+Revision ID: b3e81f0c27d5
+Revises: 7c1f2b9d4e60
+Create Date: 2026-10-19 11:40:07.913254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e81f0c27d5'
+down_revision: Union[str, Sequence[str], None] = '7c1f2b9d4e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Configuración 'simple': sin stemming, los nombres y skills se indexan tal cual
+    op.add_column('candidates', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(headline, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(skills, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(summary, '')), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_candidates_search_vector', 'candidates', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_candidates_name_trgm', 'candidates', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_candidates_email_trgm', 'candidates', ['email'], unique=False,
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidates_email_trgm', table_name='candidates')
+    op.drop_index('ix_candidates_name_trgm', table_name='candidates')
+    op.drop_index('ix_candidates_search_vector', table_name='candidates')
+    op.drop_column('candidates', 'search_vector')
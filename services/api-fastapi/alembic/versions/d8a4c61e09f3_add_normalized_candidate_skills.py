@@ -0,0 +1,77 @@
+"""add normalized candidate skills and skill counts view
+
+Revision ID: d8a4c61e09f3
+Revises: b3e81f0c27d5
+Create Date: 2026-10-19 15:22:48.370615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4c61e09f3'
+down_revision: Union[str, Sequence[str], None] = 'b3e81f0c27d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Misma normalización que pipelines.utils.skills.normalize_skills
+    op.execute("""
+        CREATE FUNCTION normalize_skills(raw text) RETURNS text[]
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT coalesce(array_agg(DISTINCT skill ORDER BY skill), '{}')
+            FROM (
+                SELECT lower(btrim(regexp_replace(part, '\\s+', ' ', 'g'))) AS skill
+                FROM unnest(string_to_array(raw, ',')) AS part
+            ) parts
+            WHERE skill <> ''
+        $$
+    """)
+    op.add_column('candidates', sa.Column('skill_tags', postgresql.ARRAY(sa.Text()), nullable=True))
+
+    # El trigger se crea antes del backfill: las escrituras concurrentes ya quedan normalizadas
+    op.execute("""
+        CREATE FUNCTION candidates_set_skill_tags() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.skill_tags := normalize_skills(NEW.skills);
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER candidates_skill_tags
+        BEFORE INSERT OR UPDATE OF skills ON candidates
+        FOR EACH ROW EXECUTE FUNCTION candidates_set_skill_tags()
+    """)
+
+    # Backfill sin tocar updated_at, para no provocar una re-indexación completa
+    op.execute("UPDATE candidates SET skill_tags = normalize_skills(skills) WHERE skill_tags IS NULL")
+    op.alter_column('candidates', 'skill_tags', nullable=False, server_default=sa.text("'{}'"))
+    op.create_index('ix_candidates_skill_tags', 'candidates', ['skill_tags'], unique=False, postgresql_using='gin')
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW candidate_skill_counts AS
+        SELECT skill, count(*)::integer AS candidates
+        FROM candidates, unnest(skill_tags) AS skill
+        WHERE is_active
+        GROUP BY skill
+    """)
+    # Índice único: requisito de REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_candidate_skill_counts_skill', 'candidate_skill_counts', ['skill'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW candidate_skill_counts")
+    op.drop_index('ix_candidates_skill_tags', table_name='candidates')
+    op.execute("DROP TRIGGER candidates_skill_tags ON candidates")
+    op.execute("DROP FUNCTION candidates_set_skill_tags()")
+    op.drop_column('candidates', 'skill_tags')
+    op.execute("DROP FUNCTION normalize_skills(text)")
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.db.models.candidate import Candidate
-from app.db.database import get_db
-from app.schemas.candidate import CandidateCreate, CandidateRead, CandidateUpdate
-from app.core.index_queue import enqueue_single_index, enqueue_delete_point
+from app.db.database import get_async_db, get_db
+from app.schemas.candidate import (
+    CandidateCreate, CandidateRead, CandidateUpdate, CandidateField,
+    CandidateBulkCreate, CandidateBulkResult, CandidateSearchHit, ExportFormat, SkillFacet
+)
+from app.core.candidate_listing import DEFAULT_PAGE_SIZE, build_list_query, fetch_page, stream_ndjson
+from app.core.candidate_bulk import upsert_candidates
+from app.core.candidate_export import EXPORT_MEDIA_TYPES, stream_export
+from app.core.candidate_update import patch_candidate, update_changes
+from app.core.keyword_search import keyword_search
+from app.core.skill_facets import mark_skill_facets_stale, refresh_skill_facets, skill_facets
+from app.core import candidate_cache
+from app.core.similar_cache import etag_matches
+from app.core.index_queue import enqueue_single_index, enqueue_batch_index, enqueue_delete_point
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,15 +30,160 @@ router = APIRouter(prefix="/candidate", tags=["Candidate"])
     response_model=list[CandidateRead], 
     status_code=200,
     responses={
-        200: {"description": "List of candidates"},
+        200: {
+            "description": "All candidates, a page of them with limit/after_id, or an NDJSON stream with stream=true",
+            "content": {"application/x-ndjson": {}}
+        },
         422: {"description": "Invalid query parameters"}
     },
     summary="Lista de candidatos",
-    description="Lista de todos los candidatos"
+    description="Lista completa o, con limit/after_id, paginada por keyset; proyección de campos y filtros; stream=true emite NDJSON"
+)
+def list_candidates(
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0, description="Último ID de la página anterior (header X-Next-After-Id)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description=f"Tamaño de página (default {DEFAULT_PAGE_SIZE} si se pasa after_id; ignorado con stream=true)"),
+    fields: Optional[list[CandidateField]] = Query(None, description="Campos a retornar (id siempre incluido)"),
+    is_active: Optional[bool] = Query(None),
+    role: Optional[str] = Query(None, description="Rol (contiene, sin distinguir mayúsculas)"),
+    location: Optional[str] = Query(None, description="Ubicación (contiene, sin distinguir mayúsculas)"),
+    skills: Optional[list[str]] = Query(None, description="Skills requeridas (todas; sin distinguir mayúsculas)"),
+    stream: bool = Query(False, description="Emitir todos los candidatos filtrados como NDJSON en memoria constante"),
+    db: Session = Depends(get_db)
+):
+    """Lista candidatos sin cargar la tabla completa en memoria.
+
+    Las filas se leen como columnas planas (sin ORM ni validación por fila).
+    Sin `limit` ni `after_id` se retorna el listado completo, como antes de
+    paginar (los clientes existentes dependen de ello). Con cualquiera de los
+    dos se pagina y, si la página está completa, `X-Next-After-Id` y `Link`
+    indican la siguiente.
+    """
+    dialect = db.get_bind().dialect.name
+    if stream:
+        query = build_list_query(after_id or 0, None, fields, is_active, role, location, skills, dialect)
+        return StreamingResponse(stream_ndjson(db, query), media_type="application/x-ndjson")
+
+    if limit is None and after_id is None:
+        query = build_list_query(0, None, fields, is_active, role, location, skills, dialect)
+        return ORJSONResponse(fetch_page(db, query))
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    query = build_list_query(after_id or 0, limit, fields, is_active, role, location, skills, dialect)
+    rows = fetch_page(db, query)
+
+    headers = {}
+    if len(rows) == limit:
+        next_after_id = rows[-1]["id"]
+        headers["X-Next-After-Id"] = str(next_after_id)
+        # Misma query (fields, filtros) con el cursor de la página siguiente
+        next_query = request.url.include_query_params(after_id=next_after_id, limit=limit).query
+        headers["Link"] = f'<?{next_query}>; rel="next"'
+    return ORJSONResponse(rows, headers=headers)
+
+@router.get(
+    "/export",
+    status_code=200,
+    responses={
+        200: {
+            "description": "Full candidate export streamed in the requested format",
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}
+        },
+        422: {"description": "Invalid query parameters"}
+    },
+    summary="Exporta todos los candidatos",
+    description="Exporta en streaming (CSV con COPY TO STDOUT, NDJSON o Parquet) en memoria constante; admite gzip con Accept-Encoding"
 )
-def list_candidates(db: Session = Depends(get_db)):
-    candidates = db.query(Candidate).all()
-    return candidates
+def export_candidates(
+    format: ExportFormat = Query("csv", description="Formato del archivo"),
+    fields: Optional[list[CandidateField]] = Query(None, description="Campos a exportar (id siempre incluido)"),
+    is_active: Optional[bool] = Query(None),
+    role: Optional[str] = Query(None, description="Rol (contiene, sin distinguir mayúsculas)"),
+    location: Optional[str] = Query(None, description="Ubicación (contiene, sin distinguir mayúsculas)"),
+    skills: Optional[list[str]] = Query(None, description="Skills requeridas (todas; sin distinguir mayúsculas)"),
+    db: Session = Depends(get_db)
+):
+    """Exporta la base de candidatos completa sin materializarla.
+
+    Args:
+        format (ExportFormat): csv, ndjson o parquet
+        fields (list[CandidateField], optional): Columnas a exportar
+        is_active (bool, optional): Filtrar por estado
+        role (str, optional): Filtrar por rol
+        location (str, optional): Filtrar por ubicación
+        skills (list[str], optional): Filtrar por skills
+        db (Session): Sesión de base de datos (el export usa una conexión propia)
+
+    Returns:
+        StreamingResponse: Archivo adjunto `candidates.{format}`
+    """
+    query = build_list_query(0, None, fields, is_active, role, location, skills, db.get_bind().dialect.name)
+    return StreamingResponse(
+        stream_export(db, query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="candidates.{format}"'}
+    )
+
+@router.get(
+    "/search",
+    response_model=list[CandidateSearchHit],
+    status_code=200,
+    responses={
+        200: {"description": "Candidates matching the keywords, best first"},
+        422: {"description": "Invalid query parameters"}
+    },
+    summary="Búsqueda por palabras clave (typeahead)",
+    description="Coincidencia por prefijo (tsvector) y difusa (pg_trgm) sobre nombre, email, headline, skills y summary; no usa embeddings"
+)
+async def search_candidates(
+    q: str = Query(..., min_length=2, max_length=100, description="Texto a buscar"),
+    limit: int = Query(10, ge=1, le=50, description="Máximo de resultados"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Búsqueda rápida para el autocompletado de la UI, solo con índices de Postgres.
+
+    Args:
+        q (str): Texto escrito por el usuario (prefijos o con erratas)
+        limit (int): Máximo de resultados
+        db (AsyncSession): Sesión asíncrona de base de datos
+
+    Returns:
+        list[CandidateSearchHit]: Candidatos ordenados por relevancia
+    """
+    return await keyword_search(db, q, limit)
+
+@router.get(
+    "/facets/skills",
+    response_model=list[SkillFacet],
+    status_code=200,
+    responses={
+        200: {"description": "Active candidates per skill, most common first"},
+        422: {"description": "Invalid query parameters"}
+    },
+    summary="Conteo de candidatos por skill",
+    description="Facetas de skills desde la vista materializada candidate_skill_counts, refrescada tras las escrituras"
+)
+async def get_skill_facets(
+    background_tasks: BackgroundTasks,
+    prefix: Optional[str] = Query(None, max_length=100, description="Solo skills que empiezan por este texto"),
+    limit: int = Query(20, ge=1, le=200, description="Máximo de skills"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cuántos candidatos activos tienen cada skill (forma canónica).
+
+    Si hubo escrituras desde el último refresco, la vista se refresca en segundo
+    plano tras responder: los conteos pueden ir una consulta por detrás.
+
+    Args:
+        prefix (str, optional): Prefijo de la skill (typeahead de filtros)
+        limit (int): Máximo de skills
+        db (AsyncSession): Sesión asíncrona de base de datos
+
+    Returns:
+        list[SkillFacet]: Skills ordenadas por número de candidatos
+    """
+    background_tasks.add_task(refresh_skill_facets)
+    return await skill_facets(db, prefix, limit)
 
 @router.get(
     "/{candidate_id}", 
@@ -32,17 +191,43 @@ def list_candidates(db: Session = Depends(get_db)):
     status_code=200,
     responses={
         200: {"description": "Candidate found"},
+        304: {"description": "Candidate not modified (If-None-Match)"},
         404: {"description": "Candidate not found"},
         422: {"description": "Invalid query parameters"}
     },
     summary="Candidato por ID",
-    description="Obtiene un candidato filtrando por el id del candidato"
+    description="Obtiene un candidato filtrando por el id del candidato (caché en Redis con ETag)"
 )
-def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    if candidate is None:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    return candidate
+def get_candidate(candidate_id: int, request: Request, db: Session = Depends(get_db)):
+    """Obtiene un candidato, primero desde la caché de Redis.
+
+    Un hit responde con el JSON ya serializado; si además el ETag coincide con
+    If-None-Match responde 304. En ninguno de los dos casos se consulta Postgres.
+
+    Args:
+        candidate_id (int): Identificador del candidato
+        request (Request): Request HTTP (para leer If-None-Match)
+        db (Session): Sesión de base de datos (solo en un miss)
+
+    Raises:
+        HTTPException: Status 404 candidato no encontrado
+
+    Returns:
+        Response: CandidateRead serializado, o 304 sin cuerpo
+    """
+    if cached := candidate_cache.get_cached_candidate(candidate_id):
+        etag, body = cached
+    else:
+        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        if candidate is None:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        etag, body = candidate_cache.serialize_candidate(candidate)
+        candidate_cache.set_cached_candidate(candidate_id, etag, body)
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post(
     "/", 
@@ -63,6 +248,7 @@ def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
         db.add(new_candidate)
         db.commit()
         db.refresh(new_candidate)
+        candidate_cache.invalidate_candidate(new_candidate.id)
         
         logger.info(
             f"Candidato creado exitosamente",
@@ -71,6 +257,7 @@ def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
         
         # Auto-indexar en Qdrant via worker Rust
         enqueue_single_index(new_candidate.id, requested_by="fastapi:create")
+        mark_skill_facets_stale()
         
         return new_candidate
     
@@ -111,6 +298,66 @@ def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
             detail="Error interno del servidor"
         )
 
+@router.post(
+    "/bulk",
+    response_model=CandidateBulkResult,
+    status_code=200,
+    responses={
+        200: {"description": "Batch processed (per-row conflicts are reported, not raised)"},
+        409: {"description": "Concurrent write conflicted with the batch"},
+        422: {"description": "Validation error"},
+    },
+    summary="Crear o actualizar candidatos en lote",
+    description="Inserta hasta 1000 candidatos en un solo statement; los emails existentes se actualizan y se encola un único job de indexación"
+)
+def bulk_upsert_candidates(params: CandidateBulkCreate, db: Session = Depends(get_db)):
+    """Crea o actualiza (por email) un lote de candidatos.
+
+    Args:
+        params (CandidateBulkCreate): Lote de candidatos (1-1000)
+        db (Session): Sesión de base de datos
+
+    Raises:
+        IntegrityError: Si una escritura concurrente choca con el lote (manejador global, 409)
+
+    Returns:
+        dict: IDs creados, IDs actualizados y conflictos por fila (índice en el lote)
+    """
+    try:
+        result = upsert_candidates(db, params.candidates)
+    except IntegrityError:
+        db.rollback()
+        raise
+
+    logger.info(
+        "Lote de candidatos procesado",
+        extra={
+            "created": len(result["created"]),
+            "updated": len(result["updated"]),
+            "conflicts": len(result["conflicts"])
+        }
+    )
+
+    candidate_cache.invalidate_candidates(result["updated"])
+    # Un solo job para todo el lote: el worker embebe los candidatos en bloques
+    enqueue_batch_index(result["created"] + result["updated"], requested_by="fastapi:bulk")
+    if result["created"] or result["updated"]:
+        mark_skill_facets_stale()
+
+    return result
+
+@router.patch(
+    "/{candidate_id}",
+    response_model=CandidateRead,
+    responses={
+        200: {"description": "Candidate updated (or unchanged) successfully"},
+        404: {"description": "Candidate not found"},
+        409: {"description": "Email already exists"},
+        422: {"description": "Validation error"}
+    },
+    summary="Actualizar parcialmente un candidato",
+    description="Actualiza solo los campos enviados con un único UPDATE ... RETURNING; si no cambia nada no escribe ni re-indexa"
+)
 @router.put(
     "/{candidate_id}", 
     response_model=CandidateUpdate,
@@ -124,45 +371,20 @@ def create_candidate(candidate: CandidateCreate, db: Session = Depends(get_db)):
     description="Actualiza un candidato filtrando por el id del candidato"
 )
 def update_candidate(candidate_id: int, candidate: CandidateUpdate, db: Session = Depends(get_db)):
-    existing_candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-
-    if not existing_candidate:
-        raise HTTPException(status_code=404, detail="Candidato no encontrado")
-
     try:
-        # Actualizar solo los campos proporcionados
-        if candidate.name is not None:
-            existing_candidate.name = candidate.name
-
-        if candidate.email is not None:
-            existing_candidate.email = candidate.email
-
-        if candidate.phone is not None:
-            existing_candidate.phone = candidate.phone
-
-        if candidate.location is not None:
-            existing_candidate.location = candidate.location
+        updated, changed = patch_candidate(db, candidate_id, update_changes(candidate))
 
-        if candidate.education is not None:
-            existing_candidate.education = candidate.education
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Candidato no encontrado")
 
-        if candidate.headline is not None:
-            existing_candidate.headline = candidate.headline
-
-        if candidate.summary is not None:
-            existing_candidate.summary = candidate.summary
-
-        if candidate.role is not None:
-            existing_candidate.role = candidate.role
-
-        if candidate.experience is not None:
-            existing_candidate.experience = candidate.experience
-
-        if candidate.skills is not None:
-            existing_candidate.skills = candidate.skills
+        if not changed:
+            logger.info(
+                f"Actualización sin cambios, se omite la escritura y la re-indexación",
+                extra={"candidate_id": candidate_id}
+            )
+            return updated
 
-        db.commit()
-        db.refresh(existing_candidate)
+        candidate_cache.invalidate_candidate(candidate_id)
         
         logger.info(
             f"Candidato actualizado exitosamente",
@@ -171,9 +393,14 @@ def update_candidate(candidate_id: int, candidate: CandidateUpdate, db: Session
 
         # Re-indexar embedding actualizado en Qdrant via worker Rust
         enqueue_single_index(candidate_id, requested_by="fastapi:update")
+        if candidate.skills is not None:
+            mark_skill_facets_stale()
 
-        return existing_candidate
+        return updated
     
+    except HTTPException:
+        raise
+
     except IntegrityError as e:
         db.rollback()
         error_msg = str(e.orig).lower()
@@ -228,6 +455,7 @@ def delete_candidate(candidate_id: int, db: Session = Depends(get_db)):
     
     db.delete(candidate)
     db.commit()
+    candidate_cache.invalidate_candidate(candidate_id)
     
     logger.info(
         f"Candidato eliminado exitosamente",
@@ -236,5 +464,6 @@ def delete_candidate(candidate_id: int, db: Session = Depends(get_db)):
     
     # Eliminar vector fantasma de Qdrant via worker Rust
     enqueue_delete_point(candidate_id, requested_by="fastapi:delete")
+    mark_skill_facets_stale()
     
     return candidate
\ No newline at end of file
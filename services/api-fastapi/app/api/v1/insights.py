@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.llm.agent import Agent
-from app.db.database import SessionLocal
+from app.db.database import get_async_db
 from app.db.models.candidate import Candidate
 from app.schemas.insight import InsightResponse
 from app.llm.compression import ContextCompressor
 from app.core.redis import get_redis_client
+from app.core.skill_facets import normalize_skills
 import json
 import logging
 
@@ -22,22 +24,22 @@ router = APIRouter(prefix="/insights",tags=["LLM Insights"])
     summary="Genera insights para un candidato",
     description="Genera insights para un candidato filtrando por el id del candidato"
 )
-async def generate_candidate_insights(candidate_id: int):
+async def generate_candidate_insights(candidate_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint para visualizar insights en la UI de React.
+
+    La lectura del candidato usa la sesión asíncrona: antes un `SessionLocal()`
+    síncrono bloqueaba el event loop (y con él todas las requests) mientras
+    esperaba a Postgres.
     """
-    db = SessionLocal()
-    try:
-        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    finally:
-        db.close()
+    candidate = await db.get(Candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     candidate_dict = {
         "summary": candidate.summary,
-        "skills": candidate.skills.split(",") if candidate.skills else [],
+        "skills": normalize_skills(candidate.skills),
         "experience": []
     } 
     
@@ -0,0 +1,176 @@
+from array import array
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.db.database import get_db
+from app.db.models.candidate import Candidate
+from app.db.models.saved_search import SavedSearch, SavedSearchMatch
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchRead, SavedSearchFeed
+from app.api.v1.search import search_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/saved_searches", tags=["Saved Searches"])
+
+
+def _save(db: Session, saved_search: SavedSearch) -> SavedSearch:
+    db.add(saved_search)
+    db.commit()
+    db.refresh(saved_search)
+    return saved_search
+
+@router.post("/",
+    response_model=SavedSearchRead,
+    status_code=201,
+    responses={
+        201: {"description": "Saved search created"},
+        422: {"description": "Validation error"},
+        500: {"description": "Internal server error"}
+    },
+    summary="Guarda una búsqueda",
+    description="Guarda la búsqueda con su embedding precalculado; el ETL registra los candidatos nuevos que la cumplen"
+)
+async def create_saved_search(params: SavedSearchCreate, db: Session = Depends(get_db)):
+    """Guarda una búsqueda con su embedding de query.
+
+    El embedding se calcula una sola vez aquí; a partir de entonces las
+    coincidencias las produce el ETL sin tráfico de búsqueda.
+
+    Args:
+        params (SavedSearchCreate): Dueño, nombre, query, umbral y filtros
+        db (Session): Sesión de base de datos
+
+    Raises:
+        HTTPException: Status 500 error generando el embedding o guardando
+
+    Returns:
+        SavedSearchRead: Búsqueda guardada
+    """
+    try:
+        vector = await search_service.embed_query(params.query)
+        saved_search = SavedSearch(
+            **params.model_dump(),
+            query_vector=array("f", vector).tobytes()
+        )
+        saved_search = await run_in_threadpool(_save, db, saved_search)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error guardando búsqueda: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error: {str(e)}."
+        )
+
+    logger.info("Búsqueda guardada", extra={"saved_search_id": saved_search.id, "owner": saved_search.owner})
+    return saved_search
+
+@router.get("/",
+    response_model=list[SavedSearchRead],
+    responses={
+        200: {"description": "Saved searches"},
+        422: {"description": "Invalid query parameters"}
+    },
+    summary="Lista búsquedas guardadas",
+    description="Lista las búsquedas guardadas de un reclutador"
+)
+def list_saved_searches(owner: str = Query(..., min_length=1), db: Session = Depends(get_db)):
+    return db.scalars(
+        select(SavedSearch).where(SavedSearch.owner == owner).order_by(SavedSearch.id)
+    ).all()
+
+@router.delete("/{saved_search_id}",
+    status_code=204,
+    responses={
+        204: {"description": "Saved search deleted"},
+        404: {"description": "Saved search not found"}
+    },
+    summary="Elimina una búsqueda guardada",
+    description="Elimina la búsqueda guardada y sus coincidencias"
+)
+def delete_saved_search(saved_search_id: int, db: Session = Depends(get_db)):
+    saved_search = db.get(SavedSearch, saved_search_id)
+    if saved_search is None:
+        raise HTTPException(status_code=404, detail="Búsqueda guardada no encontrada")
+
+    # Las coincidencias se borran con el ON DELETE CASCADE de saved_search_matches
+    db.delete(saved_search)
+    db.commit()
+    return Response(status_code=204)
+
+@router.get("/{saved_search_id}/matches",
+    response_model=SavedSearchFeed,
+    responses={
+        200: {"description": "New matches for the saved search"},
+        404: {"description": "Saved search not found"},
+        422: {"description": "Invalid query parameters"}
+    },
+    summary="Coincidencias nuevas de una búsqueda guardada",
+    description="Candidatos indexados que superan el umbral de la búsqueda, de más reciente a más antiguo"
+)
+def saved_search_matches(
+    saved_search_id: int,
+    unseen_only: bool = Query(True, description="Solo coincidencias no marcadas como vistas"),
+    limit: int = Query(50, ge=1, le=200, description="Número máximo de resultados"),
+    db: Session = Depends(get_db)
+):
+    """Feed de coincidencias registradas por el ETL (sin consultar Cohere ni Qdrant).
+
+    Args:
+        saved_search_id (int): ID de la búsqueda guardada
+        unseen_only (bool): Excluir las ya vistas
+        limit (int): Número máximo de resultados
+        db (Session): Sesión de base de datos
+
+    Raises:
+        HTTPException: Status 404 búsqueda guardada no encontrada
+
+    Returns:
+        dict: ID de la búsqueda, total y coincidencias con el nombre del candidato
+    """
+    if db.get(SavedSearch, saved_search_id) is None:
+        raise HTTPException(status_code=404, detail="Búsqueda guardada no encontrada")
+
+    query = (
+        select(
+            SavedSearchMatch.candidate_id,
+            Candidate.name,
+            SavedSearchMatch.score,
+            SavedSearchMatch.seen,
+            SavedSearchMatch.matched_at
+        )
+        .join(Candidate, Candidate.id == SavedSearchMatch.candidate_id)
+        .where(SavedSearchMatch.saved_search_id == saved_search_id)
+        .order_by(SavedSearchMatch.matched_at.desc(), SavedSearchMatch.score.desc())
+        .limit(limit)
+    )
+    if unseen_only:
+        query = query.where(SavedSearchMatch.seen.is_(False))
+
+    results = [dict(row) for row in db.execute(query).mappings().all()]
+    return {
+        "saved_search_id": saved_search_id,
+        "total_results": len(results),
+        "results": results
+    }
+
+@router.post("/{saved_search_id}/matches/seen",
+    responses={
+        200: {"description": "Matches marked as seen"},
+        404: {"description": "Saved search not found"}
+    },
+    summary="Marca las coincidencias como vistas",
+    description="Marca como vistas todas las coincidencias pendientes de la búsqueda guardada"
+)
+def mark_matches_seen(saved_search_id: int, db: Session = Depends(get_db)):
+    if db.get(SavedSearch, saved_search_id) is None:
+        raise HTTPException(status_code=404, detail="Búsqueda guardada no encontrada")
+
+    result = db.execute(
+        update(SavedSearchMatch)
+        .where(SavedSearchMatch.saved_search_id == saved_search_id, SavedSearchMatch.seen.is_(False))
+        .values(seen=True)
+    )
+    db.commit()
+    return {"saved_search_id": saved_search_id, "marked": result.rowcount}
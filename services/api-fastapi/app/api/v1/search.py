@@ -1,17 +1,72 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.schemas.search import SearchRequest, SearchResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.search import (
+    SearchRequest, SearchResponse, SearchBatchRequest, SearchBatchResponse,
+    SimilarBatchRequest, SimilarBatchResponse, RecommendRequest
+)
 from app.core.config import settings
+from app.core import similar_cache, search_cursor
+from app.core.hydration import hydrate_hits
+from app.db.database import get_async_db
+
+from pipelines.utils.search_service import AsyncSearchService, SEARCH_TUNING_FIELDS
+from pipelines.utils.timing import LATENCY_HISTOGRAMS, RequestTimings, current_timings, start_timings, timed
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse que mide su serialización como fase `serialize`.
+
+    Si el endpoint publicó su medición (`_publish_timings`), al terminar de
+    serializar la suma a los histogramas de latencia de ese endpoint.
+    """
+
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            body = super().render(content)
+        timings = current_timings()
+        if timings is not None and timings.endpoint:
+            LATENCY_HISTOGRAMS.observe(timings.endpoint, timings)
+        return body
 
-from pipelines.utils.search_service import SearchService
 
-router = APIRouter(prefix="/semantic_search", tags=["search"])
+router = APIRouter(prefix="/semantic_search", tags=["search"], default_response_class=TimedORJSONResponse)
 
-search_service = SearchService(
-    qdrant_url=settings.QDRANT_URL
+search_service = AsyncSearchService(
+    qdrant_url=settings.QDRANT_URL,
+    redis_url=settings.REDIS_URL
 )
+
+
+async def _hydrate(
+    db: AsyncSession, hit_lists: list[list[dict]], background_tasks: BackgroundTasks
+) -> list[list[dict]]:
+    """Hidrata los hits con Postgres sin bloquear el event loop (sesión asíncrona)."""
+    with timed("hydrate"):
+        return await hydrate_hits(db, hit_lists, background_tasks)
+
+
+def _publish_timings(endpoint: str, data: dict, timings: RequestTimings, response: Response, debug: bool = False) -> dict:
+    """Publica el desglose de latencia y retorna `data` para que FastAPI lo valide y serialice.
+
+    El desglose va en la cabecera Server-Timing y, con `debug`, en el campo
+    `timings` (ambos sin `serialize`, que ocurre después); los histogramas
+    por fase se alimentan tras serializar, con `serialize` incluido.
+    """
+    if debug:
+        data["timings"] = timings.as_dict()
+    response.headers["Server-Timing"] = timings.server_timing()
+    timings.endpoint = endpoint
+    return data
+
+
+def _tuning(search_params: SearchRequest) -> dict:
+    """Parámetros de precisión/latencia indicados en la request (el resto viene del entorno)."""
+    return search_params.model_dump(include=set(SEARCH_TUNING_FIELDS), exclude_none=True)
  
 @router.post("/",
     response_model=SearchResponse,
+    response_model_exclude_unset=True,
     responses={
         200: {"description": "Candidate search results"},
         422: {"description": "Invalid query parameters"},
@@ -20,11 +75,19 @@ search_service = SearchService(
     summary="Realiza búsqueda semántica de candidatos",
     description="Realiza búsqueda semántica de candidatos filtrando por query, limit, score_threshold, skills_filter y name_filter"
 )
-def semantic_search(search_params: SearchRequest):
+async def semantic_search(
+    search_params: SearchRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Realiza búsqueda semántica de candidatos.
 
     Args:
         search_params (SearchRequest): Esquema de la Request (query, limit ...)
+        response (Response): Response HTTP (para escribir Server-Timing)
+        background_tasks (BackgroundTasks): Limpieza de vectores huérfanos tras responder
+        db (AsyncSession): Sesión de base de datos (solo se usa con hydrate=true)
 
     Raises:
         HTTPException: Status 500 busqueda no se pudo realizar o error del servidor
@@ -32,30 +95,240 @@ def semantic_search(search_params: SearchRequest):
     Returns:
         dict: Datos de query, total de resultados y resultados de perfiles
     """
+    timings = start_timings()
     try:
-        results = search_service.search(
+        if search_params.paginate:
+            data = await _first_page(search_params, db, background_tasks)
+            return _publish_timings("search", data, timings, response, search_params.debug)
+
+        results = await search_service.search(
             query_text=search_params.query,
             limit=search_params.limit,
             score_threshold=search_params.score_threshold,
             skills_filter=search_params.skills_filter,
-            name_filter=search_params.name_filter
+            name_filter=search_params.name_filter,
+            fields=search_params.fields,
+            tuning=_tuning(search_params)
         )
+        if search_params.hydrate:
+            [results] = await _hydrate(db, [results], background_tasks)
         
-        return {
+        data = {
             "query": search_params.query,
             "total_results": len(results),
-            "results": results
+            "results": results,
+            "next_cursor": None,
+            "score_type": search_service.score_type(search_params.query, search_params.skills_filter)
         }
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error: {str(e)}."
         )
+    return _publish_timings("search", data, timings, response, search_params.debug)
+
+
+async def _first_page(search_params: SearchRequest, db: AsyncSession, background_tasks: BackgroundTasks) -> dict:
+    """Primera página paginada: precalcula la ventana y crea el cursor."""
+    query_vector = await search_service.embed_query(search_params.query)
+    window = await search_service.search(
+        query_text=search_params.query,
+        limit=search_params.limit * search_cursor.SEARCH_PREFETCH_PAGES,
+        score_threshold=search_params.score_threshold,
+        skills_filter=search_params.skills_filter,
+        name_filter=search_params.name_filter,
+        query_vector=query_vector,
+        fields=search_params.fields,
+        tuning=_tuning(search_params)
+    )
+    results = window[:search_params.limit]
+
+    next_cursor = None
+    if len(window) > search_params.limit:
+        next_cursor = await search_cursor.create_cursor(
+            {
+                "query": search_params.query,
+                "limit": search_params.limit,
+                "score_threshold": search_params.score_threshold,
+                "skills_filter": search_params.skills_filter,
+                "name_filter": search_params.name_filter,
+                "fields": search_params.fields,
+                "hydrate": search_params.hydrate,
+                "tuning": _tuning(search_params)
+            },
+            query_vector,
+            window
+        )
+    if search_params.hydrate:
+        [results] = await _hydrate(db, [results], background_tasks)
+
+    return {
+        "query": search_params.query,
+        "total_results": len(results),
+        "results": results,
+        "next_cursor": next_cursor,
+        "score_type": search_service.score_type(search_params.query, search_params.skills_filter)
+    }
+
+
+@router.get("/next",
+    response_model=SearchResponse,
+    response_model_exclude_unset=True,
+    responses={
+        200: {"description": "Next page of a paginated search"},
+        400: {"description": "Malformed cursor"},
+        410: {"description": "Cursor expired"},
+        500: {"description": "Internal server error"}
+    },
+    summary="Siguiente página de una búsqueda semántica",
+    description="Sirve la página indicada por next_cursor desde la ventana precalculada o, más allá de ella, consultando Qdrant con offset"
+)
+async def semantic_search_next(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    cursor: str = Query(..., min_length=1),
+    debug: bool = Query(False, description="Incluir el desglose de latencia por fase en `timings`"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retorna la página siguiente de una búsqueda paginada.
+
+    Args:
+        cursor (str): Token `next_cursor` de la página anterior
+        response (Response): Response HTTP (para escribir Server-Timing)
+        debug (bool): Incluir `timings` en la respuesta
+        background_tasks (BackgroundTasks): Limpieza de vectores huérfanos tras responder
+        db (AsyncSession): Sesión de base de datos (solo si la búsqueda pidió hydrate)
+
+    Raises:
+        HTTPException: Status 400 cursor mal formado
+        HTTPException: Status 410 cursor expirado
+        HTTPException: Status 500 error del servidor
+
+    Returns:
+        dict: Resultados de la página y next_cursor (None en la última página)
+    """
+    timings = start_timings()
+    decoded = search_cursor.decode_cursor(cursor)
+    if decoded is None:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    cursor_id, offset = decoded
+
+    state = await search_cursor.load_cursor(cursor_id)
+    if state is None:
+        raise HTTPException(status_code=410, detail="Cursor expirado, repite la búsqueda")
+
+    limit, window = state["limit"], state["window"]
+
+    try:
+        if offset < len(window) or state["window_complete"]:
+            results = window[offset:offset + limit]
+            has_more = offset + limit < len(window) or not state["window_complete"]
+        else:
+            # Más allá de la ventana: Qdrant con offset y el vector ya calculado
+            results = await search_service.search(
+                query_text=state["query"],
+                limit=limit,
+                score_threshold=state["score_threshold"],
+                skills_filter=state["skills_filter"],
+                name_filter=state["name_filter"],
+                offset=offset,
+                query_vector=state["vector"],
+                fields=state.get("fields"),
+                tuning=state.get("tuning")
+            )
+            has_more = len(results) == limit
+
+        if state.get("hydrate"):
+            [results] = await _hydrate(db, [results], background_tasks)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error: {str(e)}."
+        )
+
+    return _publish_timings("search_next", {
+        "query": state["query"],
+        "total_results": len(results),
+        "results": results,
+        "next_cursor": search_cursor.encode_cursor(cursor_id, offset + limit) if has_more else None,
+        "score_type": search_service.score_type(state["query"], state["skills_filter"])
+    }, timings, response, debug)
         
+@router.post("/batch",
+    response_model=SearchBatchResponse,
+    response_model_exclude_unset=True,
+    responses={
+        200: {"description": "Results for each query, in request order"},
+        422: {"description": "Invalid request body"}
+    },
+    summary="Búsqueda semántica en lote",
+    description="Ejecuta varias búsquedas con un solo embed batch y una sola consulta batch a Qdrant; los errores se reportan por query"
+)
+async def semantic_search_batch(
+    params: SearchBatchRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Realiza varias búsquedas semánticas en una sola request.
+
+    Args:
+        params (SearchBatchRequest): Lista de SearchRequest
+        response (Response): Response HTTP (para escribir Server-Timing)
+        background_tasks (BackgroundTasks): Limpieza de vectores huérfanos tras responder
+        db (AsyncSession): Sesión de base de datos (solo para queries con hydrate=true)
+
+    Returns:
+        dict: Resultados por query en el orden recibido; las queries que fallan
+        llevan `error` sin afectar al resto del lote
+    """
+    timings = start_timings()
+    outcomes = await search_service.search_batch([
+        {
+            "query_text": q.query,
+            "limit": q.limit,
+            "score_threshold": q.score_threshold,
+            "skills_filter": q.skills_filter,
+            "name_filter": q.name_filter,
+            "fields": q.fields,
+            "tuning": _tuning(q)
+        }
+        for q in params.queries
+    ])
+
+    # Una sola consulta a Postgres para todos los hits de las queries con hydrate
+    to_hydrate = [i for i, q in enumerate(params.queries) if q.hydrate and "results" in outcomes[i]]
+    if to_hydrate:
+        try:
+            hydrated = await _hydrate(db, [outcomes[i]["results"] for i in to_hydrate], background_tasks)
+            for i, results in zip(to_hydrate, hydrated):
+                outcomes[i] = {"results": results}
+        except Exception as e:
+            for i in to_hydrate:
+                outcomes[i] = {"error": f"Error hidratando resultados: {str(e)}"}
+
+    items = []
+    for q, outcome in zip(params.queries, outcomes):
+        results = outcome.get("results", [])
+        items.append({
+            "query": q.query,
+            "total_results": len(results),
+            "results": results,
+            "score_type": search_service.score_type(q.query, q.skills_filter) if "results" in outcome else None,
+            "error": outcome.get("error")
+        })
+
+    return _publish_timings("search_batch", {
+        "total_queries": len(items),
+        "failed": sum(1 for item in items if item["error"] is not None),
+        "results": items
+    }, timings, response)
+
 @router.get("/similar/{candidate_id}",
     response_model=SearchResponse,
     responses={
         200: {"description": "Candidate search results"},
+        304: {"description": "Not modified since the index version in If-None-Match (not with hydrate=true)"},
         422: {"description": "Invalid query parameters"},
         404: {"description": "Candidate not found"},
         500: {"description": "Internal server error"}
@@ -63,17 +336,32 @@ def semantic_search(search_params: SearchRequest):
     summary="Realiza búsqueda semántica de candidatos",
     description="Realiza búsqueda semántica de candidatos filtrando por query, limit, score_threshold, skills_filter y name_filter"
 )
-def search_similar(
+async def search_similar(
     candidate_id: int,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     limit: int = Query(5, ge=1, le=50),
-    score_threshold: float = Query(0.0, ge=0.0, le=1.0)
+    score_threshold: float = Query(0.0, ge=0.0, le=1.0),
+    hydrate: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Encuentra candidatos similares a uno existente.
 
+    La respuesta se cachea en Redis por versión del índice y lleva un ETag
+    derivado de esa versión, así el navegador puede revalidar con If-None-Match.
+    Con hydrate=true no hay ETag ni 304: los datos de Postgres cambian (PATCH)
+    sin que cambie la versión del índice, así que se hidratan en cada request.
+
     Args:
         candidate_id (int): Identificador del candidato
+        request (Request): Request HTTP (para leer If-None-Match)
+        response (Response): Response HTTP (para escribir ETag y Cache-Control)
+        background_tasks (BackgroundTasks): Limpieza de vectores huérfanos tras responder
         limit (int, optional): Limite de perfiles encontrados. Defaults to Query(5, ge=1, le=50).
         score_threshold (float, optional): Puntaje de proximidad o similitud. Defaults to Query(0.0, ge=0.0, le=1.0).
+        hydrate (bool, optional): Adjuntar el registro completo de cada candidato. Defaults to False.
+        db (AsyncSession): Sesión de base de datos (solo se usa con hydrate=true)
 
     Raises:
         HTTPException: Status 404 de candidato no encontrado en qdrant
@@ -82,8 +370,23 @@ def search_similar(
     Returns:
         dict: Un diccionario de los datos del resultado de candidatos similares
     """
+    version = await similar_cache.get_index_version()
+
+    if version is not None:
+        if not hydrate:
+            etag = similar_cache.similar_etag(candidate_id, limit, score_threshold, version)
+            cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+            if similar_cache.etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
+
+            response.headers.update(cache_headers)
+
+        if cached := await similar_cache.get_cached_similar(candidate_id, limit, score_threshold, version):
+            return await _hydrated_response(db, cached, background_tasks) if hydrate else cached
+
     try:
-        results = search_service.find_similar(
+        results = await search_service.find_similar(
             candidate_id=candidate_id,
             limit=limit,
             score_threshold=score_threshold
@@ -95,16 +398,192 @@ def search_similar(
                 detail=f"Candidate with ID {candidate_id} not found in Qdrant"
             )
 
-        return {
+        response_data = {
             "query": f"Similares al candidato",
             "total_results": len(results),
             "results": results
         }
 
+        if version is not None:
+            await similar_cache.set_cached_similar(candidate_id, limit, score_threshold, version, response_data)
+
+        return await _hydrated_response(db, response_data, background_tasks) if hydrate else response_data
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error: {str(e)}"
+        )
+
+
+
+async def _hydrated_response(db: AsyncSession, data: dict, background_tasks: BackgroundTasks) -> dict:
+    """Copia de una respuesta de similares con los hits hidratados (la caché guarda la versión sin hidratar)."""
+    [results] = await _hydrate(db, [data["results"]], background_tasks)
+    return {**data, "total_results": len(results), "results": results}
+
+@router.post("/recommend",
+    response_model=SearchResponse,
+    response_model_exclude_unset=True,
+    responses={
+        200: {"description": "Candidates similar to the positive examples"},
+        404: {"description": "Some example candidate is not indexed"},
+        422: {"description": "Invalid request body"},
+        500: {"description": "Internal server error"}
+    },
+    summary="Candidatos parecidos a varios ejemplos",
+    description="Recomendación en Qdrant a partir de IDs positivos y negativos (average_vector, best_score o sum_scores), excluyendo los ejemplos"
+)
+async def recommend_candidates(
+    params: RecommendRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Busca "más candidatos como estos" en una sola consulta a Qdrant.
+
+    Args:
+        params (RecommendRequest): IDs positivos/negativos, estrategia, limit y filtros
+        response (Response): Response HTTP (para escribir Server-Timing)
+        background_tasks (BackgroundTasks): Limpieza de vectores huérfanos tras responder
+        db (AsyncSession): Sesión de base de datos (solo se usa con hydrate=true)
+
+    Raises:
+        HTTPException: Status 404 algún ejemplo no está indexado
+        HTTPException: Status 500 error del servidor
+
+    Returns:
+        dict: Datos de query, total de resultados y resultados de perfiles
+    """
+    timings = start_timings()
+    try:
+        results = await search_service.recommend(
+            positive_ids=params.positive_ids,
+            negative_ids=params.negative_ids,
+            strategy=params.strategy,
+            limit=params.limit,
+            score_threshold=params.score_threshold,
+            skills_filter=params.skills_filter,
+            name_filter=params.name_filter,
+            fields=params.fields
+        )
+        if results is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Some example candidate is not indexed in Qdrant"
+            )
+        if params.hydrate:
+            [results] = await _hydrate(db, [results], background_tasks)
     except HTTPException:
         raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error: {str(e)}."
+        )
+
+    return _publish_timings("recommend", {
+        "query": f"Similares a {len(params.positive_ids)} candidatos",
+        "total_results": len(results),
+        "results": results,
+        "next_cursor": None
+    }, timings, response)
+
+@router.post("/similar/batch",
+    response_model=SimilarBatchResponse,
+    responses={
+        200: {"description": "Similar candidates for each requested candidate"},
+        422: {"description": "Invalid request body"},
+        500: {"description": "Internal server error"}
+    },
+    summary="Búsqueda de candidatos similares en lote",
+    description="Encuentra candidatos similares para varios candidatos con una sola consulta batch a Qdrant"
+)
+async def search_similar_batch(params: SimilarBatchRequest):
+    """Encuentra candidatos similares para varios candidatos a la vez.
+
+    Args:
+        params (SimilarBatchRequest): IDs de referencia, limit y score_threshold
+
+    Raises:
+        HTTPException: status 500 error por parte del servidor
+
+    Returns:
+        dict: Resultados por candidato en el orden recibido (found=False si no está indexado)
+    """
+    try:
+        similar = await search_service.find_similar_batch(
+            candidate_ids=params.candidate_ids,
+            limit=params.limit,
+            score_threshold=params.score_threshold
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    items = []
+    for candidate_id in dict.fromkeys(params.candidate_ids):
+        results = similar.get(candidate_id)
+        items.append({
+            "candidate_id": candidate_id,
+            "found": results is not None,
+            "total_results": len(results or []),
+            "results": results or []
+        })
+
+    return {
+        "total_candidates": len(items),
+        "results": items
+    }
+
+
+@router.get("/cache/stats",
+    responses={
+        200: {"description": "Query embedding cache metrics"}
+    },
+    summary="Métricas de la caché de embeddings de queries",
+    description="Retorna hits por nivel (LRU/Redis), misses, hit ratio y latencia ahorrada"
+)
+async def query_cache_stats():
+    """Expone las métricas de la caché de embeddings de queries.
+
+    Returns:
+        dict: Hits por nivel, misses, hit ratio y latencia ahorrada en ms
+    """
+    return search_service.query_cache.stats()
+
+
+@router.get("/embedder/stats",
+    responses={
+        200: {"description": "Query embedding micro-batching metrics"}
+    },
+    summary="Métricas del micro-batching de embeddings de queries",
+    description="Retorna requests, deduplicados, llamadas al proveedor y tamaño medio de lote"
+)
+async def query_embedder_stats():
+    """Expone las métricas del agrupador de embeddings de queries.
+
+    Returns:
+        dict: Requests recibidas, deduplicadas, llamadas al proveedor y tamaño medio de lote
+    """
+    return search_service.query_embedder.stats()
+
+
+@router.get("/timing/stats",
+    responses={
+        200: {"description": "Search latency histograms per phase"}
+    },
+    summary="Histogramas de latencia de la búsqueda por fase",
+    description="Retorna, por endpoint y fase (canonicalize, cache_lookup, embed, qdrant, hydrate, serialize, total), conteo, media, p50/p95/p99 y buckets"
+)
+async def search_timing_stats():
+    """Expone los histogramas de latencia alimentados por Server-Timing.
+
+    Returns:
+        dict: endpoint -> fase -> conteo, media, cuantiles y buckets en ms
+    """
+    return LATENCY_HISTOGRAMS.stats()
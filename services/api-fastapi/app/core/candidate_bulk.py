@@ -0,0 +1,106 @@
+"""
+Alta/actualización masiva de candidatos (`POST /v1/candidate/bulk`).
+
+Los imports de onboarding llamaban a `POST /v1/candidate/` una vez por
+candidato: un commit y un job `single_index` (una llamada a Cohere) por fila.
+Ahora el lote se escribe con un único
+
+    INSERT ... VALUES (...), (...) ON CONFLICT (email) DO UPDATE ... RETURNING id
+
+y se encola un solo job `batch_index` con todos los IDs afectados.
+
+Un conflicto en una fila haría fallar el lote entero, así que antes del
+INSERT se detectan y se reportan por fila (y se excluyen):
+- email o teléfono repetido dentro del mismo lote
+- teléfono ya registrado por otro candidato (distinto email)
+
+En una actualización los campos opcionales omitidos o vacíos conservan el
+valor existente (las columnas son NOT NULL, así que en un alta se guardan vacíos).
+"""
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.models.candidate import Candidate
+from app.schemas.candidate import CandidateCreate
+
+UPSERT_FIELDS = [name for name in CandidateCreate.model_fields if name != "email"]
+
+
+def _conflict(index: int, email: str, detail: str) -> dict:
+    return {"index": index, "email": email, "detail": detail}
+
+
+def find_conflicts(db: Session, candidates: list[CandidateCreate]) -> tuple[list[tuple[int, CandidateCreate]], list[dict]]:
+    """Separa las filas insertables de las que chocarían con otra fila o con la DB.
+
+    Returns:
+        (filas válidas con su posición en el lote, conflictos por fila)
+    """
+    emails = {c.email for c in candidates}
+    phones = {c.phone for c in candidates}
+    existing = db.execute(
+        select(Candidate.email, Candidate.phone).where(
+            or_(Candidate.email.in_(emails), Candidate.phone.in_(phones))
+        )
+    ).all()
+    phone_owner = {phone: email for email, phone in existing}
+
+    accepted, conflicts = [], []
+    seen_emails, seen_phones = {}, {}
+    for index, candidate in enumerate(candidates):
+        if candidate.email in seen_emails:
+            conflicts.append(_conflict(index, candidate.email, f"Email repetido en el lote (fila {seen_emails[candidate.email]})"))
+        elif candidate.phone in seen_phones:
+            conflicts.append(_conflict(index, candidate.email, f"Teléfono repetido en el lote (fila {seen_phones[candidate.phone]})"))
+        elif phone_owner.get(candidate.phone, candidate.email) != candidate.email:
+            conflicts.append(_conflict(index, candidate.email, "El teléfono ya está registrado en el sistema"))
+        else:
+            seen_emails[candidate.email] = index
+            seen_phones[candidate.phone] = index
+            accepted.append((index, candidate))
+    return accepted, conflicts
+
+
+def upsert_candidates(db: Session, candidates: list[CandidateCreate]) -> dict:
+    """Inserta o actualiza (por email) el lote en un único statement.
+
+    Args:
+        db: Sesión de base de datos
+        candidates: Candidatos validados
+
+    Returns:
+        dict: IDs creados, IDs actualizados y conflictos por fila
+    """
+    accepted, conflicts = find_conflicts(db, candidates)
+    if not accepted:
+        return {"created": [], "updated": [], "conflicts": conflicts}
+
+    existing_emails = set(db.scalars(
+        select(Candidate.email).where(Candidate.email.in_([c.email for _, c in accepted]))
+    ))
+
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Candidate).values([
+        {name: "" if value is None else value for name, value in c.model_dump().items()}
+        for _, c in accepted
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Candidate.email],
+        set_={
+            **{
+                name: func.coalesce(func.nullif(stmt.excluded[name], ""), getattr(Candidate, name))
+                for name in UPSERT_FIELDS
+            },
+            "updated_at": func.now()
+        }
+    ).returning(Candidate.id, Candidate.email)
+
+    ids_by_email = {email: candidate_id for candidate_id, email in db.execute(stmt).all()}
+    db.commit()
+
+    created, updated = [], []
+    for _, c in accepted:
+        (updated if c.email in existing_emails else created).append(ids_by_email[c.email])
+    return {"created": created, "updated": updated, "conflicts": conflicts}
@@ -0,0 +1,77 @@
+"""
+Caché read-through del detalle de candidato (`GET /v1/candidate/{id}`).
+
+Las vistas de perfil superan con mucho a las ediciones, pero cada vista
+consultaba Postgres. Ahora el CandidateRead ya serializado (bytes de orjson)
+se guarda en un hash de Redis junto con su ETag, derivado de `updated_at`:
+
+- Hit: se responde con los bytes tal cual, sin Postgres ni validación Pydantic.
+- If-None-Match con el ETag vigente: 304 sin tocar Postgres.
+- Crear, actualizar o eliminar el candidato borra la entrada tras el commit.
+
+El TTL acota la ventana en la que una lectura concurrente con una edición
+podría volver a guardar la versión anterior. Si Redis no está disponible se
+lee de Postgres como antes.
+"""
+from datetime import datetime
+import logging
+
+import orjson
+
+from app.core.redis import get_redis_bytes_client
+from app.schemas.candidate import CandidateRead
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_CACHE_TTL = 3600
+
+
+def _cache_key(candidate_id: int) -> str:
+    return f"candidate:{candidate_id}"
+
+
+def candidate_etag(candidate_id: int, updated_at: datetime) -> str:
+    """ETag fuerte: cambia con cada escritura porque `updated_at` se actualiza en cada UPDATE."""
+    return f'"{candidate_id}-{int(updated_at.timestamp() * 1_000_000)}"'
+
+
+def serialize_candidate(candidate) -> tuple[str, bytes]:
+    """Serializa el candidato como CandidateRead y calcula su ETag."""
+    data = CandidateRead.model_validate(candidate)
+    return candidate_etag(data.id, data.updated_at), orjson.dumps(data.model_dump(mode="json"))
+
+
+def get_cached_candidate(candidate_id: int) -> tuple[str, bytes] | None:
+    """Retorna (etag, body) cacheados o None si no hay entrada o Redis no responde."""
+    try:
+        etag, body = get_redis_bytes_client().hmget(_cache_key(candidate_id), ["etag", "body"])
+    except Exception as e:
+        logger.warning("Error recuperando caché de candidato: %s", str(e))
+        return None
+    if etag is None or body is None:
+        return None
+    return etag.decode(), body
+
+
+def set_cached_candidate(candidate_id: int, etag: str, body: bytes) -> None:
+    try:
+        pipe = get_redis_bytes_client().pipeline()
+        pipe.hset(_cache_key(candidate_id), mapping={"etag": etag, "body": body})
+        pipe.expire(_cache_key(candidate_id), CANDIDATE_CACHE_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Error guardando caché de candidato: %s", str(e))
+
+
+def invalidate_candidate(candidate_id: int) -> None:
+    invalidate_candidates([candidate_id])
+
+
+def invalidate_candidates(candidate_ids: list[int]) -> None:
+    """Borra las entradas de varios candidatos con un solo DEL."""
+    if not candidate_ids:
+        return
+    try:
+        get_redis_bytes_client().delete(*(_cache_key(cid) for cid in candidate_ids))
+    except Exception as e:
+        logger.warning("Error invalidando caché de candidato: %s", str(e))
@@ -0,0 +1,167 @@
+"""
+Exportación completa de candidatos en streaming (CSV, NDJSON o Parquet).
+
+El export nocturno para analítica llamaba a `list_candidates`, que
+materializaba toda la tabla. Aquí ningún formato retiene más de un bloque:
+
+- CSV: en Postgres, `COPY (SELECT ...) TO STDOUT` en un hilo que escribe en una
+  cola acotada; la respuesta consume la cola, así que si el cliente lee lento
+  COPY se detiene (backpressure) en lugar de acumular en memoria.
+- NDJSON: cursor del lado del servidor (`stream_ndjson` del listado).
+- Parquet: un row group por bloque del cursor, emitido en cuanto se escribe.
+
+La compresión gzip del transporte la aplica GZipMiddleware cuando el cliente
+envía `Accept-Encoding: gzip`.
+"""
+import csv
+import io
+import queue
+import threading
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.core.candidate_listing import STREAM_CHUNK_ROWS, stream_ndjson
+from app.db.models.candidate import Candidate
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Bloques de COPY en vuelo entre el hilo productor y la respuesta
+COPY_QUEUE_CHUNKS = 64
+_DONE = object()
+
+
+class _QueueWriter:
+    """Archivo de solo escritura para `copy_expert` que entrega los bloques a una cola acotada."""
+
+    def __init__(self, chunks: queue.Queue):
+        self.chunks = chunks
+
+    def write(self, data):
+        self.chunks.put(data.encode() if isinstance(data, str) else bytes(data))
+        return len(data)
+
+
+def _copy_csv(db: Session, query: Select) -> Iterator[bytes]:
+    conn = db.get_bind().raw_connection()
+    chunks = queue.Queue(maxsize=COPY_QUEUE_CHUNKS)
+    errors = []
+
+    def produce():
+        try:
+            cursor = conn.cursor()
+            compiled = query.compile(dialect=db.get_bind().dialect)
+            # mogrify: los filtros del usuario quedan escapados por psycopg2
+            select_sql = cursor.mogrify(compiled.string, compiled.params).decode()
+            cursor.copy_expert(f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv, HEADER)", _QueueWriter(chunks))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            chunks.put(_DONE)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while (chunk := chunks.get()) is not _DONE:
+            yield chunk
+        if errors:
+            raise errors[0]
+    finally:
+        if producer.is_alive():
+            # Cliente desconectado: cancelar COPY y vaciar la cola libera al productor bloqueado en put()
+            conn.dbapi_connection.cancel()
+        while producer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        conn.close()
+
+
+def _cursor_csv(db: Session, query: Select) -> Iterator[bytes]:
+    """CSV desde un cursor del lado del servidor (bases sin COPY, p. ej. SQLite en tests)."""
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=STREAM_CHUNK_ROWS).execute(query)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(result.keys())
+        for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+
+def stream_csv(db: Session, query: Select) -> Iterator[bytes]:
+    if db.get_bind().dialect.name == "postgresql":
+        return _copy_csv(db, query)
+    return _cursor_csv(db, query)
+
+
+class _ParquetSink(io.RawIOBase):
+    """Destino de ParquetWriter que acumula lo escrito hasta que se drena."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_type(column):
+    python_type = column.type.python_type
+    if python_type is int:
+        return pa.int64()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type.__name__ == "datetime":
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+
+def stream_parquet(db: Session, query: Select) -> Iterator[bytes]:
+    """Parquet con un row group por bloque del cursor."""
+    columns = [c.name for c in query.selected_columns]
+    schema = pa.schema([(name, _arrow_type(Candidate.__table__.c[name])) for name in columns])
+    sink = _ParquetSink()
+
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=STREAM_CHUNK_ROWS).execute(query)
+        with pq.ParquetWriter(sink, schema) as writer:
+            for rows in result.partitions():
+                writer.write_table(pa.Table.from_pylist([dict(row._mapping) for row in rows], schema=schema))
+                if data := sink.drain():
+                    yield data
+    # Al cerrar el writer se escribe el footer con los metadatos
+    yield sink.drain()
+
+
+def stream_export(db: Session, query: Select, fmt: str) -> Iterator[bytes]:
+    if fmt == "csv":
+        return stream_csv(db, query)
+    if fmt == "parquet":
+        return stream_parquet(db, query)
+    return stream_ndjson(db, query)
@@ -0,0 +1,98 @@
+"""
+Listado de candidatos con paginación keyset, proyección y streaming.
+
+`GET /v1/candidate/` cargaba la tabla completa en objetos ORM, los validaba
+como CandidateRead y los serializaba en una sola respuesta. Ahora:
+
+- Se seleccionan solo las columnas pedidas (`fields`) como filas planas, sin ORM.
+- Con `limit` o `after_id` se pagina por keyset (`WHERE id > :after_id ORDER BY id LIMIT :limit`): el
+  coste de cada página no crece con la profundidad, a diferencia de OFFSET.
+- En modo streaming las filas se leen con un cursor del lado del servidor
+  (`stream_results`) y se emiten como NDJSON en bloques, en memoria constante.
+
+Sin `limit` ni `after_id` el listado sigue siendo completo, para no romper a
+los clientes que esperan la tabla entera.
+"""
+from typing import Iterator, Optional
+
+import orjson
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.core.skill_facets import skills_clause
+from app.db.models.candidate import Candidate
+from app.schemas.candidate import CandidateRead
+
+CANDIDATE_FIELDS = list(CandidateRead.model_fields)
+
+# Tamaño de página cuando se pasa after_id sin limit
+DEFAULT_PAGE_SIZE = 100
+
+# Filas por lectura del cursor y por bloque escrito en la respuesta NDJSON
+STREAM_CHUNK_ROWS = 500
+
+
+def escape_like(value: str) -> str:
+    """Escapa los comodines de LIKE (`%`, `_`) y el escape `\\` para usar `value` literal."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _contains(value: str) -> str:
+    return f"%{escape_like(value)}%"
+
+
+def build_list_query(
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    is_active: Optional[bool] = None,
+    role: Optional[str] = None,
+    location: Optional[str] = None,
+    skills: Optional[list[str]] = None,
+    dialect: str = "postgresql"
+) -> Select:
+    """Consulta de una página del listado (o del listado completo si `limit` es None).
+
+    Args:
+        after_id: Último ID de la página anterior (0 = desde el principio)
+        limit: Tamaño de página
+        fields: Columnas a retornar; `id` se incluye siempre porque es la clave del keyset
+        is_active: Filtrar por estado
+        role: Filtrar por rol (contiene, sin distinguir mayúsculas)
+        location: Filtrar por ubicación (contiene, sin distinguir mayúsculas)
+        skills: Skills que el candidato debe tener todas (forma canónica, índice GIN)
+        dialect: Dialecto de la sesión; el filtro por skills depende de él
+    """
+    names = ["id", *(f for f in fields if f != "id")] if fields else CANDIDATE_FIELDS
+    query = (
+        select(*(getattr(Candidate, name) for name in names))
+        .where(Candidate.id > after_id)
+        .order_by(Candidate.id)
+    )
+    if is_active is not None:
+        query = query.where(Candidate.is_active.is_(is_active))
+    if role:
+        query = query.where(Candidate.role.ilike(_contains(role), escape="\\"))
+    if location:
+        query = query.where(Candidate.location.ilike(_contains(location), escape="\\"))
+    if skills:
+        query = query.where(skills_clause(skills, dialect))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def fetch_page(db: Session, query: Select) -> list[dict]:
+    return [dict(row) for row in db.execute(query).mappings()]
+
+
+def stream_ndjson(db: Session, query: Select) -> Iterator[bytes]:
+    """Emite las filas como NDJSON leyendo de un cursor del lado del servidor.
+
+    Usa una conexión propia del engine de la sesión: la sesión de la request
+    puede cerrarse antes de que termine de enviarse la respuesta.
+    """
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=STREAM_CHUNK_ROWS).execute(query)
+        for rows in result.mappings().partitions():
+            yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
@@ -0,0 +1,57 @@
+"""
+Actualización parcial de candidatos (`PATCH /v1/candidate/{id}`).
+
+La versión anterior hacía SELECT, asignaba campo a campo, COMMIT y un
+`refresh()` (otro SELECT): tres viajes a Postgres, y encolaba la
+re-indexación aunque no cambiara nada. Ahora se emite un único
+
+    UPDATE candidates SET <campos enviados>, updated_at = now()
+    WHERE id = :id AND (<algún campo enviado> IS DISTINCT FROM <valor>)
+    RETURNING *
+
+Si no retorna fila, el candidato no existe o la petición no cambia nada
+(no-op); solo en ese caso se consulta la fila para distinguir ambos. Un no-op
+no escribe, no mueve `updated_at` (el ETag sigue vigente) y no re-indexa.
+"""
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.candidate import Candidate
+from app.schemas.candidate import CandidateRead, CandidateUpdate
+
+
+def update_changes(candidate: CandidateUpdate) -> dict:
+    """Campos enviados en la petición; un null no borra el valor (las columnas son NOT NULL)."""
+    return {name: value for name, value in candidate.model_dump(exclude_unset=True).items() if value is not None}
+
+
+def patch_candidate(db: Session, candidate_id: int, changes: dict) -> tuple[CandidateRead | None, bool]:
+    """Aplica los cambios con un solo UPDATE ... RETURNING.
+
+    Args:
+        db: Sesión de base de datos
+        candidate_id: ID del candidato
+        changes: Columnas a actualizar (ver `update_changes`)
+
+    Returns:
+        (candidato actual o None si no existe, True si se escribió)
+    """
+    if changes:
+        stmt = (
+            update(Candidate)
+            .where(Candidate.id == candidate_id)
+            .where(or_(*(getattr(Candidate, name).is_distinct_from(value) for name, value in changes.items())))
+            .values(**changes)
+            .returning(Candidate)
+            # populate_existing: si la sesión ya tenía el candidato, se refresca con la fila retornada
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        updated = db.scalars(stmt).one_or_none()
+        if updated is not None:
+            # Se lee la fila antes del commit: tras él la sesión la expira y pedirla sería otro SELECT
+            data = CandidateRead.model_validate(updated)
+            db.commit()
+            return data, True
+
+    current = db.scalars(select(Candidate).where(Candidate.id == candidate_id)).one_or_none()
+    return (CandidateRead.model_validate(current) if current else None), False
@@ -24,6 +24,15 @@ class Settings(BaseSettings):
     # Base de datos
     DATABASE_URL: str = os.getenv("DATABASE_URL")
     QDRANT_URL: str = os.getenv("QDRANT_URL")
+
+    # Pool de conexiones del engine asíncrono (endpoints `async def`)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    # Pool del engine síncrono, más chico: los dos pools suman conexiones por worker
+    DB_SYNC_POOL_SIZE: int = int(os.getenv("DB_SYNC_POOL_SIZE", 5))
+    DB_SYNC_MAX_OVERFLOW: int = int(os.getenv("DB_SYNC_MAX_OVERFLOW", 5))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
     
     # Redis (para encolar jobs al worker Rust)
     REDIS_URL: str = os.getenv("REDIS_URL")
@@ -0,0 +1,66 @@
+"""
+Hidratación de resultados de búsqueda con el registro completo de Postgres.
+
+Tras una búsqueda la UI pedía cada candidato con `GET /v1/candidate/{id}`
+(N+1 sobre HTTP). Con `hydrate=true` los hits se completan con una sola
+consulta `WHERE id = ANY(:ids)` que proyecta solo las columnas de
+CandidateRead. Se conserva el orden por score y se descartan los hits cuyo
+candidato ya no existe: esos vectores huérfanos se eliminan de Qdrant
+encolando delete_point en segundo plano (BackgroundTasks, tras enviar la
+respuesta), un job por huérfano aunque las búsquedas lo sigan devolviendo
+hasta que el worker lo borre (ver `enqueue_delete_points`).
+"""
+import logging
+
+from sqlalchemy import Integer, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.index_queue import enqueue_delete_points
+from app.db.models.candidate import Candidate
+from app.schemas.candidate import CandidateRead
+
+logger = logging.getLogger(__name__)
+
+HYDRATE_COLUMNS = [getattr(Candidate, name) for name in CandidateRead.model_fields]
+
+
+def _ids_condition(db: AsyncSession, ids: list[int]):
+    # Un único parámetro array: el plan de Postgres no depende de cuántos IDs haya
+    if db.get_bind().dialect.name == "postgresql":
+        return Candidate.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return Candidate.id.in_(ids)
+
+
+async def hydrate_hits(
+    db: AsyncSession, hit_lists: list[list[dict]], background_tasks: BackgroundTasks
+) -> list[list[dict]]:
+    """Adjunta el registro del candidato a cada hit con una sola consulta.
+
+    Args:
+        db: Sesión asíncrona de base de datos
+        hit_lists: Listas de resultados de búsqueda (una por query)
+        background_tasks: Tareas de la request (limpieza de vectores huérfanos)
+
+    Returns:
+        Las mismas listas, en el mismo orden, con la clave `candidate` en cada
+        hit y sin los hits cuyo candidato fue eliminado
+    """
+    ids = list({hit["id"] for hits in hit_lists for hit in hits})
+    if not ids:
+        return hit_lists
+
+    result = await db.execute(select(*HYDRATE_COLUMNS).where(_ids_condition(db, ids)))
+    candidates = {row["id"]: dict(row) for row in result.mappings().all()}
+
+    ghosts = [cid for cid in ids if cid not in candidates]
+    if ghosts:
+        logger.warning("Vectores huérfanos descartados al hidratar", extra={"candidate_ids": ghosts})
+        # Función síncrona: Starlette la ejecuta en el threadpool tras enviar la respuesta
+        background_tasks.add_task(enqueue_delete_points, ghosts, requested_by="fastapi:hydrate")
+
+    return [
+        [{**hit, "candidate": candidates[hit["id"]]} for hit in hits if hit["id"] in candidates]
+        for hits in hit_lists
+    ]
@@ -39,6 +39,29 @@ def enqueue_single_index(candidate_id: int, requested_by: str = "fastapi") -> No
         )
 
 
+def enqueue_batch_index(candidate_ids: list[int], requested_by: str = "fastapi") -> None:
+    """Encola un único job para indexar un lote de candidatos (altas/ediciones masivas)."""
+    if not candidate_ids:
+        return
+    payload = {
+        "job_type": "batch_index",
+        "candidate_ids": candidate_ids,
+        "requested_by": requested_by,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        get_redis_client().rpush(settings.REDIS_QUEUE, json.dumps(payload))
+        logger.info(
+            "Job batch_index encolado",
+            extra={"candidates": len(candidate_ids)},
+        )
+    except Exception as e:
+        logger.error(
+            "Error encolando batch_index: %s", str(e),
+            extra={"candidates": len(candidate_ids)},
+        )
+
+
 def enqueue_delete_point(candidate_id: int, requested_by: str = "fastapi") -> None:
     """Encola un job para eliminar el vector de un candidato borrado."""
     payload = {
@@ -58,3 +81,47 @@ def enqueue_delete_point(candidate_id: int, requested_by: str = "fastapi") -> No
             "Error encolando delete_point: %s", str(e),
             extra={"candidate_id": candidate_id},
         )
+
+
+# Un vector huérfano que siguen devolviendo las búsquedas se encola una sola vez
+# por ventana, hasta que el worker lo borra
+DELETE_POINT_PENDING_KEY = "delete_point:pending:{}"
+DELETE_POINT_PENDING_TTL = 60
+
+
+def enqueue_delete_points(candidate_ids: list[int], requested_by: str = "fastapi") -> None:
+    """Encola delete_point para varios vectores huérfanos sin duplicar jobs.
+
+    Cada ID toma una marca `SET NX EX` de DELETE_POINT_PENDING_TTL segundos y
+    solo se encolan los que la obtienen, todos con un único RPUSH.
+    """
+    if not candidate_ids:
+        return
+    try:
+        client = get_redis_client()
+        pipe = client.pipeline(transaction=False)
+        for candidate_id in candidate_ids:
+            pipe.set(DELETE_POINT_PENDING_KEY.format(candidate_id), 1, nx=True, ex=DELETE_POINT_PENDING_TTL)
+        fresh = [cid for cid, acquired in zip(candidate_ids, pipe.execute()) if acquired]
+        if not fresh:
+            return
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        client.rpush(settings.REDIS_QUEUE, *(
+            json.dumps({
+                "job_type": "delete_point",
+                "candidate_id": candidate_id,
+                "requested_by": requested_by,
+                "timestamp": timestamp,
+            })
+            for candidate_id in fresh
+        ))
+        logger.info(
+            "Jobs delete_point encolados",
+            extra={"candidate_ids": fresh},
+        )
+    except Exception as e:
+        logger.error(
+            "Error encolando delete_point: %s", str(e),
+            extra={"candidate_ids": candidate_ids},
+        )
@@ -0,0 +1,80 @@
+"""
+Búsqueda por palabras clave y typeahead sobre Postgres (`GET /v1/candidate/search`).
+
+La búsqueda semántica embebe la query con Cohere y consulta Qdrant: es la
+opción correcta para "perfiles como este", pero demasiado lenta y costosa
+para autocompletar un nombre o un email. Aquí se usan solo índices de Postgres
+(migración b3e81f0c27d5):
+
+- Prefijo: `search_vector @@ to_tsquery('simple', 'ana:* & garc:*')` sobre la
+  columna generada (nombre, headline, skills y summary) con índice GIN.
+- Difuso: `name % q` / `email % q` de pg_trgm con índices GIN trigram, que
+  toleran erratas ("garcai" encuentra "García").
+
+Los resultados se ordenan por el mayor de `ts_rank` y la similitud trigram.
+En otras bases (SQLite en tests) se degrada a un LIKE por contenido, sin ranking.
+"""
+import re
+
+from sqlalchemy import Select, case, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.candidate_listing import escape_like
+from app.db.models.candidate import Candidate
+
+MAX_QUERY_TERMS = 8
+_TERM_RE = re.compile(r"\w+")
+
+SEARCH_SQL = text("""
+SELECT id, name, email, headline, role,
+       greatest(ts_rank(search_vector, query), similarity(name, :q), similarity(email, :q)) AS score
+FROM candidates, to_tsquery('simple', :tsquery) AS query
+WHERE search_vector @@ query OR name % :q OR email % :q
+ORDER BY score DESC, id
+LIMIT :limit
+""")
+
+
+def prefix_tsquery(q: str) -> str:
+    """Convierte el texto del usuario en un tsquery de prefijos ('ana:* & garc:*').
+
+    Solo se conservan caracteres de palabra: el texto nunca llega sin escapar a
+    la sintaxis de tsquery (`&`, `|`, `!`, `:`).
+    """
+    terms = _TERM_RE.findall(q.lower())[:MAX_QUERY_TERMS]
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _fallback_query(q: str, limit: int) -> Select:
+    # `%` y `_` en la query son literales, no comodines
+    escaped = escape_like(q.lower())
+    pattern = f"%{escaped}%"
+    # Sin ranking real: los nombres que empiezan por la query van primero
+    score = case((Candidate.name.ilike(f"{escaped}%", escape="\\"), literal(1.0)), else_=literal(0.5)).label("score")
+    return (
+        select(Candidate.id, Candidate.name, Candidate.email, Candidate.headline, Candidate.role, score)
+        .where(or_(*(column.ilike(pattern, escape="\\") for column in (
+            Candidate.name, Candidate.email, Candidate.headline, Candidate.skills, Candidate.summary
+        ))))
+        .order_by(score.desc(), Candidate.id)
+        .limit(limit)
+    )
+
+
+async def keyword_search(db: AsyncSession, q: str, limit: int) -> list[dict]:
+    """Candidatos que coinciden con `q` por prefijo o de forma difusa.
+
+    Args:
+        db: Sesión asíncrona
+        q: Texto escrito por el usuario
+        limit: Máximo de resultados
+
+    Returns:
+        list[dict]: id, name, email, headline, role y score, de mayor a menor score
+    """
+    q = q.strip()
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(SEARCH_SQL, {"q": q, "tsquery": prefix_tsquery(q), "limit": limit})
+    else:
+        result = await db.execute(_fallback_query(q, limit))
+    return [dict(row._mapping) for row in result]
@@ -1,7 +1,10 @@
 import redis
+import redis.asyncio as aioredis
 from app.core.config import settings
 
 _redis_client: redis.Redis | None = None
+_async_redis_client: aioredis.Redis | None = None
+_redis_bytes_client: redis.Redis | None = None
 
 def get_redis_client() -> redis.Redis:
     """Obtiene o crea una conexión Redis (singleton lazy)."""
@@ -14,3 +17,26 @@ def get_redis_client() -> redis.Redis:
             socket_timeout=5,
         )
     return _redis_client
+
+def get_redis_bytes_client() -> redis.Redis:
+    """Cliente Redis sin decodificación para valores binarios (p. ej. JSON de orjson) (singleton lazy)."""
+    global _redis_bytes_client
+    if _redis_bytes_client is None:
+        _redis_bytes_client = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return _redis_bytes_client
+
+def get_async_redis_client() -> aioredis.Redis:
+    """Obtiene o crea un cliente Redis asíncrono para los endpoints `async def` (singleton lazy)."""
+    global _async_redis_client
+    if _async_redis_client is None:
+        _async_redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return _async_redis_client
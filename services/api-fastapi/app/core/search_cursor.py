@@ -0,0 +1,88 @@
+"""
+Cursores opacos para paginar la búsqueda semántica.
+
+Paginar re-ejecutando la búsqueda con un `limit` mayor obliga a re-embeber la
+query y a pedir a Qdrant todos los resultados anteriores otra vez. Con
+`paginate=true` la primera página guarda en Redis, bajo una clave de TTL corto,
+el vector de la query y una ventana precalculada de SEARCH_PREFETCH_PAGES
+páginas de resultados. Las páginas siguientes se sirven de esa ventana; más
+allá de ella se consulta Qdrant con `offset` reutilizando el vector guardado.
+
+El cursor que ve el cliente es `base64url("{cursor_id}:{offset}")`.
+"""
+from array import array
+import base64
+import binascii
+import json
+import logging
+import secrets
+
+from app.core.redis import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CURSOR_TTL = 300
+SEARCH_PREFETCH_PAGES = 5
+
+
+def encode_cursor(cursor_id: str, offset: int) -> str:
+    """Construye el token opaco de una página."""
+    return base64.urlsafe_b64encode(f"{cursor_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, int] | None:
+    """Extrae (cursor_id, offset) de un token. Retorna None si el token no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        cursor_id, offset = raw.rsplit(":", 1)
+        offset = int(offset)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if not cursor_id or offset < 0:
+        return None
+    return cursor_id, offset
+
+
+def _cursor_key(cursor_id: str) -> str:
+    return f"search:cursor:{cursor_id}"
+
+
+async def create_cursor(params: dict, query_vector: list[float], window: list[dict]) -> str | None:
+    """Guarda el estado de la búsqueda y retorna el cursor de la segunda página.
+
+    Args:
+        params: query, limit, score_threshold, skills_filter y name_filter de la búsqueda
+        query_vector: Embedding de la query
+        window: Resultados precalculados (hasta SEARCH_PREFETCH_PAGES páginas)
+
+    Returns:
+        Token de la página siguiente, o None si Redis no está disponible
+    """
+    cursor_id = secrets.token_urlsafe(12)
+    state = {
+        **params,
+        "vector": base64.b64encode(array("f", query_vector).tobytes()).decode(),
+        "window": window,
+        "window_complete": len(window) < params["limit"] * SEARCH_PREFETCH_PAGES
+    }
+    try:
+        await get_async_redis_client().setex(_cursor_key(cursor_id), SEARCH_CURSOR_TTL, json.dumps(state))
+    except Exception as e:
+        logger.warning("Error guardando cursor de búsqueda: %s", str(e))
+        return None
+    return encode_cursor(cursor_id, params["limit"])
+
+
+async def load_cursor(cursor_id: str) -> dict | None:
+    """Recupera el estado de un cursor y renueva su TTL. Retorna None si expiró."""
+    try:
+        raw = await get_async_redis_client().getex(_cursor_key(cursor_id), ex=SEARCH_CURSOR_TTL)
+    except Exception as e:
+        logger.warning("Error recuperando cursor de búsqueda: %s", str(e))
+        return None
+    if raw is None:
+        return None
+
+    state = json.loads(raw)
+    state["vector"] = array("f", base64.b64decode(state["vector"])).tolist()
+    return state
@@ -0,0 +1,68 @@
+"""
+Caché de resultados de candidatos similares invalidada por versión del índice.
+
+`/semantic_search/similar/{id}` se consulta en cada vista de perfil (widget
+Svelte) y en cada insight (tool del agente LLM), pero la respuesta solo cambia
+cuando cambia el índice de Qdrant. La clave de caché incluye la versión global
+del índice (`index:version`), que el worker Rust y el ETL incrementan en cada
+single_index, delete_point y carga; así una versión nueva invalida todo sin
+borrar entradas. La misma versión se usa para construir el ETag de la respuesta.
+"""
+import json
+import logging
+
+from app.core.redis import get_async_redis_client
+from pipelines.utils.index_version import INDEX_VERSION_KEY
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_CACHE_TTL = 86400
+
+
+async def get_index_version() -> int | None:
+    """Lee la versión actual del índice. Retorna None si Redis no está disponible."""
+    try:
+        value = await get_async_redis_client().get(INDEX_VERSION_KEY)
+        return int(value or 0)
+    except Exception as e:
+        logger.warning("Error leyendo la versión del índice: %s", str(e))
+        return None
+
+
+def similar_etag(candidate_id: int, limit: int, score_threshold: float, version: int) -> str:
+    """ETag débil derivado de los parámetros de la consulta y la versión del índice."""
+    return f'W/"idx{version}-{candidate_id}-{limit}-{score_threshold}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evalúa la cabecera If-None-Match (admite listas y `*`)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _cache_key(candidate_id: int, limit: int, score_threshold: float, version: int) -> str:
+    return f"similar:{version}:{candidate_id}:{limit}:{score_threshold}"
+
+
+async def get_cached_similar(candidate_id: int, limit: int, score_threshold: float, version: int) -> dict | None:
+    """Obtiene la respuesta cacheada para la versión actual del índice."""
+    try:
+        cached = await get_async_redis_client().get(_cache_key(candidate_id, limit, score_threshold, version))
+        return json.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning("Error recuperando caché de similares: %s", str(e))
+        return None
+
+
+async def set_cached_similar(candidate_id: int, limit: int, score_threshold: float, version: int, data: dict) -> None:
+    """Guarda la respuesta; las versiones antiguas expiran solas por TTL."""
+    try:
+        await get_async_redis_client().setex(
+            _cache_key(candidate_id, limit, score_threshold, version),
+            SIMILAR_CACHE_TTL,
+            json.dumps(data)
+        )
+    except Exception as e:
+        logger.warning("Error guardando caché de similares: %s", str(e))
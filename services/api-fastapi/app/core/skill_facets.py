@@ -0,0 +1,117 @@
+"""
+Skills normalizadas y conteos por skill (facetas).
+
+`candidates.skills` es un texto separado por comas que cada consumidor partía
+a su manera (`skills.split(",")` conservaba espacios y mayúsculas), y filtrar
+o contar por skill obligaba a recorrer la tabla parseando texto. Desde la
+migración d8a4c61e09f3:
+
+- `candidates.skill_tags text[]` guarda la forma canónica (minúsculas, sin
+  espacios sobrantes, sin duplicados, ordenada) con un índice GIN. La mantiene
+  un trigger con `normalize_skills()` en cada INSERT o UPDATE de `skills`, así
+  que cubre todas las vías de escritura (ORM, lote, importador con COPY).
+- `candidate_skill_counts` es una vista materializada con los candidatos
+  activos por skill. Las escrituras la marcan como desactualizada en Redis y la
+  siguiente consulta de facetas la refresca en segundo plano con
+  `REFRESH MATERIALIZED VIEW CONCURRENTLY` (sin bloquear a los lectores; como
+  mucho un refresco cada FACETS_REFRESH_INTERVAL segundos).
+
+En otras bases (SQLite en tests) el filtro y los conteos se calculan desde la
+columna de texto con `normalize_skills`, la réplica en Python de la función SQL
+(compartida con el payload `skills` de Qdrant, ver pipelines.utils.skills).
+"""
+from collections import Counter
+import logging
+
+from sqlalchemy import Text, and_, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_async_redis_client, get_redis_client
+from app.db.database import AsyncSessionLocal, async_engine
+from app.db.models.candidate import Candidate
+
+from pipelines.utils.skills import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+FACETS_STALE_KEY = "skill_facets:stale"
+FACETS_REFRESH_LOCK = "skill_facets:refreshing"
+FACETS_REFRESH_INTERVAL = 30
+
+FACETS_SQL = text("""
+SELECT skill, candidates AS count FROM candidate_skill_counts
+WHERE skill LIKE :prefix
+ORDER BY candidates DESC, skill
+LIMIT :limit
+""")
+
+_skill_tags = literal_column("candidates.skill_tags", type_=ARRAY(Text))
+
+
+def skills_clause(skills: list[str], dialect: str):
+    """Condición 'el candidato tiene todas estas skills'.
+
+    En Postgres es `skill_tags @> ARRAY[...]`, resuelto con el índice GIN.
+    """
+    wanted = normalize_skills(",".join(skills))
+    if dialect == "postgresql":
+        return _skill_tags.contains(wanted)
+    # Aproximación por contenido para bases sin arrays
+    return and_(*(func.lower(Candidate.skills).contains(skill, autoescape=True) for skill in wanted))
+
+
+def mark_skill_facets_stale() -> None:
+    """Marca los conteos como desactualizados tras una escritura que afecta a las skills."""
+    try:
+        get_redis_client().set(FACETS_STALE_KEY, 1)
+    except Exception as e:
+        logger.warning("Error marcando facetas de skills como desactualizadas: %s", str(e))
+
+
+async def refresh_skill_facets() -> None:
+    """Refresca la vista materializada si hubo escrituras desde el último refresco.
+
+    Pensado para BackgroundTasks: usa su propia sesión porque la de la request
+    ya está cerrada cuando se ejecuta.
+    """
+    if async_engine.dialect.name != "postgresql":
+        return
+    redis_client = get_async_redis_client()
+    try:
+        if not await redis_client.set(FACETS_REFRESH_LOCK, 1, nx=True, ex=FACETS_REFRESH_INTERVAL):
+            return
+        if not await redis_client.delete(FACETS_STALE_KEY):
+            return
+    except Exception as e:
+        logger.warning("Error consultando el estado de las facetas de skills: %s", str(e))
+        return
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY candidate_skill_counts"))
+            await db.commit()
+        logger.info("Vista candidate_skill_counts refrescada")
+    except Exception as e:
+        logger.error("Error refrescando candidate_skill_counts: %s", str(e))
+        await redis_client.set(FACETS_STALE_KEY, 1)
+
+
+async def skill_facets(db: AsyncSession, prefix: str | None, limit: int) -> list[dict]:
+    """Skills con más candidatos activos, opcionalmente filtradas por prefijo.
+
+    Returns:
+        list[dict]: {"skill", "count"} de mayor a menor count
+    """
+    prefix = " ".join((prefix or "").split()).lower()
+    if db.get_bind().dialect.name == "postgresql":
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        result = await db.execute(FACETS_SQL, {"prefix": f"{escaped}%", "limit": limit})
+        return [dict(row._mapping) for row in result]
+
+    rows = await db.scalars(select(Candidate.skills).where(Candidate.is_active.is_(True)))
+    counts = Counter(skill for raw in rows for skill in normalize_skills(raw) if skill.startswith(prefix))
+    return [
+        {"skill": skill, "count": count}
+        for skill, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    ]
@@ -3,6 +3,15 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db.database import Base
 from datetime import datetime
 
+# Objetos de esquema que solo existen en Postgres y no se mapean, para que los
+# SELECT del ORM no los arrastren y el esquema de tests en SQLite siga creándose:
+# - búsqueda por palabras clave (migración b3e81f0c27d5): tsvector generado e índices GIN
+# - skills normalizadas (migración d8a4c61e09f3): `skill_tags text[]`, mantenida por trigger
+UNMAPPED_POSTGRES_OBJECTS = {
+    "search_vector", "ix_candidates_search_vector", "ix_candidates_name_trgm", "ix_candidates_email_trgm",
+    "skill_tags", "ix_candidates_skill_tags"
+}
+
 class Candidate(Base):
     __tablename__ = "candidates"
 
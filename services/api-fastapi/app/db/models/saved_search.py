@@ -0,0 +1,33 @@
+from sqlalchemy import String, Text, Float, Boolean, DateTime, LargeBinary, JSON, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.database import Base
+from datetime import datetime
+from typing import Optional
+
+class SavedSearch(Base):
+    """Búsqueda guardada con su embedding precalculado (float32) para el matching inverso del ETL."""
+    __tablename__ = "saved_searches"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    owner: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(150), nullable=False)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    query_vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    score_threshold: Mapped[float] = mapped_column(Float, nullable=False)
+    skills_filter: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    name_filter: Mapped[Optional[str]] = mapped_column(String(150), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+class SavedSearchMatch(Base):
+    """Candidato nuevo o actualizado que supera el umbral de una búsqueda guardada."""
+    __tablename__ = "saved_search_matches"
+    __table_args__ = (UniqueConstraint("saved_search_id", "candidate_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    saved_search_id: Mapped[int] = mapped_column(ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False, index=True)
+    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    seen: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+
+    matched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.v1 import candidate, search, insights
+from app.api.v1 import candidate, search, insights, saved_search
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.logging_config import setup_logging
 from app.core.exceptions import (
     integrity_error_handler,
@@ -14,10 +16,21 @@ from sqlalchemy.exc import IntegrityError
 # Initialize structured logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Búsqueda solo densa si la colección aún no tiene el vector disperso
+    await search.search_service.check_collection()
+    yield
+    # Cerrar los pools keep-alive del path de búsqueda asíncrono
+    await search.search_service.close()
+
+
 app = FastAPI(
     title="Candidate Profile Intelligence Platform API",
     description="Api para gestionar candidatos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Registrar manejadores de excepciones globales
@@ -30,12 +43,18 @@ app.add_middleware(
     allow_origins=["http://localhost:5173", "http://localhost:5174"],
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    # Desglose de latencia de la búsqueda y cursor del listado legibles desde la UI
+    expose_headers=["Server-Timing", "X-Next-After-Id", "Link"]
 )
 
+# Comprime respuestas grandes (listas de resultados) si el cliente acepta gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(candidate.router, prefix="/v1")
 app.include_router(search.router, prefix="/v1")
 app.include_router(insights.router, prefix="/v1")
+app.include_router(saved_search.router, prefix="/v1")
 
 @app.get("/")
 def read_root():
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Literal, Optional
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 
 class CandidateBase(BaseModel):
@@ -41,3 +41,35 @@ class CandidateRead(CandidateBase):
 
     class Config:
         from_attributes = True
+
+class CandidateBulkCreate(BaseModel):
+    candidates: list[CandidateCreate] = Field(..., min_length=1, max_length=1000)
+
+class CandidateBulkConflict(BaseModel):
+    index: int
+    email: str
+    detail: str
+
+class CandidateBulkResult(BaseModel):
+    created: list[int]
+    updated: list[int]
+    conflicts: list[CandidateBulkConflict]
+
+class CandidateSearchHit(BaseModel):
+    id: int
+    name: str
+    email: str
+    headline: Optional[str] = None
+    role: Optional[str] = None
+    score: float
+
+class SkillFacet(BaseModel):
+    skill: str
+    count: int
+
+CandidateField = Literal[
+    "id", "name", "email", "phone", "location", "education", "headline", "summary",
+    "role", "experience", "skills", "is_active", "created_at", "updated_at"
+]
+
+ExportFormat = Literal["csv", "ndjson", "parquet"]
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+class SavedSearchCreate(BaseModel):
+    """Schema para guardar una búsqueda y recibir sus nuevas coincidencias."""
+    owner: str = Field(..., min_length=1, max_length=255, description="Reclutador dueño de la búsqueda")
+    name: str = Field(..., min_length=1, max_length=150, description="Nombre visible de la búsqueda")
+    query: str = Field(..., min_length=3, description="Texto de búsqueda")
+    score_threshold: float = Field(default=0.5, ge=0.0, le=1.0, description="Similitud mínima para registrar una coincidencia")
+    skills_filter: Optional[list[str]] = Field(default=None, description="El candidato debe tener al menos una de estas skills (skill completa)")
+    name_filter: Optional[str] = Field(default=None, max_length=150, description="Filtrar por nombre del candidato (prefijos de palabra, sin distinguir mayúsculas)")
+
+class SavedSearchRead(BaseModel):
+    id: int
+    owner: str
+    name: str
+    query: str
+    score_threshold: float
+    skills_filter: Optional[list[str]] = None
+    name_filter: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SavedSearchMatchRead(BaseModel):
+    candidate_id: int
+    name: str
+    score: float
+    seen: bool
+    matched_at: datetime
+
+class SavedSearchFeed(BaseModel):
+    saved_search_id: int
+    total_results: int
+    results: list[SavedSearchMatchRead]
@@ -1,15 +1,76 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
+
+SearchField = Literal["name", "text_content", "updated_at", "snippet"]
 
 class SearchRequest(BaseModel):
     """Schema para búsqueda semántica."""
     query: str = Field(..., min_length=3, description="Texto de búsqueda")
     limit: int = Field(default=10, ge=1, le=50, description="Número máximo de resultados")
-    score_threshold: float = Field(default=0.2, ge=0.0, le=1.0, description="Umbral mínimo de similitud")
-    skills_filter: Optional[list[str]] = Field(default=None, description="Filtrar por skills específicas")
-    name_filter: Optional[str] = Field(default=None, description="Filtrar por nombre del candidato")
+    score_threshold: float = Field(default=0.2, ge=0.0, le=1.0, description="Umbral mínimo de similitud coseno (también en búsqueda híbrida)")
+    skills_filter: Optional[list[str]] = Field(default=None, description="Al menos una de estas skills (comparación de la skill completa; en búsqueda híbrida además pesan más)")
+    name_filter: Optional[str] = Field(default=None, description="Filtrar por nombre del candidato (prefijos de palabra, sin distinguir mayúsculas)")
+    fields: Optional[list[SearchField]] = Field(default=None, description="Campos a retornar además de id y score (default: name, text_content y updated_at)")
+    hydrate: bool = Field(default=False, description="Adjuntar el registro completo del candidato (una sola consulta a Postgres)")
+    paginate: bool = Field(default=False, description="Retornar next_cursor para paginar (precalcula varias páginas)")
+    # Precisión vs latencia; sin valor se usan los del entorno (SEARCH_HNSW_EF, SEARCH_EXACT, ...)
+    hnsw_ef: Optional[int] = Field(default=None, ge=1, le=4096, description="Tamaño del beam del HNSW (más alto = más recall y más latencia)")
+    exact: Optional[bool] = Field(default=None, description="Búsqueda exhaustiva sin HNSW (recall exacto, más lenta)")
+    quantization_rescore: Optional[bool] = Field(default=None, description="Reordenar con los vectores originales los candidatos de la búsqueda cuantizada")
+    quantization_oversampling: Optional[float] = Field(default=None, ge=1.0, le=16.0, description="Factor de candidatos extra recuperados con vectores cuantizados antes del rescore")
+    debug: bool = Field(default=False, description="Incluir el desglose de latencia por fase en `timings`")
+
+ScoreType = Literal["cosine", "rrf"]
+SCORE_TYPE_DESCRIPTION = "Qué mide `score`: similitud coseno (búsqueda densa) o Reciprocal Rank Fusion (búsqueda híbrida)"
 
 class SearchResponse(BaseModel):
     query: str
     total_results: int
     results: list[dict]
+    next_cursor: Optional[str] = None
+    score_type: Optional[ScoreType] = Field(default=None, description=SCORE_TYPE_DESCRIPTION)
+    timings: Optional[dict[str, float]] = None
+
+class SearchBatchRequest(BaseModel):
+    """Schema para varias búsquedas semánticas en lote."""
+    queries: list[SearchRequest] = Field(..., min_length=1, max_length=96, description="Búsquedas a ejecutar (máximo 96, límite de un embed batch de Cohere)")
+
+class SearchBatchItem(BaseModel):
+    query: str
+    total_results: int
+    results: list[dict]
+    score_type: Optional[ScoreType] = Field(default=None, description=SCORE_TYPE_DESCRIPTION)
+    error: Optional[str] = None
+
+class SearchBatchResponse(BaseModel):
+    total_queries: int
+    failed: int
+    results: list[SearchBatchItem]
+
+class RecommendRequest(BaseModel):
+    """Schema para buscar candidatos parecidos a varios ejemplos."""
+    positive_ids: list[int] = Field(..., min_length=1, max_length=20, description="Candidatos de ejemplo")
+    negative_ids: list[int] = Field(default_factory=list, max_length=20, description="Candidatos a los que los resultados no deben parecerse")
+    strategy: Literal["average_vector", "best_score", "sum_scores"] = Field(default="average_vector", description="Estrategia de recomendación de Qdrant")
+    limit: int = Field(default=10, ge=1, le=50, description="Número máximo de resultados")
+    score_threshold: Optional[float] = Field(default=None, description="Score mínimo (con best_score y sum_scores no es una similitud coseno)")
+    skills_filter: Optional[list[str]] = Field(default=None, description="Al menos una de estas skills (comparación de la skill completa)")
+    name_filter: Optional[str] = Field(default=None, description="Filtrar por nombre del candidato (prefijos de palabra, sin distinguir mayúsculas)")
+    fields: Optional[list[SearchField]] = Field(default=None, description="Campos a retornar además de id y score (default: name, text_content y updated_at)")
+    hydrate: bool = Field(default=False, description="Adjuntar el registro completo del candidato (una sola consulta a Postgres)")
+
+class SimilarBatchRequest(BaseModel):
+    """Schema para búsqueda de similares de varios candidatos en lote."""
+    candidate_ids: list[int] = Field(..., min_length=1, max_length=100, description="IDs de los candidatos de referencia")
+    limit: int = Field(default=5, ge=1, le=50, description="Número máximo de similares por candidato")
+    score_threshold: float = Field(default=0.0, ge=0.0, le=1.0, description="Umbral mínimo de similitud")
+
+class SimilarBatchItem(BaseModel):
+    candidate_id: int
+    found: bool
+    total_results: int
+    results: list[dict]
+
+class SimilarBatchResponse(BaseModel):
+    total_candidates: int
+    results: list[SimilarBatchItem]
@@ -0,0 +1,96 @@
+"""
+Prueba de carga para los endpoints de búsqueda semántica.
+
+Dispara ráfagas de requests concurrentes contra /v1/semantic_search/ (o
+/similar/{id}) a niveles de concurrencia crecientes y reporta throughput y
+latencias p50/p95/p99. El "techo de concurrencia" es el nivel a partir del
+cual el throughput deja de crecer y la latencia se dispara.
+
+Para comparar antes/después se ejecuta contra ambas versiones de la API:
+
+    python scripts/load_test_search.py --url http://localhost:8000/v1 --levels 1,8,32,64,128
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+QUERIES = [
+    "python backend",
+    "react senior",
+    "ingeniero de datos con airflow",
+    "devops kubernetes aws",
+    "machine learning engineer",
+]
+
+
+async def _one_request(client: httpx.AsyncClient, mode: str, i: int) -> tuple[float, bool]:
+    """Ejecuta una request y retorna (latencia en segundos, éxito)."""
+    start = time.perf_counter()
+    try:
+        if mode == "similar":
+            response = await client.get(f"/semantic_search/similar/{(i % 5) + 1}")
+        else:
+            response = await client.post(
+                "/semantic_search/",
+                json={"query": QUERIES[i % len(QUERIES)], "limit": 10},
+            )
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+async def run_level(base_url: str, mode: str, concurrency: int, total: int) -> dict:
+    """Ejecuta `total` requests manteniendo `concurrency` en vuelo."""
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def bounded(i: int):
+            async with semaphore:
+                return await _one_request(client, mode, i)
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(bounded(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(lat for lat, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test de búsqueda semántica")
+    parser.add_argument("--url", default="http://localhost:8000/v1", help="URL base de la API")
+    parser.add_argument("--mode", choices=["search", "similar"], default="search")
+    parser.add_argument("--levels", default="1,8,32,64,128", help="Niveles de concurrencia separados por coma")
+    parser.add_argument("--requests", type=int, default=200, help="Requests por nivel")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(f"{'conc':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for level in levels:
+        result = asyncio.run(run_level(args.url, args.mode, level, max(args.requests, level)))
+        print(
+            f"{result['concurrency']:>6} {result['rps']:>9.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>7}"
+        )
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,21 @@ Configuración compartida para tests de FastAPI.
 import pytest
 from unittest.mock import patch, MagicMock
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
 # Mock de settings ANTES de importar módulos que lo usen
 mock_settings = MagicMock()
 mock_settings.DATABASE_URL = "sqlite:///./test.db"
 mock_settings.QDRANT_URL = "http://localhost:6333"
+mock_settings.DB_POOL_SIZE = 5
+mock_settings.DB_MAX_OVERFLOW = 10
+mock_settings.DB_SYNC_POOL_SIZE = 5
+mock_settings.DB_SYNC_MAX_OVERFLOW = 5
+mock_settings.DB_POOL_RECYCLE = 1800
+mock_settings.DB_POOL_PRE_PING = False
 mock_settings.COHERE_API_KEY = "test-key"
 mock_settings.MODEL_NAME = "command-a-03-2025"
 mock_settings.TEMPERATURE = 0
@@ -51,7 +59,7 @@ with patch.dict("os.environ", {
     "FALLBACK_MODEL_NAME": "llama-3.3-70b-versatile",
 }):
     with patch("app.core.config.settings", mock_settings):
-        from app.db.database import Base, get_db
+        from app.db.database import Base, get_db, get_async_db
         from app.main import app
 
 # SQLite in-memory para tests
@@ -59,6 +67,12 @@ SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_TEST_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Mismo archivo vía aiosqlite para los endpoints con AsyncSession.
+# NullPool: TestClient abre un event loop por cliente y una conexión
+# aiosqlite no puede reutilizarse en otro loop.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -79,7 +93,7 @@ def db_session():
 def client(db_session):
     """
     Cliente HTTP de testing que usa la DB de prueba.
-    Override de get_db asegura que los endpoints usen nuestra DB de test.
+    Override de get_db/get_async_db asegura que los endpoints usen nuestra DB de test.
     """
     def override_get_db():
         try:
@@ -87,7 +101,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
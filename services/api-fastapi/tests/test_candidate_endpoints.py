@@ -9,12 +9,71 @@ Tests de integración para los endpoints CRUD de candidatos.
 
 Cobertura:
 - GET /v1/candidate/ → lista vacía y con datos
-- GET /v1/candidate/{id} → encontrado y 404
+- GET /v1/candidate/{id} → encontrado, 404 y caché Redis con ETag/304
+- GET /v1/candidate/export → CSV, NDJSON y Parquet en streaming, con gzip
+- GET /v1/candidate/search → búsqueda por palabras clave y validación de q
+- GET /v1/candidate/facets/skills → conteos por skill y filtro por skills del listado
 - POST /v1/candidate/ → creación exitosa y validación
-- PUT /v1/candidate/{id} → actualización parcial y 404
+- POST /v1/candidate/bulk → upsert por email, conflictos por fila y un solo job de indexación
+- PUT/PATCH /v1/candidate/{id} → actualización parcial, no-op sin escritura ni re-indexación, 404 y 409
 - DELETE /v1/candidate/{id} → eliminación exitosa y 404
 """
 
+import csv
+import io
+import json
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+
+from app.db.models.candidate import Candidate
+
+
+class _FakeRedis:
+    """Redis en memoria con las operaciones que usa la caché de candidatos."""
+
+    def __init__(self):
+        self.store = {}
+
+    def hmget(self, key, fields):
+        entry = self.store.get(key, {})
+        return [entry.get(field) for field in fields]
+
+    def hset(self, key, mapping):
+        self.store[key] = {k: v.encode() if isinstance(v, str) else v for k, v in mapping.items()}
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+def _create_many(client, sample_candidate, count):
+    for i in range(count):
+        candidate = {
+            **sample_candidate,
+            "email": f"candidato{i}@example.com",
+            "phone": f"+54911000{i:05d}",
+            "role": "Frontend Developer" if i % 2 else "Backend Developer",
+        }
+        client.post("/v1/candidate/", json=candidate)
+
+
+@pytest.fixture
+def fake_cache():
+    fake = _FakeRedis()
+    with patch("app.core.candidate_cache.get_redis_bytes_client", return_value=fake):
+        yield fake
+
 
 class TestListCandidates:
     """Tests para GET /v1/candidate/"""
@@ -49,6 +108,195 @@ class TestListCandidates:
         assert len(response.json()) == 2
 
 
+    def test_list_without_paging_params_is_unbounded(self, client, sample_candidate):
+        """Sin limit ni after_id debe retornar todos los candidatos, sin cabeceras de paginación."""
+        _create_many(client, sample_candidate, 3)
+
+        with patch("app.api.v1.candidate.DEFAULT_PAGE_SIZE", 2):
+            response = client.get("/v1/candidate/")
+            assert [c["id"] for c in response.json()] == [1, 2, 3]
+            assert "x-next-after-id" not in response.headers
+
+            paged = client.get("/v1/candidate/", params={"after_id": 0})
+            assert [c["id"] for c in paged.json()] == [1, 2]
+            assert paged.headers["x-next-after-id"] == "2"
+
+    def test_keyset_pagination(self, client, sample_candidate):
+        """Debe paginar por after_id e indicar la siguiente página en los headers."""
+        _create_many(client, sample_candidate, 5)
+
+        first = client.get("/v1/candidate/", params={"limit": 2})
+        assert [c["id"] for c in first.json()] == [1, 2]
+        assert first.headers["x-next-after-id"] == "2"
+        assert "after_id=2" in first.headers["link"]
+
+        last = client.get("/v1/candidate/", params={"limit": 2, "after_id": 4})
+        assert [c["id"] for c in last.json()] == [5]
+        assert "x-next-after-id" not in last.headers
+
+    def test_next_link_keeps_query_params(self, client, sample_candidate):
+        """El Link de la página siguiente debe conservar fields y filtros, no solo after_id y limit."""
+        from urllib.parse import parse_qs
+        _create_many(client, sample_candidate, 4)
+
+        response = client.get("/v1/candidate/", params={
+            "limit": 1, "fields": ["name", "role"], "role": "backend", "is_active": True
+        })
+
+        link = response.headers["link"]
+        query = parse_qs(link[link.index("?") + 1:link.index(">")])
+        assert query == {
+            "limit": ["1"], "fields": ["name", "role"], "role": ["backend"],
+            "is_active": ["true"], "after_id": ["1"]
+        }
+        assert link.endswith('; rel="next"')
+
+    def test_pagination_headers_exposed_to_browser(self, client, sample_candidate):
+        """CORS debe exponer el cursor: sin ello el navegador oculta X-Next-After-Id y la UI no pagina."""
+        _create_many(client, sample_candidate, 2)
+
+        response = client.get("/v1/candidate/", params={"limit": 1}, headers={"Origin": "http://localhost:5173"})
+
+        exposed = response.headers["access-control-expose-headers"].lower()
+        assert "x-next-after-id" in exposed
+        assert "link" in exposed
+
+    def test_fields_projection_and_filters(self, client, sample_candidate):
+        """Debe retornar solo los campos pedidos (más id) y aplicar los filtros."""
+        _create_many(client, sample_candidate, 4)
+
+        response = client.get("/v1/candidate/", params={"fields": ["name", "role"], "role": "backend"})
+
+        data = response.json()
+        assert [c["id"] for c in data] == [1, 3]
+        assert set(data[0]) == {"id", "name", "role"}
+        assert client.get("/v1/candidate/", params={"is_active": False}).json() == []
+        assert client.get("/v1/candidate/", params={"fields": ["password"]}).status_code == 422
+
+    def test_stream_ndjson(self, client, sample_candidate):
+        """stream=true debe emitir todos los candidatos filtrados, uno por línea."""
+        import json
+        _create_many(client, sample_candidate, 3)
+
+        response = client.get("/v1/candidate/", params={"stream": True, "limit": 1, "fields": ["email"]})
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["email"] for line in lines] == [f"candidato{i}@example.com" for i in range(3)]
+
+
+class TestExportCandidates:
+    """Tests para GET /v1/candidate/export"""
+
+    def test_export_csv_gzip(self, client, sample_candidate):
+        """El CSV debe incluir cabecera y todas las filas, comprimido si el cliente acepta gzip."""
+        _create_many(client, sample_candidate, 3)
+
+        response = client.get(
+            "/v1/candidate/export",
+            params={"fields": ["name", "email"]},
+            headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert 'filename="candidates.csv"' in response.headers["content-disposition"]
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["id", "name", "email"]
+        assert len(rows) == 4
+
+    def test_export_ndjson_and_parquet(self, client, sample_candidate):
+        """NDJSON y Parquet deben contener los mismos candidatos filtrados."""
+        _create_many(client, sample_candidate, 3)
+        params = {"role": "backend"}
+
+        ndjson = client.get("/v1/candidate/export", params={**params, "format": "ndjson"})
+        ids = [json.loads(line)["id"] for line in ndjson.text.splitlines()]
+
+        parquet = client.get("/v1/candidate/export", params={**params, "format": "parquet"})
+        assert parquet.headers["content-type"] == "application/vnd.apache.parquet"
+        table = pq.read_table(io.BytesIO(parquet.content))
+
+        assert ids == table.column("id").to_pylist() == [1, 3]
+        assert table.schema.field("is_active").type == "bool"
+
+    def test_export_invalid_format(self, client):
+        """Un formato desconocido debe retornar 422."""
+        assert client.get("/v1/candidate/export", params={"format": "xlsx"}).status_code == 422
+
+
+class TestSearchCandidates:
+    """Tests para GET /v1/candidate/search"""
+
+    def test_search_matches_keywords(self, client, sample_candidate):
+        """Debe encontrar candidatos por nombre o email y priorizar el prefijo del nombre."""
+        _create_many(client, sample_candidate, 2)
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "name": "Zoe Python", "email": "zoe@example.com", "phone": "+5491177776666"
+        })
+
+        response = client.get("/v1/candidate/search", params={"q": "zoe"})
+        assert response.status_code == 200
+        hits = response.json()
+        assert [h["id"] for h in hits] == [3]
+        assert set(hits[0]) == {"id", "name", "email", "headline", "role", "score"}
+
+        by_email = client.get("/v1/candidate/search", params={"q": "candidato1@", "limit": 5}).json()
+        assert [h["email"] for h in by_email] == ["candidato1@example.com"]
+
+    def test_search_treats_like_wildcards_literally(self, client, sample_candidate):
+        """`%` y `_` en q deben buscarse literalmente, no como comodines de LIKE."""
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "name": "Ana Lopez", "email": "ana.lopez@example.com", "phone": "+5491177776666"
+        })
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "name": "Ana_Lopez", "email": "ana_lopez@example.com", "phone": "+5491177775555"
+        })
+
+        assert client.get("/v1/candidate/search", params={"q": "%%"}).json() == []
+        hits = client.get("/v1/candidate/search", params={"q": "na_lo"}).json()
+        assert [h["email"] for h in hits] == ["ana_lopez@example.com"]
+
+    def test_search_validation(self, client):
+        """q es obligatorio y de al menos 2 caracteres; limit está acotado."""
+        assert client.get("/v1/candidate/search").status_code == 422
+        assert client.get("/v1/candidate/search", params={"q": "a"}).status_code == 422
+        assert client.get("/v1/candidate/search", params={"q": "ana", "limit": 500}).status_code == 422
+
+
+class TestSkillFacets:
+    """Tests para GET /v1/candidate/facets/skills y el filtro por skills"""
+
+    def test_facet_counts(self, client, sample_candidate):
+        """Debe contar candidatos activos por skill canónica, de mayor a menor."""
+        _create_many(client, sample_candidate, 2)
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "email": "zoe@example.com", "phone": "+5491177776666", "skills": "python ,  Rust"
+        })
+
+        response = client.get("/v1/candidate/facets/skills", params={"limit": 3})
+        assert response.status_code == 200
+        assert response.json() == [
+            {"skill": "python", "count": 3},
+            {"skill": "aws", "count": 2},
+            {"skill": "django", "count": 2},
+        ]
+
+        prefixed = client.get("/v1/candidate/facets/skills", params={"prefix": "R"}).json()
+        assert prefixed == [{"skill": "rust", "count": 1}]
+
+    def test_list_filters_by_skills(self, client, sample_candidate):
+        """El listado debe retornar solo los candidatos con todas las skills pedidas."""
+        _create_many(client, sample_candidate, 2)
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "email": "zoe@example.com", "phone": "+5491177776666", "skills": "Python, Rust"
+        })
+
+        response = client.get("/v1/candidate/", params={"skills": ["python", "RUST"], "fields": ["email"]})
+        assert [c["email"] for c in response.json()] == ["zoe@example.com"]
+        assert len(client.get("/v1/candidate/", params={"skills": ["Docker"]}).json()) == 2
+
+
 class TestGetCandidate:
     """Tests para GET /v1/candidate/{id}"""
 
@@ -67,6 +315,41 @@ class TestGetCandidate:
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
+    def test_cache_hit_and_not_modified(self, client, db_session, sample_candidate, fake_cache):
+        """Tras el primer GET, un hit o un If-None-Match vigente no deben consultar Postgres."""
+        client.post("/v1/candidate/", json=sample_candidate)
+
+        first = client.get("/v1/candidate/1")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert "candidate:1" in fake_cache.store
+
+        # Borrado directo en la DB (sin pasar por la API): solo la caché puede responder
+        db_session.query(Candidate).delete()
+        db_session.commit()
+
+        cached = client.get("/v1/candidate/1")
+        assert cached.status_code == 200
+        assert cached.json() == first.json()
+
+        not_modified = client.get("/v1/candidate/1", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.content == b""
+
+    def test_writes_invalidate_cache(self, client, sample_candidate, fake_cache):
+        """Actualizar y eliminar deben invalidar la entrada cacheada."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        client.get("/v1/candidate/1")
+
+        client.put("/v1/candidate/1", json={"role": "Staff Engineer"})
+        assert "candidate:1" not in fake_cache.store
+        assert client.get("/v1/candidate/1").json()["role"] == "Staff Engineer"
+
+        client.delete("/v1/candidate/1")
+        assert "candidate:1" not in fake_cache.store
+        assert client.get("/v1/candidate/1").status_code == 404
+
 
 class TestCreateCandidate:
     """Tests para POST /v1/candidate/"""
@@ -113,6 +396,59 @@ class TestCreateCandidate:
         assert response.status_code == 201
 
 
+class TestBulkCandidates:
+    """Tests para POST /v1/candidate/bulk"""
+
+    @patch("app.api.v1.candidate.enqueue_batch_index")
+    def test_bulk_creates_and_updates(self, mock_enqueue, client, sample_candidate):
+        """Los emails nuevos se insertan, los existentes se actualizan y se encola un solo job."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        batch = [
+            {**sample_candidate, "role": "Staff Engineer", "summary": None},
+            {**sample_candidate, "name": "Carlos López", "email": "carlos@example.com", "phone": "+5491155550000"},
+        ]
+
+        response = client.post("/v1/candidate/bulk", json={"candidates": batch})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated"] == [1]
+        assert data["created"] == [2]
+        assert data["conflicts"] == []
+        mock_enqueue.assert_called_once_with([2, 1], requested_by="fastapi:bulk")
+
+        updated = client.get("/v1/candidate/1").json()
+        assert updated["role"] == "Staff Engineer"
+        # Un campo omitido no borra el valor existente
+        assert updated["summary"] == sample_candidate["summary"]
+        assert client.get("/v1/candidate/2").json()["name"] == "Carlos López"
+
+    @patch("app.api.v1.candidate.enqueue_batch_index")
+    def test_bulk_reports_row_conflicts(self, mock_enqueue, client, sample_candidate):
+        """Las filas que chocarían se reportan por índice y no impiden el resto del lote."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        batch = [
+            {**sample_candidate, "email": "otro@example.com"},
+            {**sample_candidate, "email": "nuevo@example.com", "phone": "+5491100000001"},
+            {**sample_candidate, "email": "nuevo@example.com", "phone": "+5491100000002"},
+        ]
+
+        data = client.post("/v1/candidate/bulk", json={"candidates": batch}).json()
+
+        assert data["created"] == [2]
+        assert [(c["index"], c["email"]) for c in data["conflicts"]] == [
+            (0, "otro@example.com"), (2, "nuevo@example.com")
+        ]
+        assert "teléfono" in data["conflicts"][0]["detail"].lower()
+        mock_enqueue.assert_called_once_with([2], requested_by="fastapi:bulk")
+
+    def test_bulk_validates_batch(self, client, sample_candidate):
+        """Un lote vacío o con filas inválidas debe rechazarse completo con 422."""
+        assert client.post("/v1/candidate/bulk", json={"candidates": []}).status_code == 422
+        invalid = {**sample_candidate, "email": "no-es-un-email"}
+        assert client.post("/v1/candidate/bulk", json={"candidates": [invalid]}).status_code == 422
+
+
 class TestUpdateCandidate:
     """Tests para PUT /v1/candidate/{id}"""
 
@@ -132,6 +468,50 @@ class TestUpdateCandidate:
         response = client.put("/v1/candidate/9999", json=sample_candidate_update)
         assert response.status_code == 404
 
+    @patch("app.api.v1.candidate.enqueue_single_index")
+    def test_patch_returns_full_candidate(self, mock_enqueue, client, sample_candidate):
+        """PATCH debe retornar el candidato completo actualizado y re-indexarlo."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        before = client.get("/v1/candidate/1").json()
+        mock_enqueue.reset_mock()
+
+        response = client.patch("/v1/candidate/1", json={"role": "Staff Engineer"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == 1
+        assert data["role"] == "Staff Engineer"
+        assert data["email"] == sample_candidate["email"]
+        assert data["updated_at"] >= before["updated_at"]
+        mock_enqueue.assert_called_once_with(1, requested_by="fastapi:update")
+
+    @patch("app.api.v1.candidate.enqueue_single_index")
+    def test_patch_noop_skips_write_and_reindex(self, mock_enqueue, client, sample_candidate, fake_cache):
+        """Un PATCH sin cambios no debe escribir, invalidar la caché ni re-indexar."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        etag = client.get("/v1/candidate/1").headers["etag"]
+        mock_enqueue.reset_mock()
+
+        response = client.patch("/v1/candidate/1", json={"name": sample_candidate["name"], "skills": None})
+        assert response.status_code == 200
+        assert response.json()["name"] == sample_candidate["name"]
+        assert "candidate:1" in fake_cache.store
+        mock_enqueue.assert_not_called()
+
+        assert client.get("/v1/candidate/1", headers={"If-None-Match": etag}).status_code == 304
+
+    def test_patch_not_found(self, client):
+        """Debe retornar 404 también cuando no hay campos que cambiar."""
+        assert client.patch("/v1/candidate/9999", json={"role": "Dev"}).status_code == 404
+        assert client.patch("/v1/candidate/9999", json={}).status_code == 404
+
+    def test_patch_duplicate_email(self, client, sample_candidate):
+        """Debe retornar 409 si el email pertenece a otro candidato."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        client.post("/v1/candidate/", json={**sample_candidate, "email": "otro@example.com", "phone": "+573009998877"})
+
+        response = client.patch("/v1/candidate/2", json={"email": sample_candidate["email"]})
+        assert response.status_code == 409
+
 
 class TestDeleteCandidate:
     """Tests para DELETE /v1/candidate/{id}"""
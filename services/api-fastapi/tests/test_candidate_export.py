@@ -0,0 +1,61 @@
+"""
+Tests unitarios para el export CSV con COPY TO STDOUT.
+
+¿Por qué testear el productor de COPY por separado?
+- En CI no hay Postgres: se simula la conexión psycopg2 (mogrify + copy_expert)
+- Los bloques deben llegar en orden y el SELECT con los filtros ya escapados
+- Un error a mitad de COPY debe propagarse a la respuesta, no truncarla en silencio
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.candidate_export import stream_csv
+from app.core.candidate_listing import build_list_query
+
+
+def _postgres_session(copy_chunks, error=None):
+    raw_conn = MagicMock()
+    cursor = raw_conn.cursor.return_value
+    cursor.mogrify.side_effect = lambda sql, params: (sql % {k: repr(v) for k, v in params.items()}).encode()
+
+    def copy_expert(sql, writer):
+        cursor.copy_sql = sql
+        for chunk in copy_chunks:
+            writer.write(chunk)
+        if error:
+            raise error
+
+    cursor.copy_expert.side_effect = copy_expert
+    bind = MagicMock()
+    bind.dialect = postgresql.psycopg2.dialect()
+    bind.raw_connection.return_value = raw_conn
+    db = MagicMock()
+    db.get_bind.return_value = bind
+    return db, raw_conn, cursor
+
+
+class TestCopyExport:
+    """Tests para stream_csv sobre Postgres."""
+
+    def test_streams_copy_chunks_in_order(self):
+        """Debe emitir los bloques de COPY en orden y devolver la conexión al pool."""
+        db, raw_conn, cursor = _postgres_session([b"id,name\n", b"1,Ana\n", b"2,Luis\n"])
+
+        body = b"".join(stream_csv(db, build_list_query(fields=["name"], role="dev")))
+
+        assert body == b"id,name\n1,Ana\n2,Luis\n"
+        assert cursor.copy_sql.startswith("COPY (SELECT candidates.id, candidates.name")
+        assert "TO STDOUT WITH (FORMAT csv, HEADER)" in cursor.copy_sql
+        assert "'%dev%'" in cursor.copy_sql
+        raw_conn.close.assert_called_once()
+
+    def test_copy_error_is_raised(self):
+        """Un fallo de COPY debe interrumpir el stream con la excepción original."""
+        db, raw_conn, _ = _postgres_session([b"id\n"], error=RuntimeError("canceling statement"))
+
+        with pytest.raises(RuntimeError, match="canceling statement"):
+            list(stream_csv(db, build_list_query()))
+        raw_conn.close.assert_called_once()
@@ -15,23 +15,21 @@ Tests para el endpoint de insights LLM.
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 
+from app.db.models.candidate import Candidate
+
 
 class TestInsightsEndpoint:
     """Tests para GET /v1/insights/{id}"""
 
+    @patch("app.api.v1.insights.get_redis_client")
     @patch("app.api.v1.insights.Agent")
-    @patch("app.api.v1.insights.SessionLocal")
-    def test_generate_insights_success(self, mock_session_cls, mock_agent_cls, client):
+    def test_generate_insights_success(self, mock_agent_cls, mock_redis, client, db_session, sample_candidate):
         """Debe generar insights para un candidato existente."""
-        # Mock del candidato en DB
-        mock_candidate = MagicMock()
-        mock_candidate.id = 1
-        mock_candidate.summary = "Desarrollador Python senior"
-        mock_candidate.skills = "Python,FastAPI,Docker"
-        
-        mock_session = MagicMock()
-        mock_session.query.return_value.filter.return_value.first.return_value = mock_candidate
-        mock_session_cls.return_value = mock_session
+        candidate = Candidate(**sample_candidate)
+        db_session.add(candidate)
+        db_session.commit()
+        candidate_id = candidate.id
+        mock_redis.return_value.get.return_value = None
 
         # Mock del Agent
         mock_agent_instance = MagicMock()
@@ -44,19 +42,17 @@ class TestInsightsEndpoint:
         })
         mock_agent_cls.return_value = mock_agent_instance
 
-        response = client.get("/v1/insights/1")
+        response = client.get(f"/v1/insights/{candidate_id}")
         assert response.status_code == 200
         data = response.json()
-        assert data["candidate_id"] == 1
+        assert data["candidate_id"] == candidate_id
         assert "insights" in data
+        # El candidato se leyó con la sesión asíncrona y llegó al prompt
+        query = mock_agent_instance.generate_insight.call_args.kwargs["query"]
+        assert "FastAPI" in query
 
-    @patch("app.api.v1.insights.SessionLocal")
-    def test_insights_candidate_not_found(self, mock_session_cls, client):
+    def test_insights_candidate_not_found(self, client):
         """Debe retornar 404 si el candidato no existe."""
-        mock_session = MagicMock()
-        mock_session.query.return_value.filter.return_value.first.return_value = None
-        mock_session_cls.return_value = mock_session
-
         response = client.get("/v1/insights/9999")
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
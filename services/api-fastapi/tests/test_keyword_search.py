@@ -0,0 +1,34 @@
+"""
+Tests unitarios para la búsqueda por palabras clave.
+
+¿Por qué testear el tsquery por separado?
+- El texto del usuario se interpola en la sintaxis de tsquery: un `&` o `:` suelto
+  haría fallar la consulta en Postgres (que en CI no está disponible)
+- Los operadores `%` de pg_trgm deben sobrevivir al paramstyle de psycopg2
+"""
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.keyword_search import MAX_QUERY_TERMS, SEARCH_SQL, prefix_tsquery
+
+
+class TestPrefixTsquery:
+    """Tests para prefix_tsquery y SEARCH_SQL."""
+
+    def test_terms_become_prefixes(self):
+        """Cada palabra debe ser un prefijo, unidas con AND y en minúsculas."""
+        assert prefix_tsquery("Ana Garc") == "ana:* & garc:*"
+        assert prefix_tsquery("maría") == "maría:*"
+
+    def test_tsquery_syntax_is_stripped(self):
+        """Los operadores de tsquery del usuario no deben llegar a la consulta."""
+        assert prefix_tsquery("python & !java | go:*") == "python:* & java:* & go:*"
+        assert prefix_tsquery("ana@example.com") == "ana:* & example:* & com:*"
+        assert prefix_tsquery("&&") == ""
+        assert prefix_tsquery(" ".join(f"t{i}" for i in range(20))).count(":*") == MAX_QUERY_TERMS
+
+    def test_trigram_operator_escaped_for_psycopg2(self):
+        """`name % :q` debe compilarse como `%%` con el paramstyle pyformat."""
+        compiled = str(SEARCH_SQL.compile(dialect=postgresql.psycopg2.dialect()))
+        assert "name %% %(q)s" in compiled
+        assert "to_tsquery('simple', %(tsquery)s)" in compiled
@@ -0,0 +1,79 @@
+"""
+Tests para los endpoints de búsquedas guardadas.
+
+¿Por qué testear las búsquedas guardadas?
+- El embedding se calcula una sola vez al guardar: el feed no debe consultar Cohere ni Qdrant
+- El feed debe respetar el orden (más recientes primero) y el estado visto/no visto
+- Los recursos inexistentes deben responder 404
+"""
+
+from array import array
+from unittest.mock import patch, AsyncMock
+
+from app.db.models.candidate import Candidate
+from app.db.models.saved_search import SavedSearch, SavedSearchMatch
+
+
+def _saved_search_payload(**overrides):
+    return {
+        "owner": "reclutadora@example.com",
+        "name": "Backend Python",
+        "query": "desarrollador backend python",
+        "score_threshold": 0.6,
+        "skills_filter": ["Python"],
+        **overrides
+    }
+
+
+class TestSavedSearches:
+    """Tests para /v1/saved_searches"""
+
+    @patch("app.api.v1.saved_search.search_service", new_callable=AsyncMock)
+    def test_create_stores_query_vector(self, mock_service, client, db_session):
+        """Debe embeber la query una vez y guardar el vector como float32."""
+        mock_service.embed_query.return_value = [0.5, 0.25]
+
+        response = client.post("/v1/saved_searches/", json=_saved_search_payload())
+
+        assert response.status_code == 201
+        assert response.json()["skills_filter"] == ["Python"]
+        mock_service.embed_query.assert_called_once_with("desarrollador backend python")
+        saved = db_session.get(SavedSearch, response.json()["id"])
+        assert array("f", saved.query_vector).tolist() == [0.5, 0.25]
+
+        listed = client.get("/v1/saved_searches/", params={"owner": "reclutadora@example.com"}).json()
+        assert [s["id"] for s in listed] == [saved.id]
+
+    @patch("app.api.v1.saved_search.search_service", new_callable=AsyncMock)
+    def test_matches_feed_and_mark_seen(self, mock_service, client, db_session, sample_candidate):
+        """El feed lista las coincidencias pendientes con el nombre del candidato y permite marcarlas vistas."""
+        candidate = Candidate(**sample_candidate)
+        saved = SavedSearch(**_saved_search_payload(), query_vector=array("f", [1.0]).tobytes())
+        db_session.add_all([candidate, saved])
+        db_session.commit()
+        db_session.add(SavedSearchMatch(saved_search_id=saved.id, candidate_id=candidate.id, score=0.83))
+        db_session.commit()
+
+        feed = client.get(f"/v1/saved_searches/{saved.id}/matches").json()
+        assert feed["total_results"] == 1
+        assert feed["results"][0]["name"] == "Ana García"
+        assert feed["results"][0]["score"] == 0.83
+        mock_service.search.assert_not_called()
+
+        assert client.post(f"/v1/saved_searches/{saved.id}/matches/seen").json()["marked"] == 1
+        assert client.get(f"/v1/saved_searches/{saved.id}/matches").json()["total_results"] == 0
+        assert client.get(f"/v1/saved_searches/{saved.id}/matches", params={"unseen_only": False}).json()["total_results"] == 1
+
+    def test_missing_saved_search(self, client):
+        """Debe retornar 404 para una búsqueda guardada inexistente."""
+        assert client.get("/v1/saved_searches/999/matches").status_code == 404
+        assert client.delete("/v1/saved_searches/999").status_code == 404
+
+    def test_delete(self, client, db_session):
+        """Debe eliminar la búsqueda guardada."""
+        saved = SavedSearch(**_saved_search_payload(), query_vector=array("f", [1.0]).tobytes())
+        db_session.add(saved)
+        db_session.commit()
+
+        assert client.delete(f"/v1/saved_searches/{saved.id}").status_code == 204
+        assert db_session.get(SavedSearch, saved.id) is None
@@ -12,14 +12,23 @@ Tests para endpoints de búsqueda semántica.
 - search_service.find_similar: simula búsqueda por candidato similar
 """
 
+import json
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+
+
+def _search_service_mock():
+    """AsyncSearchService mockeado; score_type es síncrono en el servicio real."""
+    service = AsyncMock()
+    service.score_type = MagicMock(return_value="cosine")
+    return service
 
 
 class TestSemanticSearch:
     """Tests para POST /v1/semantic_search/"""
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_search_returns_results(self, mock_service, client):
         """Debe retornar resultados de búsqueda semántica."""
         mock_service.search.return_value = [
@@ -38,8 +47,9 @@ class TestSemanticSearch:
         assert data["query"] == "python developer"
         assert data["total_results"] == 2
         assert len(data["results"]) == 2
+        assert data["score_type"] == "cosine"
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_search_empty_results(self, mock_service, client):
         """Debe retornar lista vacía cuando no hay coincidencias."""
         mock_service.search.return_value = []
@@ -63,7 +73,7 @@ class TestSemanticSearch:
         response = client.post("/v1/semantic_search/", json={})
         assert response.status_code == 422
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_search_with_filters(self, mock_service, client):
         """Debe pasar filtros al servicio de búsqueda."""
         mock_service.search.return_value = [
@@ -82,10 +92,67 @@ class TestSemanticSearch:
             limit=10,
             score_threshold=0.2,
             skills_filter=["Python", "FastAPI"],
-            name_filter="Ana"
+            name_filter="Ana",
+            fields=None,
+            tuning={}
         )
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_search_tuning_params(self, mock_service, client):
+        """Debe pasar solo los parámetros de precisión/latencia indicados y validar sus rangos."""
+        mock_service.search.return_value = []
+
+        response = client.post("/v1/semantic_search/", json={
+            "query": "backend developer",
+            "hnsw_ef": 256,
+            "quantization_oversampling": 2.0
+        })
+        assert response.status_code == 200
+        assert mock_service.search.call_args[1]["tuning"] == {"hnsw_ef": 256, "quantization_oversampling": 2.0}
+
+        response = client.post("/v1/semantic_search/", json={"query": "backend developer", "hnsw_ef": 0})
+        assert response.status_code == 422
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_search_fields_and_gzip(self, mock_service, client):
+        """Debe pasar la proyección de campos y comprimir respuestas grandes."""
+        mock_service.search.return_value = [
+            {"id": i, "score": 0.9, "name": f"Candidato {i}", "snippet": "…Python, FastAPI, Docker…"}
+            for i in range(50)
+        ]
+
+        response = client.post(
+            "/v1/semantic_search/",
+            json={"query": "python developer", "fields": ["name", "snippet"]},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["results"][0]["snippet"] == "…Python, FastAPI, Docker…"
+        assert mock_service.search.call_args[1]["fields"] == ["name", "snippet"]
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_search_timings(self, mock_service, client):
+        """Debe publicar Server-Timing siempre y el campo timings solo con debug=true."""
+        mock_service.search.return_value = [{"id": 1, "name": "Ana García", "score": 0.92}]
+
+        response = client.post("/v1/semantic_search/", json={"query": "backend developer"})
+        assert "total;dur=" in response.headers["server-timing"]
+        assert "timings" not in response.json()
+
+        response = client.post("/v1/semantic_search/", json={"query": "backend developer", "debug": True})
+        assert "total" in response.json()["timings"]
+
+        stats = client.get("/v1/semantic_search/timing/stats").json()
+        assert stats["search"]["total"]["count"] >= 2
+        assert stats["search"]["serialize"]["count"] >= 2
+
+    def test_search_invalid_field(self, client):
+        """Debe retornar 422 para un campo no proyectable."""
+        response = client.post("/v1/semantic_search/", json={"query": "python", "fields": ["email"]})
+        assert response.status_code == 422
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_search_service_error(self, mock_service, client):
         """Debe retornar 500 cuando el servicio falla."""
         mock_service.search.side_effect = Exception("Qdrant connection failed")
@@ -99,7 +166,7 @@ class TestSemanticSearch:
 class TestSimilarSearch:
     """Tests para GET /v1/semantic_search/similar/{id}"""
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_find_similar(self, mock_service, client):
         """Debe retornar candidatos similares."""
         mock_service.find_similar.return_value = [
@@ -110,7 +177,7 @@ class TestSimilarSearch:
         assert response.status_code == 200
         assert response.json()["total_results"] == 1
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_find_similar_not_found(self, mock_service, client):
         """Debe retornar 404 cuando el candidato no existe en Qdrant."""
         mock_service.find_similar.return_value = None
@@ -118,7 +185,7 @@ class TestSimilarSearch:
         response = client.get("/v1/semantic_search/similar/9999")
         assert response.status_code == 404
 
-    @patch("app.api.v1.search.search_service")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
     def test_find_similar_with_params(self, mock_service, client):
         """Debe respetar parámetros de limit y score_threshold."""
         mock_service.find_similar.return_value = []
@@ -130,3 +197,350 @@ class TestSimilarSearch:
             limit=3,
             score_threshold=0.8
         )
+
+
+class TestSimilarCache:
+    """Tests para la caché por versión del índice y ETag de /similar/{id}"""
+
+    @patch("app.api.v1.search.similar_cache.set_cached_similar", new_callable=AsyncMock)
+    @patch("app.api.v1.search.similar_cache.get_cached_similar", new_callable=AsyncMock, return_value=None)
+    @patch("app.api.v1.search.similar_cache.get_index_version", new_callable=AsyncMock, return_value=7)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_miss_sets_etag_and_caches(self, mock_service, mock_version, mock_get, mock_set, client):
+        """En un miss debe consultar Qdrant, cachear y devolver ETag de la versión."""
+        mock_service.find_similar.return_value = [{"id": 2, "name": "Carlos López", "score": 0.91}]
+
+        response = client.get("/v1/semantic_search/similar/1")
+        assert response.status_code == 200
+        assert "idx7-1-5-0.0" in response.headers["etag"]
+        assert "no-cache" in response.headers["cache-control"]
+        mock_set.assert_called_once()
+        assert mock_set.call_args[0][:4] == (1, 5, 0.0, 7)
+
+    @patch("app.api.v1.search.similar_cache.get_cached_similar", new_callable=AsyncMock)
+    @patch("app.api.v1.search.similar_cache.get_index_version", new_callable=AsyncMock, return_value=7)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_hit_skips_qdrant(self, mock_service, mock_version, mock_get, client):
+        """En un hit no debe consultarse Qdrant."""
+        mock_get.return_value = {"query": "Similares al candidato", "total_results": 0, "results": []}
+
+        response = client.get("/v1/semantic_search/similar/1")
+        assert response.status_code == 200
+        mock_service.find_similar.assert_not_called()
+
+    @patch("app.api.v1.search.similar_cache.get_cached_similar", new_callable=AsyncMock)
+    @patch("app.api.v1.search.similar_cache.get_index_version", new_callable=AsyncMock, return_value=7)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_if_none_match_returns_304(self, mock_service, mock_version, mock_get, client):
+        """Con un ETag vigente debe responder 304 sin tocar caché ni Qdrant."""
+        response = client.get(
+            "/v1/semantic_search/similar/1",
+            headers={"If-None-Match": 'W/"idx7-1-5-0.0"'}
+        )
+        assert response.status_code == 304
+        mock_get.assert_not_called()
+        mock_service.find_similar.assert_not_called()
+
+    @patch("app.api.v1.search.similar_cache.get_index_version", new_callable=AsyncMock, return_value=8)
+    @patch("app.api.v1.search.similar_cache.get_cached_similar", new_callable=AsyncMock, return_value=None)
+    @patch("app.api.v1.search.similar_cache.set_cached_similar", new_callable=AsyncMock)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_stale_etag_after_index_change(self, mock_service, mock_set, mock_get, mock_version, client):
+        """Si el índice cambió, el ETag anterior ya no es válido."""
+        mock_service.find_similar.return_value = []
+
+        response = client.get(
+            "/v1/semantic_search/similar/1",
+            headers={"If-None-Match": 'W/"idx7-1-5-0.0"'}
+        )
+        assert response.status_code == 200
+        assert "idx8" in response.headers["etag"]
+
+    @patch("app.api.v1.search.hydrate_hits", new_callable=AsyncMock)
+    @patch("app.api.v1.search.similar_cache.get_cached_similar", new_callable=AsyncMock)
+    @patch("app.api.v1.search.similar_cache.get_index_version", new_callable=AsyncMock, return_value=7)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_hydrate_skips_etag(self, mock_service, mock_version, mock_get, mock_hydrate, client):
+        """Con hydrate=true no debe responder 304 ni emitir ETag: el candidato puede cambiar sin cambiar el índice."""
+        mock_get.return_value = {"query": "Similares al candidato", "total_results": 1, "results": [{"id": 2, "score": 0.9}]}
+        mock_hydrate.return_value = [[{"id": 2, "score": 0.9, "candidate": {"name": "Carlos López"}}]]
+
+        response = client.get(
+            "/v1/semantic_search/similar/1",
+            params={"hydrate": True},
+            headers={"If-None-Match": 'W/"idx7-1-5-0.0"'}
+        )
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.json()["results"][0]["candidate"]["name"] == "Carlos López"
+        mock_service.find_similar.assert_not_called()
+
+class TestQueryCacheStats:
+    """Tests para GET /v1/semantic_search/cache/stats"""
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_cache_stats(self, mock_service, client):
+        """Debe exponer las métricas de la caché de embeddings."""
+        mock_service.query_cache = MagicMock()
+        mock_service.query_cache.stats.return_value = {
+            "lru_hits": 3, "redis_hits": 1, "misses": 1, "hit_ratio": 0.8
+        }
+
+        response = client.get("/v1/semantic_search/cache/stats")
+        assert response.status_code == 200
+        assert response.json()["hit_ratio"] == 0.8
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_embedder_stats(self, mock_service, client):
+        """Debe exponer las métricas del micro-batching de embeddings."""
+        mock_service.query_embedder = MagicMock()
+        mock_service.query_embedder.stats.return_value = {
+            "requests": 10, "deduplicated": 2, "provider_calls": 3, "avg_batch_size": 2.67
+        }
+
+        response = client.get("/v1/semantic_search/embedder/stats")
+        assert response.status_code == 200
+        assert response.json()["provider_calls"] == 3
+
+
+class TestHydration:
+    """Tests para hydrate=true (hidratación batch desde Postgres)"""
+
+    @patch("app.core.hydration.enqueue_delete_points")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_hydrate_preserves_order_and_drops_ghosts(self, mock_service, mock_delete, client, sample_candidate):
+        """Debe adjuntar el candidato, respetar el orden por score y descartar vectores huérfanos."""
+        client.post("/v1/candidate/", json=sample_candidate)
+        client.post("/v1/candidate/", json={
+            **sample_candidate, "name": "Carlos López", "email": "carlos@example.com", "phone": "+5491155550000"
+        })
+        ids = [c["id"] for c in client.get("/v1/candidate/").json()]
+
+        mock_service.search.return_value = [
+            {"id": ids[1], "score": 0.95},
+            {"id": 9999, "score": 0.9},
+            {"id": ids[0], "score": 0.8},
+        ]
+
+        response = client.post("/v1/semantic_search/", json={"query": "python developer", "hydrate": True})
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["id"] for r in data["results"]] == [ids[1], ids[0]]
+        assert data["total_results"] == 2
+        assert data["results"][0]["candidate"]["name"] == "Carlos López"
+        assert data["results"][1]["candidate"]["email"] == sample_candidate["email"]
+        assert "last_indexed_at" not in data["results"][0]["candidate"]
+        mock_delete.assert_called_once_with([9999], requested_by="fastapi:hydrate")
+
+    @patch("app.core.index_queue.get_redis_client")
+    def test_ghost_deletes_are_deduplicated(self, mock_redis):
+        """Los huérfanos ya encolados (SET NX fallido) no deben volver a encolarse."""
+        from app.core.index_queue import enqueue_delete_points
+
+        client = mock_redis.return_value
+        client.pipeline.return_value.execute.return_value = [True, False, True]
+
+        enqueue_delete_points([7, 8, 9], requested_by="fastapi:hydrate")
+
+        pipe = client.pipeline.return_value
+        assert [c.args[0] for c in pipe.set.call_args_list] == [
+            "delete_point:pending:7", "delete_point:pending:8", "delete_point:pending:9"
+        ]
+        assert all(c.kwargs == {"nx": True, "ex": 60} for c in pipe.set.call_args_list)
+        client.rpush.assert_called_once()
+        payloads = [json.loads(p) for p in client.rpush.call_args.args[1:]]
+        assert [p["candidate_id"] for p in payloads] == [7, 9]
+        assert {p["job_type"] for p in payloads} == {"delete_point"}
+
+    @patch("app.core.index_queue.get_redis_client")
+    def test_ghost_deletes_skip_rpush_when_all_pending(self, mock_redis):
+        """Si todos los huérfanos ya están encolados no debe hacerse RPUSH."""
+        from app.core.index_queue import enqueue_delete_points
+
+        client = mock_redis.return_value
+        client.pipeline.return_value.execute.return_value = [False]
+
+        enqueue_delete_points([7])
+
+        client.rpush.assert_not_called()
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_no_hydration_by_default(self, mock_service, client):
+        """Sin hydrate no debe consultarse Postgres ni agregarse `candidate`."""
+        mock_service.search.return_value = [{"id": 1, "score": 0.9}]
+
+        with patch("app.api.v1.search.hydrate_hits") as mock_hydrate:
+            response = client.post("/v1/semantic_search/", json={"query": "python developer"})
+
+        assert "candidate" not in response.json()["results"][0]
+        mock_hydrate.assert_not_called()
+
+
+class TestSearchCursor:
+    """Tests para la paginación por cursor de /v1/semantic_search/"""
+
+    @staticmethod
+    def _results(n, start=1):
+        return [{"id": i, "name": f"Candidato {i}", "score": 1 - i / 100} for i in range(start, start + n)]
+
+    def _state(self, window, complete):
+        return {
+            "query": "python backend", "limit": 5, "score_threshold": 0.2,
+            "skills_filter": None, "name_filter": None, "vector": [0.1, 0.2],
+            "window": window, "window_complete": complete
+        }
+
+    @patch("app.api.v1.search.search_cursor.create_cursor", new_callable=AsyncMock, return_value="tok")
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_first_page_prefetches_window(self, mock_service, mock_create, client):
+        """La primera página debe pedir 5 páginas de una vez y guardar el vector en el cursor."""
+        mock_service.embed_query.return_value = [0.1, 0.2]
+        mock_service.search.return_value = self._results(12)
+
+        response = client.post("/v1/semantic_search/", json={"query": "python backend", "limit": 5, "paginate": True})
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["id"] for r in data["results"]] == [1, 2, 3, 4, 5]
+        assert data["next_cursor"] == "tok"
+        assert mock_service.search.call_args[1]["limit"] == 25
+        assert mock_service.search.call_args[1]["query_vector"] == [0.1, 0.2]
+        assert len(mock_create.call_args[0][2]) == 12
+
+    @patch("app.api.v1.search.search_cursor.load_cursor", new_callable=AsyncMock)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_next_page_served_from_window(self, mock_service, mock_load, client):
+        """Dentro de la ventana no debe re-embeberse ni consultarse Qdrant."""
+        from app.core.search_cursor import encode_cursor, decode_cursor
+        mock_load.return_value = self._state(self._results(12), complete=True)
+
+        response = client.get("/v1/semantic_search/next", params={"cursor": encode_cursor("abc", 10)})
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["id"] for r in data["results"]] == [11, 12]
+        assert data["next_cursor"] is None
+        mock_service.search.assert_not_called()
+        mock_service.embed_query.assert_not_called()
+        assert decode_cursor(encode_cursor("abc", 10)) == ("abc", 10)
+
+    @patch("app.api.v1.search.search_cursor.load_cursor", new_callable=AsyncMock)
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_next_page_beyond_window_uses_offset(self, mock_service, mock_load, client):
+        """Más allá de la ventana debe consultar Qdrant con offset y el vector guardado."""
+        from app.core.search_cursor import encode_cursor
+        mock_load.return_value = self._state(self._results(25), complete=False)
+        mock_service.search.return_value = self._results(5, start=26)
+
+        response = client.get("/v1/semantic_search/next", params={"cursor": encode_cursor("abc", 25)})
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] == encode_cursor("abc", 30)
+        kwargs = mock_service.search.call_args[1]
+        assert kwargs["offset"] == 25
+        assert kwargs["query_vector"] == [0.1, 0.2]
+
+    @patch("app.api.v1.search.search_cursor.load_cursor", new_callable=AsyncMock, return_value=None)
+    def test_expired_and_invalid_cursor(self, mock_load, client):
+        """Un cursor expirado debe dar 410 y uno mal formado 400."""
+        from app.core.search_cursor import encode_cursor
+        assert client.get("/v1/semantic_search/next", params={"cursor": encode_cursor("abc", 5)}).status_code == 410
+        assert client.get("/v1/semantic_search/next", params={"cursor": "%%%"}).status_code == 400
+
+
+class TestSearchBatch:
+    """Tests para POST /v1/semantic_search/batch"""
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_search_batch_reports_errors_per_query(self, mock_service, client):
+        """Debe responder en orden y reportar la query fallida sin tumbar el lote."""
+        mock_service.search_batch.return_value = [
+            {"results": [{"id": 1, "name": "Ana García", "score": 0.95}]},
+            {"error": "Error en la búsqueda: timeout"},
+        ]
+
+        response = client.post("/v1/semantic_search/batch", json={"queries": [
+            {"query": "python backend", "limit": 5},
+            {"query": "react senior", "skills_filter": ["React"]},
+        ]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_queries"] == 2
+        assert data["failed"] == 1
+        assert data["results"][0]["total_results"] == 1
+        assert data["results"][1]["error"] == "Error en la búsqueda: timeout"
+        queries = mock_service.search_batch.call_args[0][0]
+        assert queries[0]["query_text"] == "python backend"
+        assert queries[1]["skills_filter"] == ["React"]
+
+    def test_search_batch_invalid_query(self, client):
+        """Debe retornar 422 si alguna query no cumple el schema."""
+        response = client.post("/v1/semantic_search/batch", json={"queries": [{"query": "ab"}]})
+        assert response.status_code == 422
+
+
+class TestSimilarBatch:
+    """Tests para POST /v1/semantic_search/similar/batch"""
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_similar_batch(self, mock_service, client):
+        """Debe retornar similares por candidato en el orden recibido."""
+        mock_service.find_similar_batch.return_value = {
+            2: [{"id": 3, "name": "Carlos López", "score": 0.91}],
+            1: None,
+        }
+
+        response = client.post("/v1/semantic_search/similar/batch", json={
+            "candidate_ids": [2, 1, 2],
+            "limit": 3
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_candidates"] == 2
+        assert [item["candidate_id"] for item in data["results"]] == [2, 1]
+        assert data["results"][0]["total_results"] == 1
+        assert data["results"][1]["found"] is False
+        mock_service.find_similar_batch.assert_called_once_with(
+            candidate_ids=[2, 1, 2],
+            limit=3,
+            score_threshold=0.0
+        )
+
+    def test_similar_batch_empty_ids(self, client):
+        """Debe retornar 422 sin candidate_ids."""
+        response = client.post("/v1/semantic_search/similar/batch", json={"candidate_ids": []})
+        assert response.status_code == 422
+
+
+class TestRecommend:
+    """Tests para POST /v1/semantic_search/recommend"""
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_recommend_passes_examples_and_strategy(self, mock_service, client):
+        """Debe hacer una sola llamada con positivos, negativos y estrategia."""
+        mock_service.recommend.return_value = [{"id": 7, "score": 0.88, "name": "Carlos López"}]
+
+        response = client.post("/v1/semantic_search/recommend", json={
+            "positive_ids": [1, 2, 3],
+            "negative_ids": [4],
+            "strategy": "best_score",
+            "limit": 5
+        })
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["id"] == 7
+        mock_service.recommend.assert_called_once()
+        kwargs = mock_service.recommend.call_args[1]
+        assert kwargs["positive_ids"] == [1, 2, 3]
+        assert kwargs["negative_ids"] == [4]
+        assert kwargs["strategy"] == "best_score"
+
+    @patch("app.api.v1.search.search_service", new_callable=_search_service_mock)
+    def test_recommend_unknown_example(self, mock_service, client):
+        """Debe retornar 404 si algún ejemplo no está indexado."""
+        mock_service.recommend.return_value = None
+
+        response = client.post("/v1/semantic_search/recommend", json={"positive_ids": [999]})
+        assert response.status_code == 404
+
+    def test_recommend_validation(self, client):
+        """Debe exigir al menos un positivo y una estrategia válida."""
+        assert client.post("/v1/semantic_search/recommend", json={"positive_ids": []}).status_code == 422
+        assert client.post("/v1/semantic_search/recommend", json={"positive_ids": [1], "strategy": "max"}).status_code == 422
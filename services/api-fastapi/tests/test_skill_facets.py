@@ -0,0 +1,30 @@
+"""
+Tests unitarios para la normalización de skills.
+
+¿Por qué testear normalize_skills?
+- Replica la función SQL `normalize_skills()` que mantiene `skill_tags` por trigger:
+  si divergen, el filtro por skills y las facetas no coincidirían con lo guardado
+- El filtro en Postgres debe resolverse con `@>` sobre el array (índice GIN)
+"""
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.skill_facets import normalize_skills, skills_clause
+
+
+class TestNormalizeSkills:
+    """Tests para normalize_skills y skills_clause."""
+
+    def test_canonical_form(self):
+        """Minúsculas, espacios colapsados, sin vacíos ni duplicados y ordenadas."""
+        raw = " Python,FastAPI ,  python, Machine   Learning,,"
+        assert normalize_skills(raw) == ["fastapi", "machine learning", "python"]
+        assert normalize_skills(None) == []
+        assert normalize_skills("") == []
+
+    def test_postgres_clause_uses_array_containment(self):
+        """En Postgres el filtro es `skill_tags @> ARRAY[...]` con las skills canónicas."""
+        clause = skills_clause(["Docker", " AWS "], "postgresql")
+        compiled = clause.compile(dialect=postgresql.psycopg2.dialect())
+        assert str(compiled) == "candidates.skill_tags @> %(candidates_skill_tags_1)s::TEXT[]"
+        assert compiled.params == {"candidates_skill_tags_1": ["aws", "docker"]}
@@ -31,9 +31,11 @@ def create_app():
 
     from app.api.etl_routes import etl_bp
     from app.api.qdrant_routes import qdrant_bp
+    from app.api.import_routes import import_bp
     
     app.register_blueprint(etl_bp)
     app.register_blueprint(qdrant_bp)
+    app.register_blueprint(import_bp)
 
     @app.route('/health')
     def health():
@@ -0,0 +1,43 @@
+from flask import Blueprint, jsonify, make_response, request
+from app.services.import_manager import ImportManager
+
+import_bp = Blueprint('import', __name__, url_prefix='/v1/admin/import')
+import_service = ImportManager()
+
+@import_bp.route('', methods=['POST'])
+def start_import():
+    """
+    Importa candidatos desde un CSV o NDJSON subido (multipart, campo `file`).
+    El import corre en segundo plano; el progreso se consulta con el job_id.
+    """
+    upload = request.files.get('file')
+    if upload is None:
+        return make_response(jsonify({"error": "Falta el archivo (campo 'file')"}), 400)
+
+    fmt = request.args.get('format')
+    if fmt not in (None, 'csv', 'ndjson'):
+        return make_response(jsonify({"error": "Formato no soportado (csv o ndjson)"}), 400)
+
+    try:
+        result = import_service.start_import(
+            upload, fmt, requested_by=request.form.get('requested_by', 'api')
+        )
+        return jsonify({
+            "status": "accepted",
+            "message": "Import started",
+            "data": result
+        }), 202
+    except Exception as e:
+        return make_response(jsonify({
+            "error": str(e)
+        }), 500)
+
+@import_bp.route('/<job_id>', methods=['GET'])
+def import_status(job_id):
+    try:
+        status = import_service.get_status(job_id)
+        if status is None:
+            return make_response(jsonify({"error": "Import no encontrado"}), 404)
+        return jsonify(status), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, make_response
 from qdrant_client import QdrantClient
 from qdrant_client.models import Filter
 from pipelines.etl.main import DB_URL, run_pipeline
+from pipelines.utils.index_version import bump_index_version
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -86,6 +87,7 @@ def clear_collection():
             collection_name="candidates",
             points_selector=Filter(must=[])
         )
+        bump_index_version(etl_service.redis_client)
         
         engine = create_engine(settings.DATABASE_URL)
         with engine.connect() as conn:
@@ -131,10 +133,10 @@ def rebuild_collection_sync():
     try:
         client = QdrantClient(url=settings.QDRANT_URL)
         
-        client.delete(
-            collection_name="candidates",
-            points_selector=Filter(must=[])
-        )
+        # Se borra la colección entera (no solo los puntos): el pipeline la
+        # recrea con la configuración actual (vector disperso, cuantización)
+        client.delete_collection(collection_name="candidates")
+        bump_index_version(etl_service.redis_client)
         
         engine = create_engine(settings.DATABASE_URL)
         with engine.connect() as conn:
@@ -0,0 +1,69 @@
+from pipelines.etl.importer import CandidateImporter, detect_format
+from app.core.config import settings
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class ImportManager:
+    def __init__(self):
+        self.redis_client = redis.from_url(settings.REDIS_URL)
+
+    def start_import(self, file_storage, fmt: str = None, requested_by: str = "api"):
+        """
+        Guarda el archivo subido en disco y lanza el import en segundo plano.
+
+        El upload se copia en streaming a un archivo temporal (memoria constante):
+        el stream de la request deja de estar disponible cuando la respuesta 202
+        ya se envió.
+
+        Args:
+            file_storage: Archivo subido (werkzeug FileStorage)
+            fmt: 'csv' o 'ndjson' (por defecto se deduce de la extensión)
+            requested_by: Usuario o sistema que solicita el import
+
+        Returns:
+            dict: ID del import y formato detectado
+        """
+        fmt = fmt or detect_format(file_storage.filename or "")
+        job_id = uuid.uuid4().hex
+
+        fd, path = tempfile.mkstemp(prefix="candidates_import_", suffix=f".{fmt}")
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(file_storage.stream, f)
+
+        self.redis_client.set(
+            f"import:job:{job_id}",
+            json.dumps({"status": "queued", "format": fmt, "requested_by": requested_by})
+        )
+        threading.Thread(
+            target=self._run, args=(path, fmt, job_id, requested_by), daemon=True
+        ).start()
+
+        return {"job_id": job_id, "format": fmt, "status": "queued"}
+
+    def _run(self, path: str, fmt: str, job_id: str, requested_by: str):
+        try:
+            with open(path, "rb") as f:
+                CandidateImporter(settings.DATABASE_URL, self.redis_client).import_stream(
+                    f, fmt, job_id, requested_by=requested_by
+                )
+        except Exception as e:
+            # El estado "error" ya quedó publicado en Redis por el importador
+            logger.error(f"Error importando candidatos ({job_id}): {e}")
+        finally:
+            os.remove(path)
+
+    def get_status(self, job_id: str):
+        """Progreso del import publicado en Redis, o None si no existe."""
+        data = self.redis_client.get(f"import:job:{job_id}")
+        return json.loads(data) if data else None
@@ -0,0 +1,93 @@
+"""
+Tests para los endpoints de importación masiva (Admin API - Flask).
+
+¿Por qué testear las rutas de import?
+- El upload debe validarse antes de lanzar un import de cientos de miles de filas
+- El endpoint responde 202 sin esperar al import; el progreso se consulta aparte
+- ImportManager se mockea: COPY y la fusión se prueban en pipelines/tests
+
+Cobertura:
+- POST /v1/admin/import → 202 con job_id, 400 sin archivo o con formato inválido
+- GET /v1/admin/import/<job_id> → progreso y 404
+"""
+
+import io
+import os
+from unittest.mock import patch
+
+
+class TestImportRoutes:
+    """Tests para /v1/admin/import"""
+
+    @patch("app.api.import_routes.import_service")
+    def test_start_import(self, mock_service, client):
+        """Debe aceptar el archivo y retornar el job_id con 202."""
+        mock_service.start_import.return_value = {"job_id": "abc", "format": "csv", "status": "queued"}
+
+        response = client.post(
+            "/v1/admin/import",
+            data={"file": (io.BytesIO(b"name,email,phone\n"), "ats.csv"), "requested_by": "admin"},
+            content_type="multipart/form-data"
+        )
+
+        assert response.status_code == 202
+        assert response.get_json()["data"]["job_id"] == "abc"
+        upload, fmt = mock_service.start_import.call_args[0]
+        assert upload.filename == "ats.csv" and fmt is None
+        assert mock_service.start_import.call_args.kwargs["requested_by"] == "admin"
+
+    @patch("app.api.import_routes.import_service")
+    def test_start_import_validation(self, mock_service, client):
+        """Sin archivo o con un formato desconocido debe retornar 400."""
+        assert client.post("/v1/admin/import").status_code == 400
+        response = client.post(
+            "/v1/admin/import?format=xlsx",
+            data={"file": (io.BytesIO(b""), "ats.xlsx")},
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 400
+        mock_service.start_import.assert_not_called()
+
+    @patch("app.api.import_routes.import_service")
+    def test_import_status(self, mock_service, client):
+        """Debe retornar el progreso publicado en Redis o 404."""
+        mock_service.get_status.return_value = {"status": "loading", "processed": 10000}
+        assert client.get("/v1/admin/import/abc").get_json()["processed"] == 10000
+
+        mock_service.get_status.return_value = None
+        assert client.get("/v1/admin/import/otro").status_code == 404
+
+
+class TestImportManager:
+    """Tests unitarios para ImportManager."""
+
+    @patch("app.services.import_manager.CandidateImporter")
+    @patch("app.services.import_manager.redis.from_url")
+    def test_start_import_runs_from_temp_file(self, mock_redis_url, mock_importer_cls):
+        """El upload se copia a un archivo temporal que el import lee y luego se elimina."""
+        from werkzeug.datastructures import FileStorage
+        from app.services.import_manager import ImportManager
+
+        seen = {}
+
+        def fake_import(stream, fmt, job_id, requested_by):
+            seen.update(path=stream.name, content=stream.read(), fmt=fmt, requested_by=requested_by)
+
+        mock_importer_cls.return_value.import_stream.side_effect = fake_import
+
+        class InlineThread:
+            def __init__(self, target, args, daemon):
+                self.target, self.args = target, args
+
+            def start(self):
+                self.target(*self.args)
+
+        with patch("app.services.import_manager.threading.Thread", InlineThread):
+            result = ImportManager().start_import(
+                FileStorage(io.BytesIO(b'{"name": "Ana"}\n'), filename="export.ndjson"), requested_by="admin"
+            )
+
+        assert result["format"] == "ndjson" and result["status"] == "queued"
+        assert seen["content"] == b'{"name": "Ana"}\n'
+        assert (seen["fmt"], seen["requested_by"]) == ("ndjson", "admin")
+        assert not os.path.exists(seen["path"])
@@ -126,6 +126,44 @@ impl DatabaseService {
         }))
     }
 
+    /// Obtiene varios candidatos por ID con una sola consulta (batch_index)
+    pub async fn get_candidates_by_ids(&self, candidate_ids: &[i32]) -> Result<Vec<Candidate>> {
+        if candidate_ids.is_empty() {
+            return Ok(vec![]);
+        }
+
+        let query = "
+            SELECT id, 
+                   COALESCE(name, '') as name, 
+                   COALESCE(summary, '') as summary, 
+                   COALESCE(skills, '') as skills, 
+                   COALESCE(experience, '') as experience, 
+                   COALESCE(updated_at::text, '') as updated_at
+            FROM candidates
+            WHERE id = ANY($1)
+        ";
+
+        let rows = timeout(
+            Duration::from_secs(10),
+            self.client.query(query, &[&candidate_ids])
+        )
+        .await
+        .context("Query for candidates by IDs timed out")?
+        .context("Failed to query candidates by IDs")?;
+
+        Ok(rows
+            .iter()
+            .map(|row| Candidate {
+                id: row.get(0),
+                name: row.get(1),
+                summary: row.get(2),
+                skills: row.get(3),
+                experience: row.get(4),
+                updated_at: row.get(5),
+            })
+            .collect())
+    }
+
     /// Resetea last_indexed_at para todos los candidatos (full reindex)
     pub async fn reset_all_indexed(&self) -> Result<u64> {
         let query = "UPDATE candidates SET last_indexed_at = NULL";
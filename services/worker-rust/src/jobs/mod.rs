@@ -3,5 +3,7 @@ pub mod types;
 pub mod database;
 pub mod embeddings;
 pub mod qdrant_service;
+pub mod skills;
+pub mod sparse;
 
 pub use processor::JobProcessor;
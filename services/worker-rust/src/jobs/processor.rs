@@ -1,15 +1,34 @@
-use super::database::DatabaseService;
+use super::database::{Candidate, DatabaseService};
 use super::embeddings::EmbeddingsService;
-use super::qdrant_service::QdrantService;
+use super::qdrant_service::{PointData, QdrantService};
+use super::skills::{normalize_skills, SKILLS_PAYLOAD_KEY};
+use super::sparse::document_sparse_vector;
 use super::types::{JobPayload, JobType};
+use crate::queue::RedisQueue;
 use anyhow::{Context, Result};
+use redis::aio::MultiplexedConnection;
+use serde_json::{json, Value};
 use std::collections::HashMap;
 use tracing::{info, warn};
 
+/// Textos por llamada de embeddings en batch_index (límite de la API de Cohere)
+const EMBED_BATCH_SIZE: usize = 96;
+
+/// Payload del punto en Qdrant (mismos campos que el Transformer de Python)
+fn point_payload(candidate: &Candidate, text_content: &str) -> HashMap<String, Value> {
+    HashMap::from([
+        ("name".to_string(), json!(candidate.name)),
+        ("text_content".to_string(), json!(text_content)),
+        ("updated_at".to_string(), json!(candidate.updated_at)),
+        (SKILLS_PAYLOAD_KEY.to_string(), json!(normalize_skills(&candidate.skills))),
+    ])
+}
+
 pub struct JobProcessor {
     db: DatabaseService,
     embeddings: EmbeddingsService,
     qdrant: QdrantService,
+    redis: MultiplexedConnection,
 }
 
 impl JobProcessor {
@@ -20,6 +39,7 @@ impl JobProcessor {
         embedding_model: String,
         embedding_dimension: usize,
         embedding_distance: String,
+        redis: MultiplexedConnection,
     ) -> Result<Self> {
         let db = DatabaseService::new(&database_url)
             .await
@@ -42,9 +62,19 @@ impl JobProcessor {
             db,
             embeddings,
             qdrant,
+            redis,
         })
     }
 
+    /// Incrementa la versión del índice para invalidar cachés de similares.
+    /// Un fallo de Redis no debe hacer fallar un job que ya modificó Qdrant.
+    async fn bump_index_version(&self) {
+        let mut conn = self.redis.clone();
+        if let Err(e) = RedisQueue::bump_index_version(&mut conn).await {
+            warn!("Failed to bump index version: {:?}", e);
+        }
+    }
+
     pub async fn process(&self, payload: &str) -> Result<()> {
         let job: JobPayload = serde_json::from_str(payload)
             .context("Failed to parse job JSON payload")?;
@@ -64,6 +94,10 @@ impl JobProcessor {
                 info!("Job type: Single Index");
                 self.process_single_index(&job).await?;
             }
+            JobType::BatchIndex => {
+                info!("Job type: Batch Index");
+                self.process_batch_index(&job).await?;
+            }
             JobType::DeletePoint => {
                 info!("Job type: Delete Point");
                 self.process_delete_point(&job).await?;
@@ -133,12 +167,12 @@ impl JobProcessor {
         // Build points data combining candidates + vectors + payloads
         let mut points_data = Vec::new();
         for (i, candidate) in candidates.iter().enumerate() {
-            let mut payload = HashMap::new();
-            payload.insert("name".to_string(), candidate.name.clone());
-            payload.insert("text_content".to_string(), context_texts[i].clone());
-            payload.insert("updated_at".to_string(), candidate.updated_at.clone());
-
-            points_data.push((candidate.id, vectors[i].clone(), payload));
+            points_data.push(PointData {
+                id: candidate.id,
+                vector: vectors[i].clone(),
+                sparse: document_sparse_vector(&context_texts[i]),
+                payload: point_payload(candidate, &context_texts[i]),
+            });
         }
 
         // 4. Load: Upsert points to Qdrant
@@ -147,6 +181,7 @@ impl JobProcessor {
             .load_points(points_data)
             .await
             .context("Failed to load points to Qdrant")?;
+        self.bump_index_version().await;
 
         // 5. Mark candidates as indexed
         info!("Marking candidates as indexed in database...");
@@ -210,14 +245,13 @@ impl JobProcessor {
         let vector = vectors.into_iter().next()
             .context("No embedding returned for candidate")?;
 
-        // 4. Upsert to Qdrant
-        let mut payload = HashMap::new();
-        payload.insert("name".to_string(), candidate.name.clone());
-        payload.insert("text_content".to_string(), context_text);
-        payload.insert("updated_at".to_string(), candidate.updated_at.clone());
+        // 4. Upsert to Qdrant (dense + BM25 keywords, like the Python ETL)
+        let sparse = document_sparse_vector(&context_text);
+        let payload = point_payload(&candidate, &context_text);
 
-        self.qdrant.load_points(vec![(candidate.id, vector, payload)]).await
+        self.qdrant.load_points(vec![PointData { id: candidate.id, vector, sparse, payload }]).await
             .context("Failed to upsert single point to Qdrant")?;
+        self.bump_index_version().await;
 
         // 5. Mark as indexed
         self.db.mark_as_indexed(&[candidate.id]).await
@@ -227,6 +261,67 @@ impl JobProcessor {
         Ok(())
     }
 
+    /// Indexa un lote de candidatos por ID (para el alta/edición masiva de la API)
+    async fn process_batch_index(&self, job: &JobPayload) -> Result<()> {
+        let candidate_ids = job.candidate_ids.as_deref().context(
+            "batch_index job requires candidate_ids"
+        )?;
+
+        info!("Indexing batch of {} candidates", candidate_ids.len());
+
+        self.qdrant.ensure_collection().await
+            .context("Failed to ensure Qdrant collection")?;
+
+        let candidates = self.db.get_candidates_by_ids(candidate_ids).await
+            .context("Failed to get candidates from database")?;
+
+        if candidates.len() < candidate_ids.len() {
+            warn!(
+                "{} candidates of the batch not found in database, skipping them",
+                candidate_ids.len() - candidates.len()
+            );
+        }
+
+        for chunk in candidates.chunks(EMBED_BATCH_SIZE) {
+            let context_texts: Vec<String> = chunk
+                .iter()
+                .map(|c| {
+                    format!(
+                        "{} | {} | Skills: {} | Experience: {}",
+                        c.name, c.summary, c.skills, c.experience
+                    )
+                })
+                .collect();
+
+            let vectors = self.embeddings
+                .generate_embeddings_batch(context_texts.clone())
+                .await
+                .context("Failed to generate embeddings for candidate batch")?;
+
+            let mut points_data = Vec::new();
+            for (i, candidate) in chunk.iter().enumerate() {
+                points_data.push(PointData {
+                    id: candidate.id,
+                    vector: vectors[i].clone(),
+                    sparse: document_sparse_vector(&context_texts[i]),
+                    payload: point_payload(candidate, &context_texts[i]),
+                });
+            }
+
+            self.qdrant.load_points(points_data).await
+                .context("Failed to upsert batch points to Qdrant")?;
+            self.bump_index_version().await;
+
+            // Marcar por bloque: si un bloque posterior falla, el ETL recoge solo lo pendiente
+            let chunk_ids: Vec<i32> = chunk.iter().map(|c| c.id).collect();
+            self.db.mark_as_indexed(&chunk_ids).await
+                .context("Failed to mark candidate batch as indexed")?;
+        }
+
+        info!("Batch of {} candidates indexed successfully", candidates.len());
+        Ok(())
+    }
+
     /// Elimina un punto de Qdrant (para delete automático)
     async fn process_delete_point(&self, job: &JobPayload) -> Result<()> {
         let candidate_id = job.candidate_id.context(
@@ -237,6 +332,7 @@ impl JobProcessor {
 
         self.qdrant.delete_point(candidate_id).await
             .context("Failed to delete point from Qdrant")?;
+        self.bump_index_version().await;
 
         info!("Point for candidate {} deleted successfully", candidate_id);
         Ok(())
@@ -247,9 +343,10 @@ impl JobProcessor {
         info!("Starting full reindex");
         info!("Requested by: {:?}", job.requested_by);
 
-        // 1. Clear all points from Qdrant
-        self.qdrant.clear_all_points().await
-            .context("Failed to clear Qdrant collection")?;
+        // 1. Recreate the Qdrant collection (drops every point and applies the current config)
+        self.qdrant.recreate_collection().await
+            .context("Failed to recreate Qdrant collection")?;
+        self.bump_index_version().await;
 
         // 2. Reset all last_indexed_at in database
         let reset_count = self.db.reset_all_indexed().await
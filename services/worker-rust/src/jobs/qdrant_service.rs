@@ -1,21 +1,39 @@
+use super::skills::SKILLS_PAYLOAD_KEY;
 use anyhow::{Context, Result};
 use qdrant_client::{
     client::QdrantClient,
     qdrant::{
-        vectors_config::Config, CreateCollection, Distance, Filter, PointStruct,
-        PointsSelector, VectorParams, VectorsConfig,
+        payload_index_params::IndexParams, vectors_config::Config, CreateCollection, Distance,
+        FieldType, Modifier, PayloadIndexParams, PayloadSchemaInfo, PointStruct, PointsSelector,
+        SparseVectorConfig, SparseVectorParams, TextIndexParams, TokenizerType, Vector,
+        VectorParams, VectorsConfig,
     },
 };
-use serde_json::Map;
+use serde_json::{Map, Value};
 use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, Ordering};
 use std::time::Duration;
-use tracing::info;
+use tracing::{info, warn};
+
+/// Vector disperso de palabras clave (mismo nombre que `SPARSE_VECTOR_NAME` en pipelines)
+pub const SPARSE_VECTOR_NAME: &str = "keywords";
+
+/// Punto a indexar: vector denso, disperso de palabras clave (vacío si no hay
+/// términos) y payload
+pub struct PointData {
+    pub id: i32,
+    pub vector: Vec<f32>,
+    pub sparse: Vec<(u32, f32)>,
+    pub payload: HashMap<String, Value>,
+}
 
 pub struct QdrantService {
     client: QdrantClient,
     collection_name: String,
     dimension: u64,
     distance: Distance,
+    /// Si la colección tiene el vector disperso (las anteriores a la búsqueda híbrida no)
+    sparse_enabled: AtomicBool,
 }
 
 impl QdrantService {
@@ -47,6 +65,7 @@ impl QdrantService {
             collection_name,
             dimension,
             distance,
+            sparse_enabled: AtomicBool::new(true),
         })
     }
 
@@ -76,37 +95,132 @@ impl QdrantService {
                             ..Default::default()
                         })),
                     }),
+                    // Vector disperso para la búsqueda híbrida; IDF en el servidor
+                    sparse_vectors_config: Some(SparseVectorConfig {
+                        map: HashMap::from([(
+                            SPARSE_VECTOR_NAME.to_string(),
+                            SparseVectorParams {
+                                modifier: Some(Modifier::Idf as i32),
+                                ..Default::default()
+                            },
+                        )]),
+                    }),
                     ..Default::default()
                 })
                 .await
                 .context("Failed to create Qdrant collection")?;
 
+            self.sparse_enabled.store(true, Ordering::Relaxed);
             info!("Collection created successfully: {}", self.collection_name);
+            self.ensure_payload_indexes(&HashMap::new()).await?;
         } else {
+            let info = self
+                .client
+                .collection_info(&self.collection_name)
+                .await
+                .context("Failed to get Qdrant collection info")?
+                .result
+                .unwrap_or_default();
+
+            let sparse_enabled = info
+                .config
+                .as_ref()
+                .and_then(|c| c.params.as_ref())
+                .and_then(|p| p.sparse_vectors_config.as_ref())
+                .is_some_and(|s| s.map.contains_key(SPARSE_VECTOR_NAME));
+            self.sparse_enabled.store(sparse_enabled, Ordering::Relaxed);
+
+            if !sparse_enabled {
+                // Qdrant no permite añadir el vector a una colección existente:
+                // se suben solo densos hasta que un full_reindex la recree
+                warn!(
+                    "Collection {} has no '{}' sparse vector, indexing dense vectors only (run a full reindex to enable hybrid search)",
+                    self.collection_name, SPARSE_VECTOR_NAME
+                );
+            }
             info!("Collection already exists: {}", self.collection_name);
+            self.ensure_payload_indexes(&info.payload_schema).await?;
+        }
+
+        Ok(())
+    }
+
+    /// Crea los índices de payload que faltan (los mismos que
+    /// `Loader.ensure_collection` en pipelines)
+    async fn ensure_payload_indexes(
+        &self,
+        existing: &HashMap<String, PayloadSchemaInfo>,
+    ) -> Result<()> {
+        // skills_filter compara skills completas (MatchAny) sobre este índice keyword
+        if !existing.contains_key(SKILLS_PAYLOAD_KEY) {
+            self.client
+                .create_field_index_blocking(
+                    &self.collection_name,
+                    SKILLS_PAYLOAD_KEY,
+                    FieldType::Keyword,
+                    None,
+                    None,
+                )
+                .await
+                .context("Failed to create skills payload index")?;
+            info!("Created payload index: {}", SKILLS_PAYLOAD_KEY);
+        }
+
+        // name_filter busca prefijos de palabra sin distinguir mayúsculas; el
+        // planificador de búsqueda estima su selectividad con este índice
+        if !existing.contains_key("name") {
+            let params = PayloadIndexParams {
+                index_params: Some(IndexParams::TextIndexParams(TextIndexParams {
+                    tokenizer: TokenizerType::Prefix as i32,
+                    lowercase: Some(true),
+                    ..Default::default()
+                })),
+            };
+            self.client
+                .create_field_index_blocking(
+                    &self.collection_name,
+                    "name",
+                    FieldType::Text,
+                    Some(&params),
+                    None,
+                )
+                .await
+                .context("Failed to create name payload index")?;
+            info!("Created payload index: name");
         }
 
         Ok(())
     }
 
-    /// Carga puntos en la colección de Qdrant
+    /// Si los puntos pueden llevar el vector disperso (tras `ensure_collection`)
+    pub fn sparse_enabled(&self) -> bool {
+        self.sparse_enabled.load(Ordering::Relaxed)
+    }
+
+    /// Carga puntos en la colección de Qdrant: vector denso (sin nombre) más
+    /// el disperso de palabras clave si tiene términos y la colección lo admite
     pub async fn load_points(
         &self,
-        points_data: Vec<(i32, Vec<f32>, HashMap<String, String>)>,
+        points_data: Vec<PointData>,
     ) -> Result<()> {
         if points_data.is_empty() {
             return Ok(());
         }
 
+        let sparse_enabled = self.sparse_enabled();
         let points: Vec<PointStruct> = points_data
             .into_iter()
-            .map(|(id, vector, payload)| {
-                let mut payload_map = Map::new();
-                for (k, v) in payload {
-                    payload_map.insert(k, serde_json::json!(v));
-                }
+            .map(|PointData { id, vector, sparse, payload }| {
+                let payload_map: Map<String, Value> = payload.into_iter().collect();
 
-                PointStruct::new(id as u64, vector, payload_map)
+                if !sparse_enabled || sparse.is_empty() {
+                    return PointStruct::new(id as u64, vector, payload_map);
+                }
+                let vectors: HashMap<String, Vector> = HashMap::from([
+                    (String::new(), Vector::from(vector)),
+                    (SPARSE_VECTOR_NAME.to_string(), Vector::from(sparse)),
+                ]);
+                PointStruct::new(id as u64, vectors, payload_map)
             })
             .collect();
 
@@ -142,39 +256,23 @@ impl QdrantService {
         Ok(())
     }
 
-    /// Elimina todos los puntos de la colección (para full reindex)
-    pub async fn clear_all_points(&self) -> Result<()> {
+    /// Borra la colección y la vuelve a crear con la configuración actual
+    /// (para full reindex: así las colecciones antiguas obtienen el vector disperso)
+    pub async fn recreate_collection(&self) -> Result<()> {
         let collections = self
             .client
             .list_collections()
             .await
             .context("Failed to list Qdrant collections")?;
 
-        let exists = collections
-            .collections
-            .iter()
-            .any(|c| c.name == self.collection_name);
-
-        if exists {
+        if collections.collections.iter().any(|c| c.name == self.collection_name) {
             self.client
-                .delete_points_blocking(
-                    &self.collection_name,
-                    None,
-                    &PointsSelector {
-                        points_selector_one_of: Some(
-                            qdrant_client::qdrant::points_selector::PointsSelectorOneOf::Filter(
-                                Filter::default(),
-                            ),
-                        ),
-                    },
-                    None,
-                )
+                .delete_collection(&self.collection_name)
                 .await
-                .context("Failed to clear all points from Qdrant")?;
-
-            info!("Cleared all points from collection: {}", self.collection_name);
+                .context("Failed to delete Qdrant collection")?;
+            info!("Deleted collection: {}", self.collection_name);
         }
 
-        Ok(())
+        self.ensure_collection().await
     }
 }
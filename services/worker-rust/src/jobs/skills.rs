@@ -0,0 +1,21 @@
+//! Skills normalizadas para el payload `skills` de Qdrant.
+//!
+//! Réplica de `pipelines/utils/skills.py`: `skills_filter` compara skills
+//! completas (`MatchAny`) contra esta forma canónica, así que los puntos que
+//! indexa el worker deben llevarla igual que los del ETL de Python.
+
+use std::collections::BTreeSet;
+
+/// Clave del payload (mismo nombre que `SKILLS_PAYLOAD_KEY` en pipelines)
+pub const SKILLS_PAYLOAD_KEY: &str = "skills";
+
+/// Forma canónica de una lista de skills separada por comas: minúsculas,
+/// espacios colapsados, sin duplicados ni vacías, ordenada.
+pub fn normalize_skills(raw: &str) -> Vec<String> {
+    raw.split(',')
+        .map(|part| part.split_whitespace().collect::<Vec<_>>().join(" ").to_lowercase())
+        .filter(|skill| !skill.is_empty())
+        .collect::<BTreeSet<_>>()
+        .into_iter()
+        .collect()
+}
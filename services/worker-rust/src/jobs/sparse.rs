@@ -0,0 +1,78 @@
+//! Vector disperso de palabras clave (estilo BM25) para la búsqueda híbrida.
+//!
+//! Réplica de `pipelines/utils/sparse.py`: los puntos que indexa el worker
+//! deben llevar los mismos términos y pesos que los del ETL de Python, o la
+//! rama dispersa de la búsqueda los puntuaría distinto. Cualquier cambio en
+//! el tokenizador, las stopwords o los parámetros de BM25 va en ambos lados.
+
+use std::collections::{BTreeMap, HashMap};
+use unicode_normalization::char::canonical_combining_class;
+use unicode_normalization::UnicodeNormalization;
+
+const BM25_K1: f32 = 1.2;
+const BM25_B: f32 = 0.75;
+/// Longitud media aproximada (en términos) de text_content
+const BM25_AVG_LEN: f32 = 60.0;
+
+const STOPWORDS: &[&str] = &[
+    "a", "al", "and", "años", "anos", "con", "de", "del", "el", "en", "experience",
+    "for", "in", "la", "las", "los", "of", "on", "para", "por", "skills", "the",
+    "to", "un", "una", "with", "y",
+];
+
+fn is_token_start(c: char) -> bool {
+    c.is_ascii_lowercase() || c.is_ascii_digit()
+}
+
+fn is_token_char(c: char) -> bool {
+    is_token_start(c) || c == '+' || c == '#' || c == '.'
+}
+
+/// Términos en minúsculas y sin acentos; conserva "c++", "c#", "node.js".
+pub fn tokenize(text: &str) -> Vec<String> {
+    let plain: String = text
+        .nfkd()
+        .filter(|c| canonical_combining_class(*c) == 0)
+        .flat_map(char::to_lowercase)
+        .collect();
+
+    let mut tokens = Vec::new();
+    let mut chars = plain.chars().peekable();
+    while let Some(c) = chars.next() {
+        if !is_token_start(c) {
+            continue;
+        }
+        let mut token = String::from(c);
+        while let Some(&next) = chars.peek() {
+            if !is_token_char(next) {
+                break;
+            }
+            token.push(next);
+            chars.next();
+        }
+        let token = token.trim_end_matches('.');
+        if token.len() > 1 && !STOPWORDS.contains(&token) {
+            tokens.push(token.to_string());
+        }
+    }
+    tokens
+}
+
+/// Vector disperso de un documento con saturación de frecuencia BM25,
+/// como pares (índice CRC32 del término, peso) ordenados por índice.
+pub fn document_sparse_vector(text: &str) -> Vec<(u32, f32)> {
+    let tokens = tokenize(text);
+    let mut counts: HashMap<&str, f32> = HashMap::new();
+    for token in &tokens {
+        *counts.entry(token.as_str()).or_insert(0.0) += 1.0;
+    }
+
+    let norm = BM25_K1 * (1.0 - BM25_B + BM25_B * tokens.len() as f32 / BM25_AVG_LEN);
+    // Dos términos con el mismo CRC32 (improbable) suman su peso
+    let mut merged: BTreeMap<u32, f32> = BTreeMap::new();
+    for (term, tf) in counts {
+        *merged.entry(crc32fast::hash(term.as_bytes())).or_insert(0.0) +=
+            tf * (BM25_K1 + 1.0) / (tf + norm);
+    }
+    merged.into_iter().collect()
+}
@@ -4,6 +4,7 @@ use serde::{Deserialize, Serialize};
 pub struct JobPayload {
     pub job_type: String,
     pub candidate_id: Option<i32>,
+    pub candidate_ids: Option<Vec<i32>>,
     pub requested_by: Option<String>,
     pub timestamp: Option<String>,
 }
@@ -13,6 +14,7 @@ pub enum JobType {
     EtlSync,
     EmbeddingBatch,
     SingleIndex,
+    BatchIndex,
     DeletePoint,
     FullReindex,
     Unknown(String),
@@ -24,6 +26,7 @@ impl From<&str> for JobType {
             "etl_sync" => JobType::EtlSync,
             "embedding_batch" => JobType::EmbeddingBatch,
             "single_index" => JobType::SingleIndex,
+            "batch_index" => JobType::BatchIndex,
             "delete_point" => JobType::DeletePoint,
             "full_reindex" => JobType::FullReindex,
             unknown => JobType::Unknown(unknown.to_string()),
@@ -41,6 +41,7 @@ async fn main() -> Result<()> {
         config.embedding_model.clone(),
         config.embedding_dimension,
         config.embedding_distance.clone(),
+        redis_queue.connect().await?,
     )
     .await?;
 
@@ -2,6 +2,10 @@ use anyhow::{Context, Result};
 use redis::{aio::MultiplexedConnection, AsyncCommands, Client};
 use tracing::info;
 
+/// Key compartida con la API: se incrementa tras cada cambio del índice
+/// para invalidar las cachés de resultados de similares.
+pub const INDEX_VERSION_KEY: &str = "index:version";
+
 pub struct RedisQueue {
     client: Client,
 }
@@ -35,4 +39,10 @@ impl RedisQueue {
             Ok(None)
         }
     }
+
+    pub async fn bump_index_version(conn: &mut MultiplexedConnection) -> Result<i64> {
+        conn.incr(INDEX_VERSION_KEY, 1)
+            .await
+            .context("Redis INCR index version failed")
+    }
 }
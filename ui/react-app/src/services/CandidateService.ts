@@ -1,4 +1,4 @@
-import type { CandidateUpdate, CandidateCreate } from "../types/candidate";
+import type { Candidate, CandidateUpdate, CandidateCreate } from "../types/candidate";
 import apiClient from "./apiClient";
 import Api from "./Api";
 
@@ -10,9 +10,18 @@ class CandidateService {
   }
 
   public static async listCandidates() {
+    // El listado está paginado por keyset: se siguen las páginas mediante
+    // la cabecera X-Next-After-Id hasta que la API deja de enviarla.
     const url = Api.BASE_URL + Api.LIST_CANDIDATES;
-    const res = await apiClient.get(url, { retry: 2 } as Record<string, unknown>);
-    return res.data;
+    const candidates: Candidate[] = [];
+    let afterId: string | undefined;
+    do {
+      const params = afterId ? { limit: 1000, after_id: afterId } : { limit: 1000 };
+      const res = await apiClient.get(url, { params, retry: 2 } as Record<string, unknown>);
+      candidates.push(...res.data);
+      afterId = res.headers?.["x-next-after-id"];
+    } while (afterId);
+    return candidates;
   }
 
   public static async createCandidate(candidate: CandidateCreate) {